@@ -0,0 +1,317 @@
+from contextlib import contextmanager
+from array import array
+import fcntl
+import mmap
+import os
+import sqlite3
+import struct
+import threading
+
+_FIBONACCI = 0x9E3779B97F4A7C15
+_MASK64 = (1 << 64) - 1
+
+def _find_slot(slots, key):
+    # open addressing with linear probing over a power-of-two table of uint64 keys, 0 marks an empty slot
+    # returns the index holding key, or the index of the empty slot where key belongs
+    mask = len(slots) - 1
+    index = ((key * _FIBONACCI) & _MASK64) >> (65 - len(slots).bit_length())
+    while True:
+        slot = slots[index]
+        if slot == 0 or slot == key:
+            return index
+        index = (index + 1) & mask
+
+
+class AccountIdAllocator:
+    # base class: hands out unique account ids as strings of digits, subclasses decide where taken ids are stored
+    # ids are kept as ints (8 bytes each in the table based allocators) instead of str objects in a set
+    def __init__(self):
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def random_id(length):
+        return int.from_bytes(os.urandom(8)) % 10 ** length
+
+    @staticmethod
+    def to_int(account_id):
+        return int(account_id) if isinstance(account_id, str) else account_id
+
+    def _claim(self, account_ids):
+        # store the ids that are not taken yet and return them, must be atomic for the storage
+        raise NotImplementedError
+
+    def _contains(self, account_id):
+        raise NotImplementedError
+
+    def __contains__(self, account_id):
+        return self._contains(self.to_int(account_id))
+
+    def allocate(self, length=18):
+        return self.reserve_block(1, length)[0]
+
+    def register(self, account_ids):
+        # mark existing ids (e.g. restored from a snapshot) as taken, ids that are already taken are fine
+        self._claim([self.to_int(account_id) for account_id in account_ids])
+
+    def reserve_block(self, count, length=18):
+        # reserve count new ids in one round trip to the storage, retrying only for the colliding ones
+        reserved = []
+        while len(reserved) < count:
+            candidates = [self.random_id(length) for _ in range(count - len(reserved))]
+            reserved.extend(self._claim(candidates))
+        return [f'{account_id:0>{length}}' for account_id in reserved]
+
+
+class MemoryAccountIdAllocator(AccountIdAllocator):
+    # process local allocator backed by an in-memory hash table of uint64
+    _MAX_LOAD = 0.5
+
+    def __init__(self, initial_capacity=1024):
+        super().__init__()
+        capacity = 8
+        while capacity < initial_capacity:
+            capacity *= 2
+        self._slots = array('Q', bytes(8 * capacity))
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def _grow(self):
+        keys = [key for key in self._slots if key]
+        self._slots = array('Q', bytes(16 * len(self._slots)))
+        for key in keys:
+            self._slots[_find_slot(self._slots, key)] = key
+
+    def _claim(self, account_ids):
+        claimed = []
+        with self._lock:
+            for account_id in account_ids:
+                if self._count + 1 > len(self._slots) * self._MAX_LOAD:
+                    self._grow()
+                key = account_id + 1
+                index = _find_slot(self._slots, key)
+                if self._slots[index] == 0:
+                    self._slots[index] = key
+                    self._count += 1
+                    claimed.append(account_id)
+        return claimed
+
+    def _contains(self, account_id):
+        return self._slots[_find_slot(self._slots, account_id + 1)] != 0
+
+
+class MmapAccountIdAllocator(AccountIdAllocator):
+    # the same hash table kept in a memory-mapped file, shared by every process mapping that file
+    # an exclusive flock serializes writers across processes, the header holds the table capacity and the id count
+    # exact lookups in the table are already O(1), so no Bloom filter is kept in front of it
+    # growing rebuilds the table in place (replacing the file would leave other processes locking the old one), so the
+    # keys are first journaled to path + '.grow' and the header is marked as growing until the rebuild is complete;
+    # the next process to lock a marked file rebuilds it from the journal
+    _HEADER = struct.Struct('<8sQQ8x')
+    _MAGIC = b'ACCTID01'
+    _GROWING = b'ACCTGROW'
+    _MAX_LOAD = 0.5
+
+    def __init__(self, path, initial_capacity=1 << 16):
+        super().__init__()
+        self._initial_capacity = max(8, 1 << (initial_capacity - 1).bit_length())
+        self._file = open(path, 'a+b')
+        self._journal_path = f'{path}.grow'
+        self._mmap = None
+        self._slots = None
+        try:
+            with self._locked(shared=False):
+                pass
+        except Exception: # not an allocator file, or an invalid header
+            self.close()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        self._unmap()
+        self._file.close()
+
+    def _unmap(self):
+        if self._slots is not None:
+            self._slots.release()
+            self._slots = None
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def _map(self):
+        self._mmap = mmap.mmap(self._file.fileno(), 0)
+        self._slots = memoryview(self._mmap)[self._HEADER.size:].cast('Q')
+
+    def _create(self, capacity, count=0):
+        os.ftruncate(self._file.fileno(), self._HEADER.size + 8 * capacity)
+        self._map()
+        self._HEADER.pack_into(self._mmap, 0, self._MAGIC, capacity, count)
+
+    @contextmanager
+    def _locked(self, shared=True):
+        with self._lock:
+            fd = self._file.fileno()
+            fcntl.flock(fd, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+            try:
+                size = os.fstat(fd).st_size
+                if size == 0:
+                    if shared:
+                        # another process has not initialized the file yet
+                        raise RuntimeError('Internal error: the account id file is not initialized')
+                    self._create(self._initial_capacity)
+                while True:
+                    if self._mmap is None or len(self._mmap) != size:
+                        # first access, or another process grew the table since we mapped it
+                        self._unmap()
+                        self._map()
+                        if self._mmap[:8] not in (self._MAGIC, self._GROWING):
+                            raise ValueError('Internal error: not an account id file')
+                    if self._mmap[:8] != self._GROWING:
+                        break
+                    if shared:
+                        # a process died growing the table, take the exclusive lock and check again
+                        fcntl.flock(fd, fcntl.LOCK_EX)
+                        shared = False
+                        size = os.fstat(fd).st_size
+                        continue
+                    self._recover()
+                yield
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+
+    def __len__(self):
+        with self._locked():
+            return self._HEADER.unpack_from(self._mmap)[2]
+
+    def _grow(self, count):
+        keys = array('Q', (key for key in self._slots if key))
+        capacity = 2 * len(self._slots)
+        # the journal is complete on disk before the table is touched
+        temporary_path = f'{self._journal_path}.tmp'
+        with open(temporary_path, 'wb') as journal:
+            journal.write(self._HEADER.pack(self._GROWING, capacity, count))
+            journal.write(keys)
+            journal.flush()
+            os.fsync(journal.fileno())
+        os.replace(temporary_path, self._journal_path)
+        self._rebuild(capacity, count, keys)
+
+    def _recover(self):
+        with open(self._journal_path, 'rb') as journal:
+            data = journal.read()
+        _, capacity, count = self._HEADER.unpack_from(data)
+        keys = array('Q')
+        keys.frombytes(data[self._HEADER.size:])
+        self._rebuild(capacity, count, keys)
+
+    def _rebuild(self, capacity, count, keys):
+        # the header is marked as growing while the table is rewritten, and restored once every key is back in
+        self._HEADER.pack_into(self._mmap, 0, self._GROWING, capacity, count)
+        self._mmap.flush()
+        self._unmap()
+        os.ftruncate(self._file.fileno(), self._HEADER.size + 8 * capacity)
+        self._map()
+        self._mmap[self._HEADER.size:] = bytes(8 * capacity)
+        for key in keys:
+            self._slots[_find_slot(self._slots, key)] = key
+        self._HEADER.pack_into(self._mmap, 0, self._MAGIC, capacity, count)
+        self._mmap.flush()
+        os.remove(self._journal_path)
+
+    def _claim(self, account_ids):
+        claimed = []
+        with self._locked(shared=False):
+            count = self._HEADER.unpack_from(self._mmap)[2]
+            for account_id in account_ids:
+                if count + 1 > len(self._slots) * self._MAX_LOAD:
+                    self._grow(count)
+                key = account_id + 1
+                index = _find_slot(self._slots, key)
+                if self._slots[index] == 0:
+                    self._slots[index] = key
+                    count += 1
+                    claimed.append(account_id)
+            self._HEADER.pack_into(self._mmap, 0, self._MAGIC, len(self._slots), count)
+        return claimed
+
+    def _contains(self, account_id):
+        with self._locked():
+            return self._slots[_find_slot(self._slots, account_id + 1)] != 0
+
+
+class SqliteAccountIdAllocator(AccountIdAllocator):
+    # ids stored as INTEGER PRIMARY KEY, uniqueness across processes is guaranteed by the database
+    def __init__(self, path, timeout=30):
+        super().__init__()
+        self._connection = sqlite3.connect(path, timeout=timeout, isolation_level=None, check_same_thread=False)
+        self._connection.execute('CREATE TABLE IF NOT EXISTS account_ids (account_id INTEGER PRIMARY KEY)')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        self._connection.close()
+
+    def __len__(self):
+        with self._lock:
+            return self._connection.execute('SELECT COUNT(*) FROM account_ids').fetchone()[0]
+
+    def _claim(self, account_ids):
+        claimed = []
+        with self._lock:
+            cursor = self._connection.cursor()
+            cursor.execute('BEGIN IMMEDIATE')
+            try:
+                for account_id in account_ids:
+                    cursor.execute('INSERT OR IGNORE INTO account_ids VALUES (?)', (account_id,))
+                    if cursor.rowcount == 1:
+                        claimed.append(account_id)
+                cursor.execute('COMMIT')
+            except BaseException:
+                cursor.execute('ROLLBACK')
+                raise
+        return claimed
+
+    def _contains(self, account_id):
+        query = 'SELECT 1 FROM account_ids WHERE account_id = ?'
+        with self._lock:
+            return self._connection.execute(query, (account_id,)).fetchone() is not None
+
+
+class BlockAccountIdAllocator(AccountIdAllocator):
+    # per worker front end: reserves ids from a shared allocator in blocks and hands them out locally
+    def __init__(self, allocator, block_size=1024):
+        super().__init__()
+        self._allocator = allocator
+        self._block_size = block_size
+        self._blocks = {} # length -> reserved but unused ids
+
+    def _contains(self, account_id):
+        return account_id in self._allocator
+
+    def __len__(self):
+        return len(self._allocator)
+
+    def allocate(self, length=18):
+        with self._lock:
+            block = self._blocks.get(length)
+            if not block:
+                # reversed so that pop() hands out the ids in the order they were reserved
+                block = self._blocks[length] = self._allocator.reserve_block(self._block_size, length)[::-1]
+            return block.pop()
+
+    def reserve_block(self, count, length=18):
+        return self._allocator.reserve_block(count, length)
+
+    def register(self, account_ids):
+        self._allocator.register(account_ids)
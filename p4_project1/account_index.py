@@ -0,0 +1,113 @@
+from bisect import bisect_left, insort
+import pickle
+from bank_account import BankAccount
+
+class AccountIndex:
+    # in-memory index over BankAccount objects:
+    # - hash index: account id (int) -> account
+    # - sorted lists of 'name\0account id' keys, casefolded, for fullname prefix and lastname queries via bisect
+    # the index registers itself in BankAccount._name_observers, so it follows the firstname/lastname setters
+    _SNAPSHOT_VERSION = 1
+
+    def __init__(self, accounts=()):
+        self._accounts = {}
+        self._fullnames = []
+        self._lastnames = []
+        BankAccount._name_observers.add(self)
+        self.add_many(accounts)
+
+    @staticmethod
+    def normalize(name):
+        # query side of the normalization: the stored names are already formalized by BankAccount.formalize_name
+        return ' '.join(name.split()).casefold()
+
+    @staticmethod
+    def _key(name, account_id):
+        return f'{name.casefold()}\0{account_id:018}'
+
+    @staticmethod
+    def _remove_key(keys, key):
+        index = bisect_left(keys, key)
+        if index < len(keys) and keys[index] == key:
+            del keys[index]
+
+    def __len__(self):
+        return len(self._accounts)
+
+    def __contains__(self, account_id):
+        return int(account_id) in self._accounts
+
+    def get(self, account_id):
+        return self._accounts.get(int(account_id))
+
+    def add(self, account):
+        if account._account_id in self._accounts:
+            raise ValueError(f'Internal error: account {account.account_id} is already indexed')
+        self._accounts[account._account_id] = account
+        insort(self._fullnames, self._key(account.fullname, account._account_id))
+        insort(self._lastnames, self._key(account.lastname, account._account_id))
+
+    def add_many(self, accounts):
+        # append all the keys and sort once, rather than one insort per account
+        accounts = list(accounts)
+        for account in accounts:
+            if account._account_id in self._accounts:
+                raise ValueError(f'Internal error: account {account.account_id} is already indexed')
+            self._accounts[account._account_id] = account
+        self._fullnames.extend(self._key(account.fullname, account._account_id) for account in accounts)
+        self._lastnames.extend(self._key(account.lastname, account._account_id) for account in accounts)
+        self._fullnames.sort()
+        self._lastnames.sort()
+
+    def remove(self, account):
+        if self._accounts.get(account._account_id) is not account:
+            raise KeyError(f'Internal error: account {account.account_id} is not indexed')
+        del self._accounts[account._account_id]
+        self._remove_key(self._fullnames, self._key(account.fullname, account._account_id))
+        self._remove_key(self._lastnames, self._key(account.lastname, account._account_id))
+
+    def on_name_change(self, account, old_firstname, old_lastname):
+        if self._accounts.get(account._account_id) is not account:
+            return
+        self._remove_key(self._fullnames, self._key(f'{old_firstname} {old_lastname}', account._account_id))
+        self._remove_key(self._lastnames, self._key(old_lastname, account._account_id))
+        insort(self._fullnames, self._key(account.fullname, account._account_id))
+        insort(self._lastnames, self._key(account.lastname, account._account_id))
+
+    def _search(self, keys, prefix, limit):
+        accounts = []
+        index = bisect_left(keys, prefix)
+        while index < len(keys) and keys[index].startswith(prefix) and (limit is None or len(accounts) < limit):
+            accounts.append(self._accounts[int(keys[index][-18:])])
+            index += 1
+        return accounts
+
+    def find_by_fullname_prefix(self, prefix, limit=None):
+        # accounts whose fullname starts with prefix (case-insensitive), in name order
+        return self._search(self._fullnames, self.normalize(prefix), limit)
+
+    def find_by_lastname(self, lastname, limit=None):
+        return self._search(self._lastnames, f'{self.normalize(lastname)}\0', limit)
+
+    def find_by_lastname_prefix(self, prefix, limit=None):
+        return self._search(self._lastnames, self.normalize(prefix), limit)
+
+    def save(self, path):
+        # snapshot of the sorted keys, so a warm start neither rebuilds nor re-sorts them
+        with open(path, 'wb') as f:
+            pickle.dump((self._SNAPSHOT_VERSION, self._fullnames, self._lastnames), f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path, accounts):
+        # rebuild an index from a snapshot and the accounts it was taken from
+        with open(path, 'rb') as f:
+            version, fullnames, lastnames = pickle.load(f)
+        if version != cls._SNAPSHOT_VERSION:
+            raise ValueError('Internal error: unsupported account index snapshot version')
+        index = cls()
+        index._accounts = {account._account_id: account for account in accounts}
+        if len(fullnames) != len(index._accounts) or any(int(key[-18:]) not in index._accounts for key in fullnames):
+            raise ValueError('Internal error: the account index snapshot does not match the accounts')
+        index._fullnames = fullnames
+        index._lastnames = lastnames
+        return index
@@ -0,0 +1,136 @@
+from array import array
+from decimal import Decimal
+import struct
+import sys
+import zlib
+from bank_account import BankAccount
+from bank_ledger import BankLedger, LedgerAccount, _DIGITS
+from transaction_journal import UNITS_PER_CENT
+
+# header: magic, version, number of accounts, crc32 of everything after the header
+_HEADER = struct.Struct('<8sIQI')
+_MAGIC = b'BKSNAP01'
+_VERSION = 2 # balances in units (millionths of a cent), version 1 stored them rounded to whole cents
+_VERSIONS = (1, 2) # readable versions
+# every column is stored as its length in bytes followed by the raw bytes
+_LENGTH = struct.Struct('<Q')
+
+def _read_columns(body, n):
+    columns = []
+    offset = 0
+    for _ in range(n):
+        (length,) = _LENGTH.unpack_from(body, offset)
+        offset += _LENGTH.size
+        columns.append(body[offset:offset + length])
+        offset += length
+    return columns
+
+def _to_units(balance):
+    # exact for ledger balances; a BankAccount balance is kept to a millionth of a cent, like its journal entries
+    return int(balance.scaleb(_DIGITS).to_integral_value())
+
+def save_snapshot(accounts, path):
+    # columnar snapshot of a population of BankAccount (or a BankLedger): ids, balances in units, utc offsets in
+    # seconds, and first/last names as indexes into a table of distinct names
+    names = {}
+    ids, balances, offsets = array('Q'), array('q'), array('i')
+    firstnames, lastnames = array('I'), array('I')
+    for account in accounts:
+        ids.append(account._account_id)
+        balances.append(_to_units(account._balance))
+        offsets.append(int(account._preferred_timezone.utcoffset(None).total_seconds()))
+        firstnames.append(names.setdefault(account._firstname, len(names)))
+        lastnames.append(names.setdefault(account._lastname, len(names)))
+
+    body = bytearray()
+    for column in (ids, balances, offsets, firstnames, lastnames):
+        body += _LENGTH.pack(column.itemsize * len(column)) + column.tobytes()
+    name_table = '\n'.join(names).encode() # names only contain letters, so the separator is safe
+    body += _LENGTH.pack(len(name_table)) + name_table
+
+    with open(path, 'wb') as f:
+        f.write(_HEADER.pack(_MAGIC, _VERSION, len(ids), zlib.crc32(body)))
+        f.write(body)
+
+def read_snapshot(path):
+    # -> (ids, balances, offsets, firstnames, lastnames) columns, balances in units, names resolved through the name
+    # table
+    with open(path, 'rb') as f:
+        data = f.read()
+    if len(data) < _HEADER.size:
+        raise ValueError('Internal error: not an account snapshot')
+    magic, version, count, checksum = _HEADER.unpack_from(data)
+    if magic != _MAGIC:
+        raise ValueError('Internal error: not an account snapshot')
+    if version not in _VERSIONS:
+        raise ValueError(f'Internal error: unsupported account snapshot version {version}')
+    body = memoryview(data)[_HEADER.size:]
+    if zlib.crc32(body) != checksum:
+        raise ValueError('Internal error: the account snapshot is corrupted (checksum mismatch)')
+
+    columns = _read_columns(body, 6)
+    ids, balances, offsets, firstnames, lastnames = arrays = [array(typecode) for typecode in 'QqiII']
+    for column, data in zip(arrays, columns):
+        column.frombytes(data)
+    names = [sys.intern(name) for name in bytes(columns[5]).decode().split('\n')]
+    if any(len(column) != count for column in arrays):
+        raise ValueError('Internal error: the account snapshot is corrupted (column length mismatch)')
+    if version == 1:
+        balances = array('q', [cents * UNITS_PER_CENT for cents in balances])
+    return ids, balances, offsets, [names[i] for i in firstnames], [names[i] for i in lastnames]
+
+def _timezones(offsets):
+    # utc offset in seconds -> the shared timezone object of BankAccount.get_timezone
+    timezones = {}
+    for offset in set(offsets):
+        if offset == 0:
+            hours_offset = None
+        else:
+            hours_offset = offset // 3600 if offset % 3600 == 0 else offset / 3600
+        timezones[offset] = BankAccount.get_timezone(hours_offset)
+    return timezones
+
+def _balance(units, zero=BankAccount._ZERO):
+    if units == 0:
+        return zero
+    cents, remainder = divmod(units, UNITS_PER_CENT)
+    # whole cents keep the 2 decimal places of a deposited amount
+    return Decimal(units).scaleb(-_DIGITS) if remainder else Decimal(cents).scaleb(-2)
+
+def load_snapshot(path, account_class=BankAccount):
+    # rebuild the accounts without __init__: no name validation, no timezone construction, no id generation
+    # the restored ids are registered with the class's account id allocator so new accounts cannot reuse them
+    ids, balances, offsets, firstnames, lastnames = read_snapshot(path)
+    timezones = _timezones(offsets)
+    new = account_class.__new__
+    accounts = []
+    append = accounts.append
+    for account_id, units, offset, firstname, lastname in zip(ids, balances, offsets, firstnames, lastnames):
+        account = new(account_class)
+        account._account_id = account_id
+        account._firstname = firstname
+        account._lastname = lastname
+        account._preferred_timezone = timezones[offset]
+        account._balance = _balance(units)
+        append(account)
+    account_class._account_ids.register(ids)
+    return accounts
+
+def load_ledger_snapshot(path):
+    # same as load_snapshot, but the balances (units, like the ledger) go straight into a BankLedger column
+    ids, balances, offsets, firstnames, lastnames = read_snapshot(path)
+    timezones = _timezones(offsets)
+    ledger = BankLedger()
+    new = LedgerAccount.__new__
+    for row, (account_id, offset, firstname, lastname) in enumerate(zip(ids, offsets, firstnames, lastnames)):
+        account = new(LedgerAccount)
+        account._ledger = ledger
+        account._row = row
+        account._account_id = account_id
+        account._firstname = firstname
+        account._lastname = lastname
+        account._preferred_timezone = timezones[offset]
+        ledger._accounts.append(account)
+    ledger._balances = balances
+    LedgerAccount._account_ids.register(ids)
+    return ledger
@@ -2,14 +2,31 @@ from datetime import datetime, timezone, timedelta
 from decimal import Decimal
 import os
 import re
+import sys
 from collections import namedtuple
+import weakref
+from array import array
+from account_id_allocator import MemoryAccountIdAllocator
+from transaction_code_factory import TransactionCodeFactory
 
 Transaction = namedtuple('Transaction', 'transaction_type account_id transaction_datetime transaction_datetime_preferred random_code')
+AmountColumn = namedtuple('AmountColumn', 'cents invalid_rows')
 
 class BankAccount:
+    # no per-instance __dict__: the id is kept as an int, names are interned and timezones shared (see get_timezone)
+    __slots__ = '_account_id', '_firstname', '_lastname', '_preferred_timezone', '_balance'
+
     _TRANSACTION_TYPES = {'deposit': 'D', 'withdraw': 'W', 'pay_interest': 'I', 'declined': 'X'}
+    _TRANSACTION_TYPE_NAMES = {v: k for k, v in _TRANSACTION_TYPES.items()} # reverse lookup: type_code -> transaction_type
+    _timezone_offsets = {} # preferred timezone -> its fixed utc offset, or None
+    _timezones = {} # hours offset -> the timezone object shared by every account with that offset
     _monthly_interest_rate = Decimal('0.005')
-    _account_ids = set()
+    _ZERO = Decimal(0) # Decimal is immutable, so new accounts can share one zero balance
+    _CENT = Decimal('0.01')
+    _account_ids = MemoryAccountIdAllocator() # see account_id_allocator for the mmap and SQLite backed allocators
+    _journal = None # optional transaction_journal.TransactionJournal every transaction is appended to
+    _transaction_codes = TransactionCodeFactory()
+    _name_observers = weakref.WeakSet() # objects whose on_name_change(account, old_firstname, old_lastname) runs after a name changes
 
     @classmethod
     def get_monthly_interest_rate(cls):
@@ -22,33 +39,63 @@ class BankAccount:
         else:
             raise ValueError('Internal error: the interest rate should be a numeric string')
 
+    @classmethod
+    def set_account_id_allocator(cls, allocator):
+        cls._account_ids = allocator
+
+    @classmethod
+    def set_journal(cls, journal):
+        cls._journal = journal
+
     @classmethod
     def generate_account_id(cls, length=18):
-        # generate a string of digits with designated length (default to 18), and check the 
-        while True:
-            account_id = cls.generate_random_digits(length)
-
-            if account_id not in cls._account_ids:
-                cls._account_ids.add(account_id)
-                break
-        return account_id
+        # generate a string of digits with designated length (default to 18), unique within the allocator
+        return cls._account_ids.allocate(length)
     
     @classmethod
     def parse_transaction_code(cls, transaction_code, preferred_timezone=None):
-        transaction_parameters = transaction_code.split('-')
-        # find corresponding transaction_type according to type_code
-        for k, v in cls._TRANSACTION_TYPES.items():
-            if v == transaction_parameters[0]:
-                transaction_type = k
-                break
-        account_id = transaction_parameters[1]
-        transaction_datetime = datetime.strptime(transaction_parameters[2], '%Y%m%d%H%M%S%f').replace(tzinfo=timezone.utc)
-        if preferred_timezone is None:
-            transaction_datetime_preferred = transaction_datetime
-        else:
-            transaction_datetime_preferred = transaction_datetime.astimezone(preferred_timezone)
-        random_code = transaction_parameters[3]
-        return Transaction(transaction_type, account_id, transaction_datetime, transaction_datetime_preferred, random_code)
+        return next(cls.parse_transaction_codes((transaction_code,), preferred_timezone))
+
+    @classmethod
+    def parse_transaction_codes(cls, transaction_codes, preferred_timezone=None, cache_timezone=True):
+        # bulk decoder yielding one Transaction per code: type codes are looked up in the reverse map, datetimes are
+        # parsed from fixed-width slices, and the utc offset of a fixed-offset preferred timezone is looked up only once
+        type_names = cls._TRANSACTION_TYPE_NAMES
+        parse_datetime_code = cls.parse_datetime_code
+        offset = None
+        if cache_timezone and preferred_timezone is not None:
+            offset = cls.get_timezone_offset(preferred_timezone)
+        for transaction_code in transaction_codes:
+            try:
+                type_code, account_id, datetime_code, random_code = transaction_code.split('-')
+                transaction_type = type_names[type_code]
+            except (ValueError, KeyError):
+                raise ValueError(f'Internal error: invalid transaction code {transaction_code!r}') from None
+            transaction_datetime = parse_datetime_code(datetime_code)
+            if preferred_timezone is None:
+                transaction_datetime_preferred = transaction_datetime
+            elif offset is not None:
+                transaction_datetime_preferred = (transaction_datetime + offset).replace(tzinfo=preferred_timezone)
+            else:
+                transaction_datetime_preferred = transaction_datetime.astimezone(preferred_timezone)
+            yield Transaction(transaction_type, account_id, transaction_datetime, transaction_datetime_preferred, random_code)
+
+    @classmethod
+    def get_timezone_offset(cls, tz):
+        # utc offset of a fixed-offset timezone, None for timezones whose offset depends on the date (e.g. zoneinfo)
+        try:
+            return cls._timezone_offsets[tz]
+        except KeyError:
+            offset = tz.utcoffset(None) if isinstance(tz, timezone) else None
+            cls._timezone_offsets[tz] = offset
+            return offset
+
+    @staticmethod
+    def parse_datetime_code(datetime_code):
+        # '%Y%m%d%H%M%S%f' sliced into the ISO 8601 basic format, which fromisoformat parses far faster than strptime
+        if len(datetime_code) != 20 or not (datetime_code.isascii() and datetime_code.isdigit()):
+            raise ValueError(f'Internal error: invalid datetime code {datetime_code!r}')
+        return datetime.fromisoformat(f'{datetime_code[:8]}T{datetime_code[8:14]}.{datetime_code[14:]}+00:00')
 
     @staticmethod
     def generate_random_digits(length):
@@ -64,7 +111,7 @@ class BankAccount:
     def formalize_name(name, field):
         name = name.strip().capitalize()
         if name.isalpha():
-            return name
+            return sys.intern(name) # the same few thousand names are shared by millions of accounts
         else:
             raise ValueError(f'{field} should be non-empty and can only contains alphabets')
     
@@ -76,26 +123,54 @@ class BankAccount:
 
     @staticmethod
     def validate_amount(amount):
-        # match a string of positive integer or float with 2 decimal places at most, allowing prefixing or trailing whitespaces
-        pattern = r'^\s*\d+(\.\d{1,2})?\s*$'
-        return re.match(pattern, amount) and float(amount) > 0
-    
+        # a string of positive integer or float with 2 decimal places at most, allowing prefixing or trailing whitespaces
+        return BankAccount.parse_amount(amount) is not None
+
     @staticmethod
-    def get_timezone(hours_offset):
-        if hours_offset is None:
-            return timezone.utc
-        return timezone(timedelta(hours=hours_offset))
+    def parse_amount(amount):
+        # validate and convert in one pass: the amount string -> positive int cents, or None if the amount is invalid
+        try:
+            integer, point, fraction = amount.strip().partition('.')
+        except AttributeError:
+            raise TypeError(f'the amount should be a str, not {type(amount).__name__!r}') from None
+        if not integer.isdecimal() or (point and not (len(fraction) <= 2 and fraction.isdecimal())):
+            return None
+        cents = int(integer + fraction.ljust(2, '0'))
+        return cents if cents > 0 else None
+
+    @staticmethod
+    def parse_amounts(amounts):
+        # column variant of parse_amount (e.g. for a CSV import): invalid rows are reported, not raised
+        # returns AmountColumn(cents, invalid_rows), with 0 cents at every invalid row
+        # every amount is still parsed on its own, the column only saves the per-row appends and None checks
+        cents = list(map(BankAccount.parse_amount, amounts))
+        invalid_rows = [row for row, amount_cents in enumerate(cents) if amount_cents is None]
+        for row in invalid_rows:
+            cents[row] = 0
+        return AmountColumn(array('q', cents), invalid_rows)
+    
+    @classmethod
+    def get_timezone(cls, hours_offset):
+        try:
+            return cls._timezones[hours_offset]
+        except KeyError:
+            if hours_offset is None:
+                tz = timezone.utc
+            else:
+                tz = timezone(timedelta(hours=hours_offset))
+            cls._timezones[hours_offset] = tz
+            return tz
 
     def __init__(self, firstname, lastname, hours_offset=None):
-        self._account_id = self.generate_account_id()
+        self._account_id = int(self.generate_account_id())
         self.firstname = firstname
         self.lastname = lastname
         self.preferred_timezone = hours_offset
-        self._balance = Decimal(0)
+        self._balance = self._ZERO
 
     @property
     def account_id(self):
-        return self._account_id
+        return f'{self._account_id:018}'
     
     @property
     def firstname(self):
@@ -110,8 +185,11 @@ class BankAccount:
         #     self._fullname = None
         # else:
         #     raise ValueError('name should be non-empty and can only contain alphabets')
-        self._firstname = self.formalize_name(firstname, 'first name')
-        self._fullname = None
+        firstname = self.formalize_name(firstname, 'first name')
+        if self._name_observers:
+            self._change_name('_firstname', firstname)
+        else:
+            self._firstname = firstname
         
     @property
     def lastname(self):
@@ -125,14 +203,23 @@ class BankAccount:
         #     self._fullname = None
         # else:
         #     raise ValueError('name should be non-empty and can only contain alphabets')
-        self._lastname = self.formalize_name(lastname, 'last name')
-        self._fullname = None
+        lastname = self.formalize_name(lastname, 'last name')
+        if self._name_observers:
+            self._change_name('_lastname', lastname)
+        else:
+            self._lastname = lastname
+
+    def _change_name(self, attribute_name, name):
+        # the old names of an account still being initialized are None
+        old_firstname, old_lastname = getattr(self, '_firstname', None), getattr(self, '_lastname', None)
+        setattr(self, attribute_name, name)
+        for observer in list(self._name_observers):
+            observer.on_name_change(self, old_firstname, old_lastname)
         
     @property
     def fullname(self):
-        if self._fullname is None:
-            self._fullname = f'{self._firstname} {self._lastname}'
-        return self._fullname
+        # built on demand rather than cached, one less string kept alive per account
+        return f'{self._firstname} {self._lastname}'
     
     @property
     def preferred_timezone(self):
@@ -156,34 +243,44 @@ class BankAccount:
     #     return str(self._monthly_interest_rate)
     
     def deposit(self, amount):
-        if self.validate_amount(amount):
-            self._balance += Decimal(amount)
-            return self.generate_transaction_code('deposit')
+        amount_cents = self.parse_amount(amount)
+        if amount_cents is not None:
+            self._balance += Decimal(amount_cents) * self._CENT # the parsed amount, not a second parse of the str
+            return self._post_transaction('deposit', amount_cents)
         else:
             raise ValueError('Internal error: the amount should be a string of positive integer or float with 2 decimal places at most')
 
     def withdraw(self, amount):
-        if self.validate_amount(amount):
-            amount = Decimal(amount)
+        amount_cents = self.parse_amount(amount)
+        if amount_cents is not None:
+            amount = Decimal(amount_cents) * self._CENT
             if self._balance >= amount:
                 self._balance -= amount
-                return self.generate_transaction_code('withdraw')
+                return self._post_transaction('withdraw', amount_cents)
             else:
-                return self.generate_transaction_code('declined')
+                return self._post_transaction('declined', amount_cents)
         else:
             raise ValueError('Internal error: the amount should be a string of positive integer or float with 2 decimal places at most')
 
-    def pay_interest(self):
-        self._balance *= (Decimal(1) + self._monthly_interest_rate)
-        return self.generate_transaction_code('pay_interest')
+    def pay_interest(self, monthly_interest_rate=None):
+        # an explicit rate (e.g. from interest_rates.InterestRateSchedule) leaves the class level rate out of the way
+        if monthly_interest_rate is None:
+            monthly_interest_rate = self._monthly_interest_rate
+        balance = self._balance
+        self._balance *= (Decimal(1) + monthly_interest_rate)
+        return self._post_transaction('pay_interest', (self._balance - balance).scaleb(2)) # fractional cents
+
+    def _post_transaction(self, transaction_type, amount_cents):
+        # generate the transaction code and append it to the journal, if any
+        transaction_code = self.generate_transaction_code(transaction_type)
+        if self._journal is not None:
+            self._journal.append(transaction_code, amount_cents)
+        return transaction_code
 
     def generate_transaction_code(self, transaction_type): # generate code like transaction_type - account_id - datetime - random_digits
         if transaction_type not in self._TRANSACTION_TYPES:
             raise ValueError('Internal error: invalid transaction type')
-        type_code = self._TRANSACTION_TYPES[transaction_type]
-        datetime_code = datetime.now(timezone.utc).strftime('%Y%m%d%H%M%S%f')
-        random_code = self.generate_random_digits(6)
-        return f'{type_code}-{self._account_id}-{datetime_code}-{random_code}'
+        return self._transaction_codes.generate(self._TRANSACTION_TYPES[transaction_type], f'{self._account_id:018}')
     
 
 # manual tests
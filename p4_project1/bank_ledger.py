@@ -0,0 +1,146 @@
+from array import array
+from decimal import Decimal
+from bank_account import BankAccount
+from transaction_journal import UNITS_PER_CENT
+
+# ledger balances are fixed point in millionths of a cent (UNITS_PER_CENT, the unit of the journal too), so interest
+# compounds with sub-cent precision like the Decimal balance of a BankAccount and is only rounded to cents for
+# display; an array('q') row holds up to ~92 billion
+_DIGITS = 8 # decimal places of a balance in units
+
+class BankLedger:
+    # columnar store of many accounts: one row per account, balances kept as fixed point integers in a single array
+    def __init__(self):
+        self._balances = array('q')
+        self._accounts = []
+
+    @staticmethod
+    def round_half_even(numerator, denominator):
+        # integer division rounded like Decimal's default context (ROUND_HALF_EVEN), denominator must be positive
+        quotient, remainder = divmod(numerator, denominator)
+        twice_remainder = remainder * 2
+        if twice_remainder > denominator or (twice_remainder == denominator and quotient & 1):
+            quotient += 1
+        return quotient
+
+    def _add_row(self, account):
+        self._balances.append(0)
+        self._accounts.append(account)
+        return len(self._accounts) - 1
+
+    def _remove_last_row(self):
+        self._balances.pop()
+        self._accounts.pop()
+
+    def open_account(self, firstname, lastname, hours_offset=None):
+        return LedgerAccount(self, firstname, lastname, hours_offset)
+
+    def __len__(self):
+        return len(self._accounts)
+
+    def __getitem__(self, row):
+        return self._accounts[row]
+
+    def __iter__(self):
+        return iter(self._accounts)
+
+    @property
+    def total_balance(self):
+        return f'{Decimal(sum(self._balances)).scaleb(-_DIGITS):.2f}'
+
+    def _check_amounts(self, amounts):
+        if len(amounts) != len(self._accounts):
+            raise ValueError('Internal error: one amount per account is required')
+        # convert every amount before touching any balance, so a bad amount leaves the ledger unchanged
+        cents, invalid_rows = BankAccount.parse_amounts(amounts)
+        if invalid_rows:
+            raise ValueError(f'Internal error: invalid amounts at rows {invalid_rows}, the amount should be a string of positive integer or float with 2 decimal places at most')
+        return cents
+
+    def _generate_transaction_codes(self, transaction_types):
+        # one code per row, for either one transaction type shared by all rows or a list of type codes, one per row
+        if isinstance(transaction_types, str):
+            transaction_types = BankAccount._TRANSACTION_TYPES[transaction_types]
+        account_ids = [account.account_id for account in self._accounts]
+        return BankAccount._transaction_codes.generate_many(transaction_types, account_ids)
+
+    @staticmethod
+    def _journal_transactions(transaction_codes, cents):
+        if BankAccount._journal is not None:
+            BankAccount._journal.append_many(transaction_codes, cents)
+        return transaction_codes
+
+    @staticmethod
+    def _journal_transactions_units(transaction_codes, units):
+        if BankAccount._journal is not None:
+            BankAccount._journal.append_many_units(transaction_codes, units)
+        return transaction_codes
+
+    def deposit(self, amounts):
+        # amounts[i] is deposited into the account of row i
+        cents = self._check_amounts(amounts)
+        self._balances = array('q', [balance + amount * UNITS_PER_CENT for balance, amount in zip(self._balances, cents)])
+        transaction_codes = self._generate_transaction_codes('deposit')
+        return self._journal_transactions(transaction_codes, cents)
+
+    def withdraw(self, amounts):
+        # amounts[i] is withdrawn from the account of row i, rows without enough balance are declined and left unchanged
+        cents = self._check_amounts(amounts)
+        units = [amount * UNITS_PER_CENT for amount in cents]
+        accepted = [balance >= amount for balance, amount in zip(self._balances, units)]
+        self._balances = array('q', [balance - amount if ok else balance
+                                     for balance, amount, ok in zip(self._balances, units, accepted)])
+        type_codes = BankAccount._TRANSACTION_TYPES
+        transaction_codes = self._generate_transaction_codes([type_codes['withdraw'] if ok else type_codes['declined']
+                                                              for ok in accepted])
+        return self._journal_transactions(transaction_codes, cents)
+
+    def pay_interest(self, monthly_interest_rate=None):
+        # balance * rate == balance * numerator / denominator, rounded half-even to a millionth of a cent
+        if monthly_interest_rate is None:
+            monthly_interest_rate = BankAccount._monthly_interest_rate
+        numerator, denominator = monthly_interest_rate.as_integer_ratio()
+        round_half_even = self.round_half_even
+        return self._credit_interest([round_half_even(balance * numerator, denominator) for balance in self._balances])
+
+    def post_interest(self, interest_cents):
+        # credit precomputed interest in whole cents, interest_cents[i] goes to the account of row i
+        return self.post_interest_units([cents * UNITS_PER_CENT for cents in interest_cents])
+
+    def post_interest_units(self, interest_units):
+        # same as post_interest, in units (e.g. from interest_rates.InterestRateSchedule.accrue_interest)
+        if len(interest_units) != len(self._accounts):
+            raise ValueError('Internal error: one interest amount per account is required')
+        return self._credit_interest(interest_units)
+
+    def _credit_interest(self, interest_units):
+        self._balances = array('q', map(int.__add__, self._balances, interest_units))
+        transaction_codes = self._generate_transaction_codes('pay_interest')
+        return self._journal_transactions_units(transaction_codes, interest_units)
+
+
+class LedgerAccount(BankAccount):
+    # a BankAccount whose balance lives in a BankLedger row instead of on the instance
+    __slots__ = '_ledger', '_row'
+
+    def __init__(self, ledger, firstname, lastname, hours_offset=None):
+        self._ledger = ledger
+        self._row = ledger._add_row(self)
+        try:
+            super().__init__(firstname, lastname, hours_offset)
+        except Exception:
+            ledger._remove_last_row()
+            raise
+
+    @property
+    def row(self):
+        return self._row
+
+    @property
+    def _balance(self):
+        return Decimal(self._ledger._balances[self._row]).scaleb(-_DIGITS)
+
+    @_balance.setter
+    def _balance(self, balance):
+        # rounded half-even to the millionth of a cent the ledger holds
+        self._ledger._balances[self._row] = int(balance.scaleb(_DIGITS).to_integral_value())
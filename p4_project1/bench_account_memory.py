@@ -0,0 +1,57 @@
+"""
+Reports the memory used per account for a large population of BankAccount
+objects, against the previous __dict__ based layout
+"""
+
+from datetime import timezone, timedelta
+from decimal import Decimal
+import argparse
+import gc
+import random
+import tracemalloc
+from bank_account import BankAccount
+
+FIRSTNAMES = ['john', 'eric', 'terry', 'michael', 'graham', 'carol', 'connie', 'neil']
+LASTNAMES = ['cleese', 'idle', 'jones', 'palin', 'chapman', 'gilliam', 'cleveland', 'booth']
+
+class LegacyBankAccount:
+    # the previous layout: attributes in a __dict__, the id as a str in a set, one timezone object per account
+    _account_ids = set()
+
+    def __init__(self, firstname, lastname, hours_offset=None):
+        while True:
+            account_id = BankAccount.generate_random_digits(18)
+            if account_id not in self._account_ids:
+                self._account_ids.add(account_id)
+                break
+        self._account_id = account_id
+        self._firstname = firstname.strip().capitalize()
+        self._lastname = lastname.strip().capitalize()
+        self._fullname = None
+        self._preferred_timezone = timezone.utc if hours_offset is None else timezone(timedelta(hours=hours_offset))
+        self._balance = Decimal(0)
+
+def measure(label, account_class, n):
+    rng = random.Random(0)
+    arguments = [(rng.choice(FIRSTNAMES), rng.choice(LASTNAMES), rng.randint(-12, 12)) for _ in range(n)]
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    accounts = [account_class(*argument) for argument in arguments]
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    print(f'{label:<12}{n:>12,} accounts{used / 2**20:>10.1f} MiB{used / n:>10.1f} bytes/account')
+    return accounts
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('-n', '--number',
+                        type=int, default=1_000_000,
+                        help='Number of accounts to create.')
+    args = parser.parse_args()
+
+    # includes the id bookkeeping: the str set for the legacy layout, the uint64 table of the allocator otherwise
+    legacy = measure('legacy', LegacyBankAccount, args.number)
+    del legacy
+    compact = measure('BankAccount', BankAccount, args.number)
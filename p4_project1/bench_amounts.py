@@ -0,0 +1,58 @@
+"""
+Micro-benchmarks amount validation and conversion: the original regex + float +
+Decimal path against BankAccount.parse_amount and BankAccount.parse_amounts
+"""
+
+from decimal import Decimal
+from time import perf_counter
+import argparse
+import random
+import re
+from bank_account import BankAccount
+
+def validate_amount_regex(amount):
+    # the original implementation, kept as the baseline
+    pattern = r'^\s*\d+(\.\d{1,2})?\s*$'
+    return re.match(pattern, amount) and float(amount) > 0
+
+def regex_to_cents(amount):
+    if validate_amount_regex(amount):
+        return int(Decimal(amount).scaleb(2))
+    return None
+
+def make_amounts(n, seed=0):
+    rng = random.Random(seed)
+    amounts = [f'{rng.randint(1, 10**7) / 100:.2f}' for _ in range(n)]
+    # some invalid amounts, like a real import would have
+    for i in range(0, n, 100):
+        amounts[i] = rng.choice(('', '-1', '1.234', 'abc', '0'))
+    return amounts
+
+def measure(label, function, n):
+    start = perf_counter()
+    function()
+    elapsed = perf_counter() - start
+    print(f'{label:<44}{elapsed * 1e9 / n:>10.1f} ns/amount')
+    return elapsed
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('-n', '--number',
+                        type=int, default=1_000_000,
+                        help='Number of amounts.')
+    args = parser.parse_args()
+
+    n = args.number
+    amounts = make_amounts(n)
+    assert [regex_to_cents(amount) for amount in amounts] == [BankAccount.parse_amount(amount) for amount in amounts]
+
+    measure('validate_amount (regex + float)', lambda: [validate_amount_regex(amount) for amount in amounts], n)
+    measure('validate_amount (parse_amount)', lambda: [BankAccount.validate_amount(amount) for amount in amounts], n)
+    measure('to cents (regex + float + Decimal)', lambda: [regex_to_cents(amount) for amount in amounts], n)
+    measure('to cents (parse_amount)', lambda: [BankAccount.parse_amount(amount) for amount in amounts], n)
+    measure('to cents, whole column (parse_amounts)', lambda: BankAccount.parse_amounts(amounts), n)
+
+    ba = BankAccount('bench', 'mark')
+    valid = [amount for amount in amounts if BankAccount.parse_amount(amount)]
+    measure('BankAccount.deposit', lambda: [ba.deposit(amount) for amount in valid], len(valid))
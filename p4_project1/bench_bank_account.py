@@ -0,0 +1,157 @@
+"""
+BankAccount benchmark suite: ops/s and p50/p99 latency of account creation,
+deposit, withdraw, pay_interest and transaction code generation/parsing at
+several population sizes, plus allocation counts measured with tracemalloc
+
+The results can be written as JSON (--output) and compared against an older
+run (--compare), e.g. one taken on another commit; --profile runs every
+benchmark under cProfile and prints the hottest functions
+"""
+
+from time import perf_counter, perf_counter_ns
+import argparse
+import cProfile
+import json
+import platform
+import pstats
+import subprocess
+import sys
+import tracemalloc
+from bank_account import BankAccount
+
+def prepare_accounts(n):
+    accounts = [BankAccount('bench', 'mark', i % 24 - 12) for i in range(n)]
+    for account in accounts:
+        account.deposit('1000')
+    return accounts
+
+# benchmark name -> (setup(n) -> state, operation(state, i)), operation runs once per account
+def setup_create(n):
+    return None
+
+def create(state, i):
+    BankAccount('bench', 'mark', 2)
+
+def deposit(accounts, i):
+    accounts[i].deposit('12.34')
+
+def withdraw(accounts, i):
+    accounts[i].withdraw('12.34')
+
+def pay_interest(accounts, i):
+    accounts[i].pay_interest()
+
+def generate_transaction_code(accounts, i):
+    accounts[i].generate_transaction_code('deposit')
+
+def setup_codes(n):
+    accounts = prepare_accounts(n)
+    return [account.generate_transaction_code('deposit') for account in accounts], accounts[0].preferred_timezone
+
+def parse_transaction_code(state, i):
+    codes, tz = state
+    BankAccount.parse_transaction_code(codes[i], tz)
+
+BENCHMARKS = {
+    'create': (setup_create, create),
+    'deposit': (prepare_accounts, deposit),
+    'withdraw': (prepare_accounts, withdraw),
+    'pay_interest': (prepare_accounts, pay_interest),
+    'generate_transaction_code': (prepare_accounts, generate_transaction_code),
+    'parse_transaction_code': (setup_codes, parse_transaction_code),
+}
+
+def percentile(sorted_values, p):
+    return sorted_values[min(int(len(sorted_values) * p / 100), len(sorted_values) - 1)]
+
+def measure(setup, operation, n):
+    # timing pass: one perf_counter_ns pair around every call
+    state = setup(n)
+    latencies = []
+    append = latencies.append
+    start = perf_counter()
+    for i in range(n):
+        t0 = perf_counter_ns()
+        operation(state, i)
+        append(perf_counter_ns() - t0)
+    elapsed = perf_counter() - start
+    latencies.sort()
+
+    # allocation pass, separate because tracemalloc slows every allocation down
+    state = setup(n)
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    for i in range(n):
+        operation(state, i)
+    after = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    stats = after.compare_to(before, 'filename')
+    return {
+        'ops_per_s': n / elapsed,
+        'p50_ns': percentile(latencies, 50),
+        'p99_ns': percentile(latencies, 99),
+        'retained_blocks': sum(stat.count_diff for stat in stats),
+        'retained_bytes': sum(stat.size_diff for stat in stats),
+        'peak_bytes': peak,
+    }
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare(results, baseline):
+    # ratio > 1 means faster (ops/s) or slower (latency) than the baseline
+    print(f'\ncompared with {baseline["commit"]}:')
+    for key, result in results['benchmarks'].items():
+        old = baseline['benchmarks'].get(key)
+        if old is None:
+            continue
+        print(f'{key:<36} ops/s x{result["ops_per_s"] / old["ops_per_s"]:>5.2f}  '
+              f'p99 x{result["p99_ns"] / max(old["p99_ns"], 1):>5.2f}  '
+              f'blocks {result["retained_blocks"] - old["retained_blocks"]:>+8}')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('-n', '--sizes',
+                        type=int, nargs='+', default=[1_000, 10_000, 100_000],
+                        help='Population sizes, every benchmark runs once per account.')
+    parser.add_argument('-b', '--benchmarks',
+                        nargs='+', choices=list(BENCHMARKS), default=list(BENCHMARKS),
+                        help='Benchmarks to run.')
+    parser.add_argument('-o', '--output',
+                        help='Write the results to this JSON file.')
+    parser.add_argument('-c', '--compare',
+                        help='JSON results of an earlier run to compare with.')
+    parser.add_argument('-p', '--profile',
+                        action='store_true',
+                        help='Run the benchmarks under cProfile and print the top functions (the timings then include the profiler overhead).')
+    args = parser.parse_args()
+
+    results = {'commit': git_commit(), 'python': platform.python_version(), 'benchmarks': {}}
+    profiler = cProfile.Profile() if args.profile else None
+    for name in args.benchmarks:
+        setup, operation = BENCHMARKS[name]
+        for n in args.sizes:
+            if profiler:
+                profiler.enable()
+            result = measure(setup, operation, n)
+            if profiler:
+                profiler.disable()
+            results['benchmarks'][f'{name}[{n}]'] = result
+            print(f'{name:<26} n={n:<8} {result["ops_per_s"]:>12,.0f} ops/s  p50 {result["p50_ns"]:>7,} ns  '
+                  f'p99 {result["p99_ns"]:>7,} ns  {result["retained_blocks"]:>8,} blocks  '
+                  f'peak {result["peak_bytes"] / 1024:>9,.0f} KiB')
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            compare(results, json.load(f))
+    if profiler:
+        pstats.Stats(profiler, stream=sys.stdout).sort_stats('cumulative').print_stats(20)
@@ -0,0 +1,49 @@
+"""
+Contention benchmark: many threads doing random transfers between a pool of
+ThreadSafeBankAccount objects, for several lock stripe counts
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from time import perf_counter
+import argparse
+import random
+from concurrent_accounts import StripedLock, ThreadSafeBankAccount, transfer
+
+def run(accounts, threads, operations):
+    def worker(seed):
+        rng = random.Random(seed)
+        for _ in range(operations):
+            source, target = rng.sample(accounts, 2)
+            transfer(source, target, f'{rng.randint(1, 5000) / 100:.2f}')
+
+    start = perf_counter()
+    with ThreadPoolExecutor(threads) as executor:
+        list(executor.map(worker, range(threads)))
+    return perf_counter() - start
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('-t', '--threads',
+                        type=int, default=32,
+                        help='Number of worker threads.')
+    parser.add_argument('-a', '--accounts',
+                        type=int, default=100,
+                        help='Number of accounts transferring between each other.')
+    parser.add_argument('-n', '--operations',
+                        type=int, default=2_000,
+                        help='Number of transfers per thread.')
+    args = parser.parse_args()
+
+    for stripes in (1, 16, 256, 4096):
+        ThreadSafeBankAccount._locks = StripedLock(stripes)
+        accounts = [ThreadSafeBankAccount('bench', 'mark') for _ in range(args.accounts)]
+        for account in accounts:
+            account.deposit('1000')
+
+        elapsed = run(accounts, args.threads, args.operations)
+        total = sum(Decimal(account.balance) for account in accounts)
+        overdrawn = sum(Decimal(account.balance) < 0 for account in accounts)
+        print(f'{stripes:>5} stripes: {args.threads * args.operations / elapsed:>10,.0f} transfers/s, '
+              f'total {total} (expected {1000 * args.accounts}), {overdrawn} overdrawn')
@@ -0,0 +1,80 @@
+"""
+Benchmarks transaction codes: generation with TransactionCodeFactory and parsing
+with BankAccount.parse_transaction_codes, against the original one-code-at-a-time
+strftime/urandom and strptime implementations
+"""
+
+from datetime import datetime, timezone, timedelta
+from time import perf_counter
+import argparse
+from bank_account import BankAccount, Transaction
+from transaction_code_factory import TransactionCodeFactory
+
+def generate_transaction_code_strftime(type_code, account_id):
+    # the original implementation, kept as the baseline
+    datetime_code = datetime.now(timezone.utc).strftime('%Y%m%d%H%M%S%f')
+    random_code = BankAccount.generate_random_digits(6)
+    return f'{type_code}-{account_id}-{datetime_code}-{random_code}'
+
+def parse_transaction_code_strptime(transaction_code, preferred_timezone=None):
+    # the original implementation, kept as the baseline
+    transaction_parameters = transaction_code.split('-')
+    for k, v in BankAccount._TRANSACTION_TYPES.items():
+        if v == transaction_parameters[0]:
+            transaction_type = k
+            break
+    account_id = transaction_parameters[1]
+    transaction_datetime = datetime.strptime(transaction_parameters[2], '%Y%m%d%H%M%S%f').replace(tzinfo=timezone.utc)
+    if preferred_timezone is None:
+        transaction_datetime_preferred = transaction_datetime
+    else:
+        transaction_datetime_preferred = transaction_datetime.astimezone(preferred_timezone)
+    random_code = transaction_parameters[3]
+    return Transaction(transaction_type, account_id, transaction_datetime, transaction_datetime_preferred, random_code)
+
+def make_transaction_codes(n):
+    ba = BankAccount('bench', 'mark')
+    transaction_codes = [ba.generate_transaction_code(transaction_type) for transaction_type in BankAccount._TRANSACTION_TYPES]
+    return (transaction_codes * (n // len(transaction_codes) + 1))[:n]
+
+def measure(label, function, n):
+    start = perf_counter()
+    function()
+    elapsed = perf_counter() - start
+    print(f'{label:<40}{elapsed:>10.3f} s{n / elapsed:>14,.0f} codes/s')
+    return elapsed
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('-n', '--number',
+                        type=int, default=1_000_000,
+                        help='Number of transaction codes to generate and parse.')
+    parser.add_argument('-o', '--offset',
+                        type=int, default=8,
+                        help='Hours offset of the preferred timezone.')
+    args = parser.parse_args()
+
+    n = args.number
+    account_id = BankAccount('bench', 'mark').account_id
+    factory = TransactionCodeFactory()
+    print('generate')
+    baseline = measure('generate_transaction_code (strftime)',
+                       lambda: [generate_transaction_code_strftime('D', account_id) for _ in range(n)], n)
+    single = measure('TransactionCodeFactory.generate',
+                     lambda: [factory.generate('D', account_id) for _ in range(n)], n)
+    bulk = measure('TransactionCodeFactory.generate_many',
+                   lambda: factory.generate_many('D', [account_id] * n), n)
+    print(f'speedup: single {baseline / single:.1f}x, bulk {baseline / bulk:.1f}x')
+
+    print('parse')
+    preferred_timezone = timezone(timedelta(hours=args.offset))
+    transaction_codes = make_transaction_codes(n)
+
+    baseline = measure('parse_transaction_code (strptime)',
+                       lambda: [parse_transaction_code_strptime(code, preferred_timezone) for code in transaction_codes], n)
+    single = measure('parse_transaction_code',
+                     lambda: [BankAccount.parse_transaction_code(code, preferred_timezone) for code in transaction_codes], n)
+    bulk = measure('parse_transaction_codes',
+                   lambda: list(BankAccount.parse_transaction_codes(transaction_codes, preferred_timezone)), n)
+    print(f'speedup: single {baseline / single:.1f}x, bulk {baseline / bulk:.1f}x')
@@ -0,0 +1,92 @@
+from contextlib import contextmanager
+import asyncio
+import threading
+from bank_account import BankAccount
+
+class StripedLock:
+    # a fixed pool of reentrant locks shared by all accounts, the stripe of an account is picked from its id
+    def __init__(self, stripes=256):
+        self._locks = [threading.RLock() for _ in range(stripes)]
+
+    def stripe(self, account_id):
+        return int(account_id) % len(self._locks)
+
+    @contextmanager
+    def locked(self, *account_ids):
+        # stripes are always acquired in ascending order, so two threads locking the same accounts
+        # (e.g. opposite transfers) can never wait on each other in a cycle
+        stripes = sorted({self.stripe(account_id) for account_id in account_ids})
+        for stripe in stripes:
+            self._locks[stripe].acquire()
+        try:
+            yield
+        finally:
+            for stripe in reversed(stripes):
+                self._locks[stripe].release()
+
+
+class ThreadSafeBankAccount(BankAccount):
+    # the check-then-act in withdraw (and every other balance update) runs under the account's stripe lock
+    __slots__ = ()
+    _locks = StripedLock()
+
+    def deposit(self, amount):
+        with self._locks.locked(self._account_id):
+            return super().deposit(amount)
+
+    def withdraw(self, amount):
+        with self._locks.locked(self._account_id):
+            return super().withdraw(amount)
+
+    def pay_interest(self, monthly_interest_rate=None):
+        with self._locks.locked(self._account_id):
+            return super().pay_interest(monthly_interest_rate)
+
+
+def transfer(source, target, amount):
+    # atomically withdraw from source and deposit into target, returns (withdraw code, deposit code)
+    # the deposit code is None when the withdrawal is declined, in which case nothing changes
+    # the ThreadSafeBankAccount methods are called explicitly, like in async_transfer, so AsyncBankAccount instances
+    # can be transferred from synchronous code too: their awaitable overrides would only return coroutines
+    if source.account_id == target.account_id:
+        raise ValueError('Internal error: cannot transfer to the same account')
+    with ThreadSafeBankAccount._locks.locked(source.account_id, target.account_id):
+        withdraw_code = ThreadSafeBankAccount.withdraw(source, amount)
+        if withdraw_code[0] == BankAccount._TRANSACTION_TYPES['declined']:
+            return withdraw_code, None
+        return withdraw_code, ThreadSafeBankAccount.deposit(target, amount)
+
+
+class AsyncBankAccount(ThreadSafeBankAccount):
+    # awaitable operations for coroutines, serialized per account by an asyncio.Lock
+    # the stripe lock is still taken underneath, so the same account can be shared with threads
+    __slots__ = '_lock'
+
+    def __init__(self, firstname, lastname, hours_offset=None):
+        super().__init__(firstname, lastname, hours_offset)
+        self._lock = asyncio.Lock()
+
+    async def deposit(self, amount):
+        async with self._lock:
+            return super().deposit(amount)
+
+    async def withdraw(self, amount):
+        async with self._lock:
+            return super().withdraw(amount)
+
+    async def pay_interest(self, monthly_interest_rate=None):
+        async with self._lock:
+            return super().pay_interest(monthly_interest_rate)
+
+
+async def async_transfer(source, target, amount):
+    # awaitable transfer between AsyncBankAccount instances, asyncio locks taken in account id order
+    if source.account_id == target.account_id:
+        raise ValueError('Internal error: cannot transfer to the same account')
+    first, second = sorted((source, target), key=lambda account: account.account_id)
+    async with first._lock, second._lock:
+        with ThreadSafeBankAccount._locks.locked(source.account_id, target.account_id):
+            withdraw_code = ThreadSafeBankAccount.withdraw(source, amount)
+            if withdraw_code[0] == BankAccount._TRANSACTION_TYPES['declined']:
+                return withdraw_code, None
+            return withdraw_code, ThreadSafeBankAccount.deposit(target, amount)
@@ -0,0 +1,75 @@
+from array import array
+from bisect import bisect_right, insort
+from datetime import date
+from decimal import Decimal
+from bank_account import BankAccount
+from bank_ledger import BankLedger, _DIGITS
+from transaction_journal import UNITS_PER_CENT
+
+class InterestRateSchedule:
+    # monthly interest rates per product, indexed by effective date
+    # every effective date carries a list of tiers (min balance in cents, rate), a balance earns the rate of
+    # the highest tier it reaches, so back-dated recomputation just looks up an older effective date
+    def __init__(self):
+        self._dates = {} # product -> sorted effective dates
+        self._tiers = {} # product -> {effective date: (sorted min balances, rates)}
+
+    @staticmethod
+    def _to_decimal(value):
+        # the same numeric strings BankAccount.set_monthly_interest_rate accepts
+        if BankAccount.validate_interest_rate(value):
+            return Decimal(value)
+        raise ValueError('Internal error: the interest rate and the tier balances should be numeric strings')
+
+    def set_rate(self, effective_date, rates, product='standard'):
+        # rates is a numeric string, or a mapping of min balance (numeric string) -> rate for tiered products
+        if not isinstance(effective_date, date):
+            raise TypeError('Internal error: the effective date should be a date')
+        if isinstance(rates, str):
+            rates = {'0': rates}
+        tiers = sorted((int(self._to_decimal(min_balance).scaleb(2)), self._to_decimal(rate))
+                       for min_balance, rate in rates.items())
+        if not tiers or tiers[0][0] != 0:
+            raise ValueError('Internal error: the lowest tier should start at a balance of 0')
+
+        dates = self._dates.setdefault(product, [])
+        product_tiers = self._tiers.setdefault(product, {})
+        if effective_date not in product_tiers:
+            insort(dates, effective_date)
+        product_tiers[effective_date] = ([min_balance for min_balance, _ in tiers], [rate for _, rate in tiers])
+
+    def _tiers_at(self, on_date, product):
+        dates = self._dates.get(product)
+        if dates is None:
+            raise KeyError(f'Internal error: unknown product {product!r}')
+        index = bisect_right(dates, on_date) - 1
+        if index < 0:
+            raise LookupError(f'Internal error: no {product} rate in effect on {on_date}')
+        return self._tiers[product][dates[index]]
+
+    def rate_at(self, on_date, product='standard', balance_cents=0):
+        min_balances, rates = self._tiers_at(on_date, product)
+        return rates[max(bisect_right(min_balances, balance_cents) - 1, 0)]
+
+    def accrue_interest(self, accounts, period, product='standard'):
+        # interest in units (millionths of a cent, see bank_ledger) for every account for the period (any date in it,
+        # the rates in effect on that date apply), rounded half-even like BankLedger.pay_interest, so sub-cent
+        # balances and interest compound the same way; accounts is a BankLedger or an iterable of BankAccount
+        # the result can be credited with BankLedger.post_interest_units, nothing is applied here
+        min_balances, rates = self._tiers_at(period, product)
+        min_balances = [min_balance * UNITS_PER_CENT for min_balance in min_balances]
+        ratios = [rate.as_integer_ratio() for rate in rates]
+        round_half_even = BankLedger.round_half_even
+        if isinstance(accounts, BankLedger):
+            balances = accounts._balances
+        else:
+            balances = [int(account._balance.scaleb(_DIGITS).to_integral_value()) for account in accounts]
+
+        if len(ratios) == 1:
+            numerator, denominator = ratios[0]
+            return array('q', [round_half_even(balance * numerator, denominator) for balance in balances])
+        interest = array('q')
+        for balance in balances:
+            numerator, denominator = ratios[max(bisect_right(min_balances, balance) - 1, 0)]
+            interest.append(round_half_even(balance * numerator, denominator))
+        return interest
@@ -0,0 +1,57 @@
+from itertools import groupby, tee
+from bank_account import BankAccount
+
+# effect of each transaction type on the balance
+_SIGNS = {'deposit': 1, 'withdraw': -1, 'pay_interest': 1, 'declined': 0}
+
+def format_cents(cents):
+    sign = '-' if cents < 0 else ''
+    return f'{sign}{abs(cents) // 100}.{abs(cents) % 100:02}'
+
+def _parse_entries(entries):
+    # (transaction_code, amount_cents) pairs -> (Transaction, amount_cents) pairs, one entry in memory at a time
+    codes, amounts = tee(entries)
+    transactions = BankAccount.parse_transaction_codes(code for code, _ in codes)
+    return zip(transactions, (amount_cents for _, amount_cents in amounts))
+
+def statement_lines(entries, accounts):
+    # entries: (transaction_code, amount_cents) pairs sorted by account id, e.g. from a sorted JournalReader.iter_transactions()
+    # accounts: mapping of account id -> BankAccount, used for the name and the preferred timezone
+    # yields the lines of one statement after another, only the current account's running totals are kept
+    previous_account_id = None
+    for account_id, group in groupby(_parse_entries(entries), key=lambda entry: entry[0].account_id):
+        if previous_account_id is not None and account_id <= previous_account_id:
+            raise ValueError(f'Internal error: the journal is not sorted by account id ({account_id} after {previous_account_id})')
+        previous_account_id = account_id
+
+        account = accounts.get(account_id)
+        preferred_timezone = BankAccount.get_timezone(None) if account is None else account.preferred_timezone
+        offset = BankAccount.get_timezone_offset(preferred_timezone)
+        name = 'unknown account' if account is None else account.fullname
+        yield f'Statement of account {account_id}, {name} ({preferred_timezone})\n'
+
+        totals = dict.fromkeys(_SIGNS, 0)
+        for transaction, amount_cents in group:
+            if offset is None:
+                transaction_datetime = transaction.transaction_datetime.astimezone(preferred_timezone)
+            else:
+                transaction_datetime = transaction.transaction_datetime + offset
+            totals[transaction.transaction_type] += amount_cents
+            yield (f'  {transaction_datetime:%Y-%m-%d %H:%M:%S}  {transaction.transaction_type:<12}'
+                   f'{format_cents(_SIGNS[transaction.transaction_type] * amount_cents):>16}'
+                   f'  {transaction.random_code}\n')
+
+        net = sum(_SIGNS[transaction_type] * cents for transaction_type, cents in totals.items())
+        yield (f'  deposits {format_cents(totals['deposit'])}, withdrawals {format_cents(totals['withdraw'])}, '
+               f'interest {format_cents(totals['pay_interest'])}, declined {format_cents(totals['declined'])}, '
+               f'net change {format_cents(net)}\n\n')
+
+def write_statements(entries, accounts, file):
+    # stream the statements into a text file object, memory use does not depend on the number of entries
+    for line in statement_lines(entries, accounts):
+        file.write(line)
+
+def sort_key(entry):
+    # puts (transaction_code, amount_cents) pairs in account id order, then time order
+    # (the fixed-width account id and datetime follow the type code)
+    return entry[0][2:]
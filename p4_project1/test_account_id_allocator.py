@@ -0,0 +1,130 @@
+import unittest
+import gc
+import os
+import tempfile
+import warnings
+import account_id_allocator
+from multiprocessing import Pool
+from account_id_allocator import (MemoryAccountIdAllocator, MmapAccountIdAllocator,
+                                  SqliteAccountIdAllocator, BlockAccountIdAllocator)
+from bank_account import BankAccount
+
+def run_tests(test_case_class):
+    suite = unittest.TestLoader().loadTestsFromTestCase(test_case_class)
+    runner = unittest.TextTestRunner(verbosity=2)
+    runner.run(suite)
+
+def reserve_from_file(path):
+    # worker process: reserve ids from the shared mmap file
+    with MmapAccountIdAllocator(path, initial_capacity=8) as allocator:
+        return allocator.reserve_block(500, length=4)
+
+
+class AccountIdAllocatorTestCase(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def check_allocator(self, allocator):
+        account_id = allocator.allocate()
+        self.assertEqual(len(account_id), 18)
+        self.assertTrue(account_id.isdigit())
+        self.assertTrue(account_id in allocator)
+        self.assertTrue(int(account_id) in allocator)
+
+        # a 3 digit id space holds 1000 ids, so every one of them ends up reserved exactly once
+        account_ids = allocator.reserve_block(999, length=3) + [allocator.allocate(3)]
+        self.assertEqual(len(account_ids), len(set(account_ids)))
+        self.assertTrue(all(len(account_id) == 3 for account_id in account_ids))
+        self.assertEqual(sorted(map(int, account_ids)), list(range(1000)))
+        self.assertEqual(len(allocator), 1001)
+        self.assertFalse('123456' in allocator)
+
+    def test_memory_allocator(self):
+        self.check_allocator(MemoryAccountIdAllocator(initial_capacity=8))
+
+    def test_mmap_allocator(self):
+        path = os.path.join(self.directory.name, 'account_ids.bin')
+        with MmapAccountIdAllocator(path, initial_capacity=8) as allocator:
+            self.check_allocator(allocator)
+        # ids survive a restart
+        with MmapAccountIdAllocator(path) as allocator:
+            self.assertEqual(len(allocator), 1001)
+            self.assertTrue('042' in allocator)
+
+        # exception cases
+        path = os.path.join(self.directory.name, 'other.bin')
+        with open(path, 'wb') as f:
+            f.write(bytes(64))
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            self.assertRaises(ValueError, MmapAccountIdAllocator, path)
+            gc.collect()
+        # the file is closed when the header check fails
+        self.assertEqual([warning for warning in caught if issubclass(warning.category, ResourceWarning)], [])
+
+    def test_mmap_allocator_interrupted_grow(self):
+        # a crash while the table is rebuilt loses no id, the next allocator to lock the file rebuilds it
+        path = os.path.join(self.directory.name, 'account_ids.bin')
+        with MmapAccountIdAllocator(path, initial_capacity=8) as allocator:
+            account_ids = allocator.reserve_block(4, length=4)
+            find_slot = account_id_allocator._find_slot
+            calls = []
+            def crashing_find_slot(slots, key):
+                calls.append(key)
+                if len(calls) == 3:
+                    raise KeyboardInterrupt
+                return find_slot(slots, key)
+            account_id_allocator._find_slot = crashing_find_slot
+            try:
+                self.assertRaises(KeyboardInterrupt, allocator.reserve_block, 1, length=4)
+            finally:
+                account_id_allocator._find_slot = find_slot
+            self.assertTrue(os.path.exists(path + '.grow'))
+        with MmapAccountIdAllocator(path) as allocator:
+            self.assertEqual(len(allocator), 4)
+            self.assertTrue(all(account_id in allocator for account_id in account_ids))
+            self.assertFalse(os.path.exists(path + '.grow'))
+            self.assertEqual(len(allocator.reserve_block(10, length=4)), 10)
+            self.assertEqual(len(allocator), 14)
+
+    def test_mmap_allocator_across_processes(self):
+        path = os.path.join(self.directory.name, 'account_ids.bin')
+        with Pool(4) as pool:
+            blocks = pool.map(reserve_from_file, [path] * 4)
+        account_ids = [account_id for block in blocks for account_id in block]
+        self.assertEqual(len(account_ids), 2000)
+        self.assertEqual(len(set(account_ids)), 2000)
+        with MmapAccountIdAllocator(path) as allocator:
+            self.assertEqual(len(allocator), 2000)
+
+    def test_sqlite_allocator(self):
+        path = os.path.join(self.directory.name, 'account_ids.db')
+        with SqliteAccountIdAllocator(path) as allocator:
+            self.check_allocator(allocator)
+        with SqliteAccountIdAllocator(path) as allocator:
+            self.assertEqual(len(allocator), 1001)
+
+    def test_block_allocator(self):
+        shared = MemoryAccountIdAllocator()
+        worker1 = BlockAccountIdAllocator(shared, block_size=100)
+        worker2 = BlockAccountIdAllocator(shared, block_size=100)
+        account_ids = [worker1.allocate(), worker2.allocate(), worker1.allocate()]
+        self.assertEqual(len(set(account_ids)), 3)
+        self.assertEqual(len(shared), 200)
+        self.assertTrue(all(account_id in worker2 for account_id in account_ids))
+
+    def test_bank_account_allocator(self):
+        allocator = BankAccount._account_ids
+        try:
+            BankAccount.set_account_id_allocator(MemoryAccountIdAllocator())
+            ba = BankAccount('john', 'cleese')
+            self.assertTrue(ba.account_id in BankAccount._account_ids)
+            self.assertFalse(ba.account_id in allocator)
+        finally:
+            BankAccount.set_account_id_allocator(allocator)
+
+if __name__ == '__main__':
+    run_tests(AccountIdAllocatorTestCase)
@@ -0,0 +1,74 @@
+import unittest
+import os
+import tempfile
+from bank_account import BankAccount
+from account_index import AccountIndex
+
+def run_tests(test_case_class):
+    suite = unittest.TestLoader().loadTestsFromTestCase(test_case_class)
+    runner = unittest.TextTestRunner(verbosity=2)
+    runner.run(suite)
+
+
+class AccountIndexTestCase(unittest.TestCase):
+    def setUp(self):
+        self.accounts = [BankAccount('john', 'cleese'), BankAccount('johnny', 'depp'),
+                         BankAccount('eric', 'idle'), BankAccount('john', 'chapman')]
+        self.index = AccountIndex(self.accounts[:3])
+        self.index.add(self.accounts[3])
+
+    def test_lookups(self):
+        john_cleese, johnny_depp, eric_idle, john_chapman = self.accounts
+        self.assertEqual(len(self.index), 4)
+        self.assertTrue(eric_idle.account_id in self.index)
+        self.assertIs(self.index.get(eric_idle.account_id), eric_idle)
+        self.assertIsNone(self.index.get('1'))
+
+        self.assertEqual(self.index.find_by_fullname_prefix('john'), [john_chapman, john_cleese, johnny_depp])
+        self.assertEqual(self.index.find_by_fullname_prefix(' JOHN  c'), [john_chapman, john_cleese])
+        self.assertEqual(self.index.find_by_fullname_prefix('john c', limit=1), [john_chapman])
+        self.assertEqual(self.index.find_by_fullname_prefix('x'), [])
+        self.assertEqual(self.index.find_by_lastname('Idle'), [eric_idle])
+        self.assertEqual(self.index.find_by_lastname('Idl'), [])
+        self.assertEqual(self.index.find_by_lastname_prefix('c'), [john_chapman, john_cleese])
+
+        # exception cases
+        self.assertRaises(ValueError, self.index.add, john_cleese)
+        self.assertRaises(KeyError, self.index.remove, BankAccount('graham', 'chapman'))
+
+    def test_setters_and_remove(self):
+        john_cleese, johnny_depp, eric_idle, john_chapman = self.accounts
+        john_cleese.firstname = 'terry'
+        john_cleese.lastname = 'jones'
+        self.assertEqual(self.index.find_by_fullname_prefix('john'), [john_chapman, johnny_depp])
+        self.assertEqual(self.index.find_by_fullname_prefix('terry jones'), [john_cleese])
+        self.assertEqual(self.index.find_by_lastname('cleese'), [])
+        self.assertEqual(self.index.find_by_lastname('jones'), [john_cleese])
+
+        # accounts outside the index are ignored, and a failed change does not touch the index
+        BankAccount('michael', 'palin').lastname = 'jones'
+        self.assertRaises(ValueError, setattr, eric_idle, 'lastname', '123')
+        self.assertEqual(self.index.find_by_lastname('jones'), [john_cleese])
+        self.assertEqual(self.index.find_by_lastname('idle'), [eric_idle])
+
+        self.index.remove(john_cleese)
+        self.assertEqual(len(self.index), 3)
+        self.assertEqual(self.index.find_by_lastname('jones'), [])
+        self.assertEqual(len(self.index._fullnames), 3)
+
+    def test_snapshot(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'index.pickle')
+            self.index.save(path)
+            index = AccountIndex.load(path, self.accounts)
+            self.assertEqual(index.find_by_fullname_prefix('john'), self.index.find_by_fullname_prefix('john'))
+            self.assertIs(index.get(self.accounts[2].account_id), self.accounts[2])
+
+            # the loaded index follows the setters too
+            self.accounts[2].firstname = 'graham'
+            self.assertEqual(index.find_by_fullname_prefix('graham'), [self.accounts[2]])
+
+            # exception cases
+            self.assertRaises(ValueError, AccountIndex.load, path, self.accounts[:3])
+
+run_tests(AccountIndexTestCase)
@@ -0,0 +1,123 @@
+import unittest
+import os
+import tempfile
+from decimal import Decimal
+from bank_account import BankAccount
+from bank_ledger import BankLedger
+from account_snapshot import save_snapshot, load_snapshot, load_ledger_snapshot
+
+def run_tests(test_case_class):
+    suite = unittest.TestLoader().loadTestsFromTestCase(test_case_class)
+    runner = unittest.TextTestRunner(verbosity=2)
+    runner.run(suite)
+
+
+class AccountSnapshotTestCase(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'accounts.snap')
+        self.accounts = [BankAccount('john', 'cleese', 10), BankAccount('eric', 'idle', -5.5),
+                         BankAccount('john', 'chapman')]
+        self.accounts[0].deposit('100.25')
+        self.accounts[1].deposit('7')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_round_trip(self):
+        save_snapshot(self.accounts, self.path)
+        accounts = load_snapshot(self.path)
+        self.assertEqual(len(accounts), 3)
+        for original, restored in zip(self.accounts, accounts):
+            self.assertEqual(restored.account_id, original.account_id)
+            self.assertEqual(restored.fullname, original.fullname)
+            self.assertEqual(restored.preferred_timezone, original.preferred_timezone)
+            self.assertEqual(restored.balance, original.balance)
+        # shared objects: names are interned, timezones come from the class cache
+        self.assertIs(accounts[0].firstname, accounts[2].firstname)
+        self.assertIs(accounts[1].preferred_timezone, BankAccount.get_timezone(-5.5))
+
+        # the restored accounts behave like any other account
+        accounts[2].deposit('1.5')
+        self.assertEqual(accounts[2].balance, '1.50')
+        accounts[0].lastname = 'jones'
+        self.assertEqual(accounts[0].fullname, 'John Jones')
+
+        # the restored ids are claimed in the allocator
+        self.assertTrue(all(account.account_id in BankAccount._account_ids for account in accounts))
+
+    def test_ledger(self):
+        ledger = BankLedger()
+        ledger.open_account('john', 'cleese', 2)
+        ledger.open_account('eric', 'idle')
+        ledger.deposit(['12.34', '0.01'])
+        save_snapshot(ledger, self.path)
+
+        restored = load_ledger_snapshot(self.path)
+        self.assertEqual(len(restored), 2)
+        self.assertEqual(restored.total_balance, '12.35')
+        self.assertEqual(restored[0].fullname, 'John Cleese')
+        self.assertEqual(restored[1].account_id, ledger[1].account_id)
+        restored.deposit(['1', '2'])
+        self.assertEqual(restored[1].balance, '2.01')
+
+    def test_sub_cent_balances(self):
+        # interest keeps sub-cent digits, a snapshot restores them exactly
+        monthly_interest_rate = BankAccount.get_monthly_interest_rate()
+        BankAccount.set_monthly_interest_rate('0.005')
+        try:
+            ledger = BankLedger()
+            ledger.open_account('terry', 'jones')
+            ledger.open_account('carol', 'cleveland')
+            ledger.deposit(['1.01', '250'])
+            ledger.pay_interest()
+            self.assertEqual(ledger[0]._balance, Decimal('1.01505000'))
+            save_snapshot(ledger, self.path)
+            restored = load_ledger_snapshot(self.path)
+            self.assertEqual(list(restored._balances), list(ledger._balances))
+            for _ in range(24):
+                ledger.pay_interest()
+                restored.pay_interest()
+            self.assertEqual([account.balance for account in restored], [account.balance for account in ledger])
+            self.assertEqual(list(restored._balances), list(ledger._balances))
+
+            ba = BankAccount('graham', 'chapman')
+            ba.deposit('1.01')
+            ba.pay_interest()
+            save_snapshot([ba], self.path)
+            self.assertEqual(load_snapshot(self.path)[0]._balance, ba._balance)
+        finally:
+            BankAccount.set_monthly_interest_rate(monthly_interest_rate)
+
+    def test_empty(self):
+        save_snapshot([], self.path)
+        self.assertEqual(load_snapshot(self.path), [])
+
+    def test_exceptions(self):
+        save_snapshot(self.accounts, self.path)
+        with open(self.path, 'rb') as f:
+            data = bytearray(f.read())
+
+        # flipped byte in the body
+        corrupted = bytearray(data)
+        corrupted[-1] ^= 0xFF
+        with open(self.path, 'wb') as f:
+            f.write(corrupted)
+        self.assertRaises(ValueError, load_snapshot, self.path)
+
+        # unknown version
+        corrupted = bytearray(data)
+        corrupted[8] = 3
+        with open(self.path, 'wb') as f:
+            f.write(corrupted)
+        self.assertRaises(ValueError, load_snapshot, self.path)
+
+        # not a snapshot
+        with open(self.path, 'wb') as f:
+            f.write(b'BKJRNL01' + bytes(data[8:]))
+        self.assertRaises(ValueError, load_snapshot, self.path)
+        with open(self.path, 'wb') as f:
+            f.write(b'short')
+        self.assertRaises(ValueError, load_snapshot, self.path)
+
+run_tests(AccountSnapshotTestCase)
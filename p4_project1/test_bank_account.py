@@ -2,6 +2,7 @@ import unittest
 from bank_account import BankAccount, Transaction
 from datetime import datetime, timezone, timedelta
 from decimal import Decimal
+from array import array
 
 def run_tests(test_case_class):
     suite = unittest.TestLoader().loadTestsFromTestCase(test_case_class)
@@ -90,6 +91,22 @@ class BankAccountTestCase(unittest.TestCase):
         self.assertRaises(ValueError, setattr, ba1, 'lastname', '123aa')
         self.assertRaises(ValueError, setattr, ba1, 'lastname', 'john cleese')
 
+    def test_compact_representation(self):
+        ba1 = BankAccount('john', 'cleese', 10)
+        ba2 = BankAccount(' JOHN ', 'Chapman', 10)
+
+        self.assertFalse(hasattr(ba1, '__dict__'))
+        self.assertRaises(AttributeError, setattr, ba1, 'nickname', 'johnny')
+        self.assertIs(ba1.preferred_timezone, ba2.preferred_timezone)
+        self.assertIs(BankAccount.get_timezone(None), timezone.utc)
+        self.assertIs(ba1.firstname, ba2.firstname)
+        self.assertTrue(isinstance(ba1._account_id, int))
+        self.assertEqual(int(ba1.account_id), ba1._account_id)
+        self.assertEqual(len(ba1.account_id), 18)
+
+        # exception cases
+        self.assertRaises(ValueError, BankAccount.get_timezone, 30)
+
     def test_instance_methods(self):
         ba = BankAccount('john', 'cleese')
         balance = Decimal(ba.balance)
@@ -124,6 +141,30 @@ class BankAccountTestCase(unittest.TestCase):
         self.assertRaises(ValueError, ba.withdraw, '-1')
         self.assertRaises(TypeError, ba.withdraw, 100)
 
+    def test_parse_amount(self):
+        self.assertEqual(BankAccount.parse_amount('100'), 10000)
+        self.assertEqual(BankAccount.parse_amount(' 100.3 '), 10030)
+        self.assertEqual(BankAccount.parse_amount('0.05'), 5)
+        self.assertEqual(BankAccount.parse_amount('007.10'), 710)
+        for amount in ('', ' ', '.', '.5', '123.', '0', '0.00', '-1', '+1', '1.234', '1e3', 'inf', 'nan', '1 000', '1_000', '1.-1'):
+            self.assertIsNone(BankAccount.parse_amount(amount))
+            self.assertFalse(BankAccount.validate_amount(amount))
+        self.assertRaises(TypeError, BankAccount.parse_amount, 100)
+        self.assertRaises(TypeError, BankAccount.validate_amount, None)
+
+        cents, invalid_rows = BankAccount.parse_amounts(['1', 'x', '2.5', '0', '0.01'])
+        self.assertEqual(list(cents), [100, 0, 250, 0, 1])
+        self.assertEqual(invalid_rows, [1, 3])
+        self.assertRaises(TypeError, BankAccount.parse_amounts, ['1', 1])
+        self.assertEqual(BankAccount.parse_amounts([]), (array('q'), []))
+
+        # deposit and withdraw use the parsed amount
+        ba = BankAccount('john', 'cleese')
+        ba.deposit(' 007.1 ')
+        ba.withdraw('0.05 ')
+        self.assertEqual(ba.balance, '7.05')
+        self.assertEqual(str(ba._balance), '7.05')
+
     def test_generate_transaction_code(self):
         ba = BankAccount('john', 'cleese')
 
@@ -141,4 +182,35 @@ class BankAccountTestCase(unittest.TestCase):
         self.assertEqual(len(transaction.random_code), 6)
         self.assertTrue(transaction.random_code.isdigit())
 
+    def test_parse_transaction_codes(self):
+        ba = BankAccount('ben', 'son', 10)
+        transaction_codes = [ba.deposit('100'), ba.withdraw('10'), ba.withdraw('1000'), ba.pay_interest()]
+        transactions = list(BankAccount.parse_transaction_codes(transaction_codes, ba.preferred_timezone))
+
+        self.assertEqual([transaction.transaction_type for transaction in transactions],
+                         ['deposit', 'withdraw', 'declined', 'pay_interest'])
+        for transaction_code, transaction in zip(transaction_codes, transactions):
+            datetime_code = transaction_code.split('-')[2]
+            transaction_datetime = datetime.strptime(datetime_code, '%Y%m%d%H%M%S%f').replace(tzinfo=timezone.utc)
+            self.assertEqual(transaction, BankAccount.parse_transaction_code(transaction_code, ba.preferred_timezone))
+            self.assertEqual(transaction.account_id, ba.account_id)
+            self.assertEqual(transaction.transaction_datetime, transaction_datetime)
+            self.assertEqual(transaction.transaction_datetime_preferred.utcoffset(), timedelta(hours=10))
+            self.assertEqual(transaction.transaction_datetime_preferred,
+                             transaction_datetime.astimezone(ba.preferred_timezone))
+
+        # timezones without a fixed offset go through astimezone
+        from zoneinfo import ZoneInfo
+        tz = ZoneInfo('Europe/London')
+        transaction = BankAccount.parse_transaction_code('D-123-20240701120000000001-123456', tz)
+        self.assertEqual(transaction.transaction_datetime_preferred.hour, 13)
+        self.assertEqual(transaction.transaction_datetime_preferred.microsecond, 1)
+
+        # exception cases
+        self.assertRaises(ValueError, BankAccount.parse_transaction_code, 'A-123-20240701120000000001-123456')
+        self.assertRaises(ValueError, BankAccount.parse_transaction_code, 'D-123-20240701120000000001')
+        self.assertRaises(ValueError, BankAccount.parse_transaction_code, 'D-123-2024070112000000000-123456')
+        self.assertRaises(ValueError, BankAccount.parse_transaction_code, 'D-123-2024070112000000000a-123456')
+        self.assertRaises(ValueError, BankAccount.parse_transaction_code, 'D-123-20241301120000000001-123456')
+
 run_tests(BankAccountTestCase)
\ No newline at end of file
@@ -0,0 +1,110 @@
+import unittest
+from bank_account import BankAccount
+from bank_ledger import BankLedger, LedgerAccount
+from decimal import Decimal
+
+def run_tests(test_case_class):
+    suite = unittest.TestLoader().loadTestsFromTestCase(test_case_class)
+    runner = unittest.TextTestRunner(verbosity=2)
+    runner.run(suite)
+
+
+class BankLedgerTestCase(unittest.TestCase):
+    def setUp(self):
+        self.monthly_interest_rate = BankAccount.get_monthly_interest_rate()
+        BankAccount.set_monthly_interest_rate('0.005')
+        self.ledger = BankLedger()
+        self.accounts = [self.ledger.open_account('john', 'cleese'),
+                         self.ledger.open_account('eric', 'idle', 2),
+                         self.ledger.open_account('terry', 'jones', -5)]
+
+    def tearDown(self):
+        BankAccount.set_monthly_interest_rate(self.monthly_interest_rate)
+
+    def test_round_half_even(self):
+        self.assertEqual(BankLedger.round_half_even(5, 2), 2)
+        self.assertEqual(BankLedger.round_half_even(7, 2), 4)
+        self.assertEqual(BankLedger.round_half_even(11, 4), 3)
+        self.assertEqual(BankLedger.round_half_even(-5, 2), -2)
+        self.assertEqual(BankLedger.round_half_even(-7, 2), -4)
+        self.assertEqual(BankLedger.round_half_even(-11, 4), -3)
+
+    def test_views(self):
+        self.assertEqual(len(self.ledger), 3)
+        for row, account in enumerate(self.ledger):
+            self.assertTrue(isinstance(account, LedgerAccount))
+            self.assertTrue(isinstance(account, BankAccount))
+            self.assertEqual(account.row, row)
+            self.assertIs(self.ledger[row], account)
+            self.assertEqual(account.balance, '0.00')
+
+        # a failed account creation leaves no row behind
+        self.assertRaises(ValueError, self.ledger.open_account, 'john', '123')
+        self.assertEqual(len(self.ledger), 3)
+
+        # per-account operations write through to the ledger
+        self.accounts[0].deposit('10.05')
+        self.accounts[0].withdraw('0.05')
+        self.assertEqual(self.accounts[0].balance, '10.00')
+        self.assertEqual(self.ledger.total_balance, '10.00')
+
+    def test_deposit(self):
+        codes = self.ledger.deposit(['100', '0.01', '12.5'])
+        self.assertEqual([code[0] for code in codes], ['D', 'D', 'D'])
+        self.assertEqual([account.balance for account in self.accounts], ['100.00', '0.01', '12.50'])
+
+        # exception cases leave every balance unchanged
+        self.assertRaises(ValueError, self.ledger.deposit, ['1', '1'])
+        self.assertRaises(ValueError, self.ledger.deposit, ['1', '1', '-1'])
+        self.assertRaises(ValueError, self.ledger.deposit, ['1', '1', '0.001'])
+        self.assertRaises(TypeError, self.ledger.deposit, ['1', '1', 1])
+        self.assertEqual(self.ledger.total_balance, '112.51')
+
+    def test_withdraw(self):
+        self.ledger.deposit(['100', '10', '1'])
+        codes = self.ledger.withdraw(['99.99', '10', '1.01'])
+        self.assertEqual([code[0] for code in codes], ['W', 'W', 'X'])
+        self.assertEqual([account.balance for account in self.accounts], ['0.01', '0.00', '1.00'])
+        self.assertRaises(ValueError, self.ledger.withdraw, ['1', '1', '0'])
+
+    def test_pay_interest_matches_decimal(self):
+        # the ledger compounds like independent BankAccount instances, whose Decimal balances keep every digit
+        amounts = ['100', '0.01', '12345.67', '1.01']
+        ledger = BankLedger()
+        accounts = [ledger.open_account('john', 'cleese') for _ in amounts]
+        references = [BankAccount('john', 'cleese') for _ in amounts]
+        ledger.deposit(amounts)
+        for reference, amount in zip(references, amounts):
+            reference.deposit(amount)
+        for monthly_interest_rate in ['0.005'] * 24 + ['0.0123'] * 6 + ['-0.001'] * 6 + ['1'] * 2:
+            BankAccount.set_monthly_interest_rate(monthly_interest_rate)
+            codes = ledger.pay_interest()
+            for reference in references:
+                reference.pay_interest()
+            self.assertEqual([code[0] for code in codes], ['I'] * len(amounts))
+            self.assertEqual([account.balance for account in accounts], [reference.balance for reference in references])
+
+        # 1.01 at 0.005 per month: sub-cent interest is kept, not rounded at every posting
+        BankAccount.set_monthly_interest_rate('0.005')
+        ledger = BankLedger()
+        account, reference = ledger.open_account('eric', 'idle'), BankAccount('eric', 'idle')
+        account.deposit('1.01')
+        reference.deposit('1.01')
+        for _ in range(12):
+            ledger.pay_interest()
+            reference.pay_interest()
+            self.assertEqual(account.balance, reference.balance)
+        self.assertEqual(ledger.total_balance, reference.balance)
+
+        # a single account view rounds the same way as the bulk posting
+        BankAccount.set_monthly_interest_rate('0.005')
+        ledger = BankLedger()
+        account = ledger.open_account('graham', 'chapman')
+        account.deposit('0.03')
+        account.pay_interest()
+        self.assertEqual(account.balance, '0.03')
+        account.deposit('99.97')
+        account.pay_interest()
+        self.assertEqual(account.balance, '100.50')
+
+run_tests(BankLedgerTestCase)
@@ -0,0 +1,89 @@
+import unittest
+import asyncio
+import sys
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from concurrent_accounts import StripedLock, ThreadSafeBankAccount, AsyncBankAccount, transfer, async_transfer
+
+def run_tests(test_case_class):
+    suite = unittest.TestLoader().loadTestsFromTestCase(test_case_class)
+    runner = unittest.TextTestRunner(verbosity=2)
+    runner.run(suite)
+
+
+class ConcurrentAccountsTestCase(unittest.TestCase):
+    def setUp(self):
+        # switch threads as often as possible to provoke races
+        self.switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+
+    def tearDown(self):
+        sys.setswitchinterval(self.switch_interval)
+
+    def test_striped_lock(self):
+        locks = StripedLock(4)
+        self.assertEqual(locks.stripe('000000000000000005'), 1)
+        # reentrant, and the same stripe is only acquired once
+        with locks.locked('1', '5', '2'):
+            with locks.locked('1'):
+                pass
+
+    def test_no_overdraft(self):
+        ba = ThreadSafeBankAccount('john', 'cleese')
+        ba.deposit('100')
+        with ThreadPoolExecutor(32) as executor:
+            transaction_codes = list(executor.map(lambda _: ba.withdraw('1'), range(1000)))
+        self.assertEqual(sum(code[0] == 'W' for code in transaction_codes), 100)
+        self.assertEqual(ba.balance, '0.00')
+
+    def test_transfer(self):
+        accounts = [ThreadSafeBankAccount('eric', 'idle') for _ in range(4)]
+        for ba in accounts:
+            ba.deposit('100')
+
+        def opposite_transfers(i):
+            source, target = accounts[i % 4], accounts[(i + 1 + i % 3) % 4]
+            return transfer(source, target, '1.5')
+
+        with ThreadPoolExecutor(32) as executor:
+            results = list(executor.map(opposite_transfers, range(2000)))
+        self.assertEqual(sum(Decimal(ba.balance) for ba in accounts), 400)
+        self.assertTrue(all(Decimal(ba.balance) >= 0 for ba in accounts))
+        # a declined transfer leaves the target untouched
+        self.assertTrue(all(deposit_code is None for withdraw_code, deposit_code in results if withdraw_code[0] == 'X'))
+
+        # exception cases
+        self.assertRaises(ValueError, transfer, accounts[0], accounts[0], '1')
+        self.assertRaises(ValueError, transfer, accounts[0], accounts[1], '-1')
+
+    def test_async_account(self):
+        async def main():
+            source = AsyncBankAccount('terry', 'jones')
+            target = AsyncBankAccount('michael', 'palin')
+            await source.deposit('10')
+            results = await asyncio.gather(*(async_transfer(source, target, '1') for _ in range(15)),
+                                           *(async_transfer(target, source, '0.5') for _ in range(4)))
+            return source, target, results
+
+        source, target, results = asyncio.run(main())
+        self.assertEqual(Decimal(source.balance) + Decimal(target.balance), 10)
+        self.assertTrue(Decimal(source.balance) >= 0)
+        self.assertEqual(sum(withdraw_code[0] == 'W' for withdraw_code, _ in results),
+                         sum(deposit_code is not None for _, deposit_code in results))
+
+    def test_transfer_async_accounts(self):
+        # the synchronous transfer works on AsyncBankAccount instances, without leaving coroutines behind
+        async def open_accounts():
+            return AsyncBankAccount('graham', 'chapman'), AsyncBankAccount('carol', 'cleveland')
+
+        source, target = asyncio.run(open_accounts())
+        ThreadSafeBankAccount.deposit(source, '5')
+        with warnings.catch_warnings():
+            warnings.simplefilter('error')
+            withdraw_code, deposit_code = transfer(source, target, '2')
+            self.assertEqual((withdraw_code[0], deposit_code[0]), ('W', 'D'))
+            self.assertEqual(transfer(source, target, '4')[1], None)
+        self.assertEqual((source.balance, target.balance), ('3.00', '2.00'))
+
+run_tests(ConcurrentAccountsTestCase)
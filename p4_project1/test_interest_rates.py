@@ -0,0 +1,90 @@
+import unittest
+from datetime import date
+from decimal import Decimal
+from bank_account import BankAccount
+from bank_ledger import BankLedger
+from interest_rates import InterestRateSchedule
+
+def run_tests(test_case_class):
+    suite = unittest.TestLoader().loadTestsFromTestCase(test_case_class)
+    runner = unittest.TextTestRunner(verbosity=2)
+    runner.run(suite)
+
+
+class InterestRateScheduleTestCase(unittest.TestCase):
+    def setUp(self):
+        self.schedule = InterestRateSchedule()
+        self.schedule.set_rate(date(2024, 1, 1), '0.005')
+        self.schedule.set_rate(date(2024, 6, 1), '0.004')
+        self.schedule.set_rate(date(2024, 3, 1), '0.006')
+        self.schedule.set_rate(date(2024, 1, 1), {'0': '0.001', '1000': '0.002', '10000.50': '0.003'}, product='savings')
+
+    def test_rate_at(self):
+        self.assertEqual(self.schedule.rate_at(date(2024, 1, 1)), Decimal('0.005'))
+        self.assertEqual(self.schedule.rate_at(date(2024, 2, 29)), Decimal('0.005'))
+        self.assertEqual(self.schedule.rate_at(date(2024, 3, 1)), Decimal('0.006'))
+        self.assertEqual(self.schedule.rate_at(date(2025, 1, 1)), Decimal('0.004'))
+
+        # back-dated change replaces the rate of that date
+        self.schedule.set_rate(date(2024, 3, 1), '0.007')
+        self.assertEqual(self.schedule.rate_at(date(2024, 5, 31)), Decimal('0.007'))
+
+        # tiers
+        self.assertEqual(self.schedule.rate_at(date(2024, 1, 1), 'savings', -500), Decimal('0.001'))
+        self.assertEqual(self.schedule.rate_at(date(2024, 1, 1), 'savings', 99_999), Decimal('0.001'))
+        self.assertEqual(self.schedule.rate_at(date(2024, 1, 1), 'savings', 100_000), Decimal('0.002'))
+        self.assertEqual(self.schedule.rate_at(date(2024, 1, 1), 'savings', 1_000_050), Decimal('0.003'))
+
+        # exception cases
+        self.assertRaises(LookupError, self.schedule.rate_at, date(2023, 12, 31))
+        self.assertRaises(KeyError, self.schedule.rate_at, date(2024, 1, 1), 'other')
+        self.assertRaises(ValueError, self.schedule.set_rate, date(2024, 1, 1), 'inf')
+        self.assertRaises(ValueError, self.schedule.set_rate, date(2024, 1, 1), {'100': '0.1'})
+        self.assertRaises(TypeError, self.schedule.set_rate, '2024-01-01', '0.1')
+
+    def test_accrue_interest(self):
+        ledger = BankLedger()
+        for _ in range(3):
+            ledger.open_account('john', 'cleese')
+        ledger.deposit(['100', '1000', '20000.01'])
+
+        # interest in units, millionths of a cent
+        self.assertEqual(list(self.schedule.accrue_interest(ledger, date(2024, 1, 15))),
+                         [50_000_000, 500_000_000, 10_000_005_000])
+        self.assertEqual(list(self.schedule.accrue_interest(ledger, date(2024, 3, 15))),
+                         [60_000_000, 600_000_000, 12_000_006_000])
+        self.assertEqual(list(self.schedule.accrue_interest(ledger, date(2024, 1, 15), 'savings')),
+                         [10_000_000, 200_000_000, 6_000_003_000])
+        # plain accounts give the same result
+        self.assertEqual(self.schedule.accrue_interest(list(ledger), date(2024, 1, 15), 'savings'),
+                         self.schedule.accrue_interest(ledger, date(2024, 1, 15), 'savings'))
+
+        codes = ledger.post_interest_units(self.schedule.accrue_interest(ledger, date(2024, 3, 15)))
+        self.assertEqual([code[0] for code in codes], ['I', 'I', 'I'])
+        self.assertEqual([account.balance for account in ledger], ['100.60', '1006.00', '20120.01'])
+        self.assertRaises(ValueError, ledger.post_interest_units, [1, 2])
+        self.assertRaises(ValueError, ledger.post_interest, [1, 2])
+
+        # an explicit rate does not depend on the class level rate
+        ba = BankAccount('eric', 'idle')
+        ba.deposit('100')
+        ba.pay_interest(self.schedule.rate_at(date(2024, 6, 1)))
+        self.assertEqual(ba.balance, '100.40')
+        ledger.pay_interest(self.schedule.rate_at(date(2024, 6, 1)))
+        self.assertEqual(ledger[0].balance, '101.00')
+
+    def test_accrue_matches_pay_interest(self):
+        # accrued interest keeps the sub-cent digits, a small balance earns the same as with pay_interest
+        ledgers = [BankLedger(), BankLedger()]
+        for ledger in ledgers:
+            ledger.open_account('john', 'cleese')
+            ledger.open_account('eric', 'idle')
+            ledger.deposit(['1', '1234.56'])
+        rate = self.schedule.rate_at(date(2024, 6, 1))
+        for _ in range(12):
+            ledgers[0].post_interest_units(self.schedule.accrue_interest(ledgers[0], date(2024, 6, 1)))
+            ledgers[1].pay_interest(rate)
+        self.assertEqual(list(ledgers[0]._balances), list(ledgers[1]._balances))
+        self.assertEqual(ledgers[0][0]._balance, Decimal('1.04907020'))
+
+run_tests(InterestRateScheduleTestCase)
@@ -0,0 +1,79 @@
+import unittest
+import io
+import os
+import tempfile
+from itertools import count
+from bank_account import BankAccount
+from transaction_journal import TransactionJournal, JournalReader
+from statements import format_cents, statement_lines, write_statements, sort_key
+
+def run_tests(test_case_class):
+    suite = unittest.TestLoader().loadTestsFromTestCase(test_case_class)
+    runner = unittest.TextTestRunner(verbosity=2)
+    runner.run(suite)
+
+
+class StatementsTestCase(unittest.TestCase):
+    def test_format_cents(self):
+        self.assertEqual(format_cents(0), '0.00')
+        self.assertEqual(format_cents(5), '0.05')
+        self.assertEqual(format_cents(12345), '123.45')
+        self.assertEqual(format_cents(-1050), '-10.50')
+
+    def test_write_statements(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'journal.bin')
+            with TransactionJournal(path) as journal:
+                BankAccount.set_journal(journal)
+                try:
+                    ba1 = BankAccount('john', 'cleese', 10)
+                    ba2 = BankAccount('eric', 'idle', -5)
+                    ba1.deposit('100')
+                    ba2.deposit('50.5')
+                    ba1.withdraw('30.25')
+                    ba2.withdraw('1000')
+                finally:
+                    BankAccount.set_journal(None)
+            with JournalReader(path) as reader:
+                entries = sorted(reader.iter_transactions(), key=sort_key)
+
+        accounts = {ba1.account_id: ba1, ba2.account_id: ba2}
+        file = io.StringIO()
+        write_statements(entries, accounts, file)
+        statements = file.getvalue().split('\n\n')[:-1]
+        self.assertEqual(len(statements), 2)
+
+        statement = dict(zip(sorted(accounts), statements))[ba1.account_id].splitlines()
+        self.assertEqual(statement[0], f'Statement of account {ba1.account_id}, John Cleese (UTC+10:00)')
+        self.assertEqual(len(statement), 4)
+        self.assertEqual(statement[1].split()[2:4], ['deposit', '100.00'])
+        self.assertEqual(statement[2].split()[2:4], ['withdraw', '-30.25'])
+        self.assertTrue(statement[3].endswith('net change 69.75'))
+
+        # local time in the preferred timezone
+        transaction = BankAccount.parse_transaction_code(entries[0][0], accounts[entries[0][0].split('-')[1]].preferred_timezone)
+        self.assertTrue(f'{transaction.transaction_datetime_preferred:%Y-%m-%d %H:%M:%S}' in file.getvalue())
+
+        statement = dict(zip(sorted(accounts), statements))[ba2.account_id].splitlines()
+        self.assertEqual(statement[2].split()[2:4], ['declined', '0.00'])
+        self.assertTrue(statement[3].endswith('declined 1000.00, net change 50.50'))
+
+    def test_streaming(self):
+        # the statements of the first accounts come out before the rest of the journal is read
+        consumed = count()
+        def entries():
+            for account_id in range(10**9):
+                next(consumed)
+                yield f'D-{account_id:018}-20240701120000000000-123456', 100
+
+        lines = statement_lines(entries(), {})
+        for _ in range(9):
+            next(lines)
+        self.assertTrue(next(consumed) < 10)
+
+        # exception cases
+        unsorted = [('D-000000000000000002-20240701120000000000-123456', 1),
+                    ('D-000000000000000001-20240701120000000000-123456', 1)]
+        self.assertRaises(ValueError, list, statement_lines(unsorted, {}))
+
+run_tests(StatementsTestCase)
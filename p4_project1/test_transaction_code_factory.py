@@ -0,0 +1,68 @@
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from transaction_code_factory import TransactionCodeFactory
+from bank_account import BankAccount
+
+def run_tests(test_case_class):
+    suite = unittest.TestLoader().loadTestsFromTestCase(test_case_class)
+    runner = unittest.TextTestRunner(verbosity=2)
+    runner.run(suite)
+
+
+class TransactionCodeFactoryTestCase(unittest.TestCase):
+    def setUp(self):
+        self.factory = TransactionCodeFactory(entropy_chunk=64)
+
+    def test_generate(self):
+        before = datetime.now(timezone.utc)
+        transaction_code = self.factory.generate('D', '000000000000000042')
+        transaction = BankAccount.parse_transaction_code(transaction_code)
+
+        self.assertEqual(transaction.transaction_type, 'deposit')
+        self.assertEqual(transaction.account_id, '000000000000000042')
+        self.assertTrue(before <= transaction.transaction_datetime <= datetime.now(timezone.utc))
+        self.assertEqual(len(transaction.random_code), 6)
+        self.assertTrue(transaction.random_code.isdigit())
+
+    def test_generate_many(self):
+        # more codes than one entropy chunk holds
+        account_ids = [f'{i:018}' for i in range(100)]
+        transaction_codes = self.factory.generate_many('W', account_ids)
+        self.assertEqual(len(transaction_codes), 100)
+        self.assertEqual([code.split('-')[1] for code in transaction_codes], account_ids)
+        self.assertTrue(all(code[0] == 'W' for code in transaction_codes))
+        self.assertTrue(len({code.split('-')[3] for code in transaction_codes}) > 1)
+
+        transaction_codes = self.factory.generate_many(['D', 'X'], account_ids[:2])
+        self.assertEqual([code[0] for code in transaction_codes], ['D', 'X'])
+
+        # exception cases
+        self.assertRaises(ValueError, self.factory.generate_many, ['D', 'X'], account_ids)
+
+    def test_monotonic(self):
+        def generate(_):
+            return [self.factory.generate('D', '1')] + self.factory.generate_many('D', ['1'] * 10)
+
+        with ThreadPoolExecutor(8) as executor:
+            transaction_codes = [code for codes in executor.map(generate, range(200)) for code in codes]
+        datetime_codes = [code.split('-')[2] for code in transaction_codes]
+        # every timestamp is unique
+        self.assertEqual(len(set(datetime_codes)), len(datetime_codes))
+        # and within a thread they increase
+        for codes in map(generate, range(5)):
+            datetime_codes = [code.split('-')[2] for code in codes]
+            self.assertEqual(datetime_codes, sorted(datetime_codes))
+
+    def test_burst_drift(self):
+        # a burst is stamped one microsecond per code, so it ends ahead of the clock and the next code follows it
+        before = datetime.now(timezone.utc)
+        transaction_codes = self.factory.generate_many('D', ['1'] * 100_000)
+        transactions = list(BankAccount.parse_transaction_codes(transaction_codes))
+        first, last = transactions[0].transaction_datetime, transactions[-1].transaction_datetime
+        self.assertTrue(before <= first)
+        self.assertEqual((last - first).total_seconds(), 0.099999)
+        transaction = BankAccount.parse_transaction_code(self.factory.generate('D', '1'))
+        self.assertTrue(transaction.transaction_datetime > last)
+
+run_tests(TransactionCodeFactoryTestCase)
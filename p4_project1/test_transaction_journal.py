@@ -0,0 +1,130 @@
+import unittest
+import os
+import tempfile
+from decimal import Decimal
+from bank_account import BankAccount
+from bank_ledger import BankLedger
+from transaction_journal import TransactionJournal, JournalReader, JournalRecord
+
+def run_tests(test_case_class):
+    suite = unittest.TestLoader().loadTestsFromTestCase(test_case_class)
+    runner = unittest.TextTestRunner(verbosity=2)
+    runner.run(suite)
+
+
+class TransactionJournalTestCase(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'journal.bin')
+        self.monthly_interest_rate = BankAccount.get_monthly_interest_rate()
+        BankAccount.set_monthly_interest_rate('0.005')
+
+    def tearDown(self):
+        BankAccount.set_journal(None)
+        BankAccount.set_monthly_interest_rate(self.monthly_interest_rate)
+        self.directory.cleanup()
+
+    def test_append_and_read(self):
+        with TransactionJournal(self.path, fsync_every=2) as journal:
+            BankAccount.set_journal(journal)
+            ba = BankAccount('john', 'cleese')
+            transaction_codes = [ba.deposit('100.05'), ba.withdraw('0.05'), ba.withdraw('1000'), ba.pay_interest()]
+            BankAccount.set_journal(None)
+
+        with JournalReader(self.path) as reader:
+            self.assertEqual(len(reader), 4)
+            records = list(reader)
+            self.assertTrue(all(isinstance(record, JournalRecord) for record in records))
+            self.assertEqual([record.transaction_code for record in records], transaction_codes)
+            self.assertEqual([record.amount_cents for record in records], [10005, 5, 100000, 50])
+            self.assertEqual(reader[-1].type_code, 'I')
+            self.assertEqual(reader[0].account_id, ba.account_id)
+            transaction = BankAccount.parse_transaction_code(transaction_codes[0])
+            self.assertEqual(reader[0].transaction_datetime, transaction.transaction_datetime)
+            self.assertEqual(reader[0].random_code, transaction.random_code)
+            self.assertEqual(list(reader.iter_transactions())[1], (transaction_codes[1], 5))
+            self.assertRaises(IndexError, reader.__getitem__, 4)
+
+            # replay reconstructs the balance, the declined withdrawal has no effect
+            self.assertEqual(reader.replay(), {int(ba.account_id): 10050})
+            self.assertEqual(Decimal(ba.balance), Decimal(10050) / 100)
+
+    def test_reopen_and_truncated_tail(self):
+        ba = BankAccount('eric', 'idle')
+        with TransactionJournal(self.path) as journal:
+            journal.append(ba.deposit('1'), 100)
+        with TransactionJournal(self.path) as journal:
+            journal.append(ba.deposit('2'), 200)
+        # simulate a crash in the middle of writing a record
+        with open(self.path, 'ab') as f:
+            f.write(b'D\x00\x00')
+
+        with JournalReader(self.path) as reader:
+            self.assertEqual(len(reader), 2)
+            self.assertEqual(reader.replay(), {int(ba.account_id): 300})
+
+        # reopening cuts the partial record off, so the next records are read back aligned
+        with TransactionJournal(self.path) as journal:
+            journal.append(ba.withdraw('0.5'), 50)
+        self.assertEqual(os.path.getsize(self.path), 16 + 3 * 32) # 16-byte header, 32-byte records
+        with JournalReader(self.path) as reader:
+            self.assertEqual(len(reader), 3)
+            self.assertEqual([record.type_code for record in reader], ['D', 'D', 'W'])
+            self.assertEqual(reader.replay(), {int(ba.account_id): 250})
+
+    def test_invalid_journal(self):
+        with open(self.path, 'wb') as f:
+            f.write(b'not a journal....')
+        self.assertRaises(ValueError, JournalReader, self.path)
+        self.assertRaises(ValueError, TransactionJournal, self.path)
+
+    def test_interest_replay(self):
+        # interest is journaled with its sub-cent digits, a rounded amount per posting would drift from the balance
+        BankAccount.set_monthly_interest_rate('0.01')
+        with TransactionJournal(self.path) as journal:
+            BankAccount.set_journal(journal)
+            ba = BankAccount('graham', 'chapman')
+            ba.deposit('1.01')
+            for _ in range(12):
+                ba.pay_interest()
+            BankAccount.set_journal(None)
+
+        with JournalReader(self.path) as reader:
+            self.assertEqual(reader.replay(), {int(ba.account_id): int(Decimal(ba.balance) * 100)})
+            self.assertEqual(sum(record.amount_cents for record in reader), 101 + 12)
+            self.assertEqual(reader[1].amount_units, 1010000) # 1.01 cents
+
+    def test_ledger_replay(self):
+        with TransactionJournal(self.path) as journal:
+            BankAccount.set_journal(journal)
+            ledger = BankLedger()
+            accounts = [ledger.open_account('terry', 'jones'), ledger.open_account('michael', 'palin')]
+            ledger.deposit(['100', '33.33'])
+            ledger.withdraw(['50', '40'])
+            ledger.pay_interest()
+            accounts[1].withdraw('0.01')
+            BankAccount.set_journal(None)
+
+        with JournalReader(self.path) as reader:
+            self.assertEqual(len(reader), 7)
+            balances = reader.replay()
+        self.assertEqual({account_id: f'{Decimal(cents) / 100:.2f}' for account_id, cents in balances.items()},
+                         {int(account.account_id): account.balance for account in accounts})
+
+    def test_ledger_interest_replay(self):
+        BankAccount.set_monthly_interest_rate('0.01')
+        with TransactionJournal(self.path) as journal:
+            BankAccount.set_journal(journal)
+            ledger = BankLedger()
+            accounts = [ledger.open_account('terry', 'gilliam'), ledger.open_account('carol', 'cleveland')]
+            ledger.deposit(['1.01', '0.49'])
+            for _ in range(12):
+                ledger.pay_interest()
+            BankAccount.set_journal(None)
+
+        with JournalReader(self.path) as reader:
+            balances = reader.replay()
+        self.assertEqual({account_id: f'{Decimal(cents) / 100:.2f}' for account_id, cents in balances.items()},
+                         {int(account.account_id): account.balance for account in accounts})
+
+run_tests(TransactionJournalTestCase)
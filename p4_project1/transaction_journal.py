@@ -0,0 +1,218 @@
+from datetime import datetime, timezone, timedelta
+from decimal import Decimal
+import mmap
+import os
+import struct
+import threading
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+# file header: magic, version, record size
+_HEADER = struct.Struct('<8sII')
+_MAGIC = b'BKJRNL01'
+_VERSION = 2 # version 1 stored whole cents, which cannot replay sub-cent interest
+# fixed-width record: type code, random code, account id, microseconds since epoch (utc), amount in units
+_RECORD = struct.Struct('<c3xIQqq')
+# amounts are recorded in millionths of a cent (the unit of bank_ledger balances), so interest postings replay to
+# the balance instead of accumulating a rounding error of up to half a cent per posting
+UNITS_PER_CENT = 10 ** 6
+# effect of each type code on the balance when replaying: deposits and interest add, withdrawals subtract
+_SIGNS = {b'D': 1, b'W': -1, b'I': 1, b'X': 0}
+
+
+def cents_to_units(amount_cents):
+    # int cents, or a Decimal with fractional cents (interest) rounded half-even, -> int units
+    if isinstance(amount_cents, int):
+        return amount_cents * UNITS_PER_CENT
+    return int(Decimal(amount_cents).scaleb(6).to_integral_value())
+
+def units_to_cents(amount_units):
+    # rounded half-even, like the stringified balance
+    cents, remainder = divmod(amount_units, UNITS_PER_CENT)
+    if remainder * 2 > UNITS_PER_CENT or (remainder * 2 == UNITS_PER_CENT and cents & 1):
+        cents += 1
+    return cents
+
+def encode_transaction(transaction_code, amount_units):
+    type_code, account_id, datetime_code, random_code = transaction_code.split('-')
+    transaction_datetime = datetime.fromisoformat(f'{datetime_code[:8]}T{datetime_code[8:14]}.{datetime_code[14:]}+00:00')
+    timestamp = (transaction_datetime - _EPOCH) // _MICROSECOND
+    return _RECORD.pack(type_code.encode(), int(random_code), int(account_id), timestamp, amount_units)
+
+
+class TransactionJournal:
+    # append-only writer, records are buffered and written + fsynced once every fsync_every records
+    def __init__(self, path, fsync_every=1024):
+        self._lock = threading.Lock()
+        self._fsync_every = fsync_every
+        self._buffer = bytearray()
+        self._pending = 0
+        self._file = open(path, 'ab')
+        try:
+            size = self._file.tell()
+            if size == 0:
+                self._file.write(_HEADER.pack(_MAGIC, _VERSION, _RECORD.size))
+                self._sync()
+            else:
+                with open(path, 'rb') as f:
+                    check_header(f.read(_HEADER.size))
+                # a crash while writing can leave a partial record at the end, cut it off so that the records
+                # appended from now on stay aligned
+                end = size - (size - _HEADER.size) % _RECORD.size
+                if end != size:
+                    self._file.truncate(end)
+                    self._sync()
+        except Exception:
+            self._file.close()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _sync(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def append(self, transaction_code, amount_cents):
+        record = encode_transaction(transaction_code, cents_to_units(amount_cents))
+        with self._lock:
+            self._buffer += record
+            self._pending += 1
+            if self._pending >= self._fsync_every:
+                self._flush()
+
+    def append_many(self, transaction_codes, amounts_cents):
+        self.append_many_units(transaction_codes, map(cents_to_units, amounts_cents))
+
+    def append_many_units(self, transaction_codes, amounts_units):
+        records = b''.join(map(encode_transaction, transaction_codes, amounts_units))
+        with self._lock:
+            self._buffer += records
+            self._pending += len(transaction_codes)
+            if self._pending >= self._fsync_every:
+                self._flush()
+
+    def _flush(self):
+        if self._buffer:
+            self._file.write(self._buffer)
+            self._buffer.clear()
+            self._pending = 0
+            self._sync()
+
+    def flush(self):
+        with self._lock:
+            self._flush()
+
+    def close(self):
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+
+def check_header(header):
+    if len(header) < _HEADER.size:
+        raise ValueError('Internal error: not a transaction journal')
+    magic, version, record_size = _HEADER.unpack_from(header)
+    if magic != _MAGIC or version != _VERSION or record_size != _RECORD.size:
+        raise ValueError('Internal error: not a transaction journal, or an unsupported version')
+
+
+class JournalRecord:
+    # zero-copy view of one record in the mapped journal, fields are unpacked on access
+    __slots__ = '_buffer', '_offset'
+
+    def __init__(self, buffer, offset):
+        self._buffer = buffer
+        self._offset = offset
+
+    def _unpack(self):
+        return _RECORD.unpack_from(self._buffer, self._offset)
+
+    @property
+    def type_code(self):
+        return self._unpack()[0].decode()
+
+    @property
+    def random_code(self):
+        return f'{self._unpack()[1]:06}'
+
+    @property
+    def account_id(self):
+        return f'{self._unpack()[2]:018}'
+
+    @property
+    def transaction_datetime(self):
+        return _EPOCH + self._unpack()[3] * _MICROSECOND
+
+    @property
+    def amount_units(self):
+        return self._unpack()[4]
+
+    @property
+    def amount_cents(self):
+        return units_to_cents(self._unpack()[4])
+
+    @property
+    def transaction_code(self):
+        type_code, random_code, account_id, timestamp, _ = self._unpack()
+        datetime_code = (_EPOCH + timestamp * _MICROSECOND).strftime('%Y%m%d%H%M%S%f')
+        return f'{type_code.decode()}-{account_id:018}-{datetime_code}-{random_code:06}'
+
+    def __repr__(self):
+        return f'JournalRecord(transaction_code={self.transaction_code!r}, amount_cents={self.amount_cents})'
+
+
+class JournalReader:
+    # read-only mmap of a journal, a partially written record at the end (crash during write) is ignored
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        check_header(self._mmap)
+        self._length = (len(self._mmap) - _HEADER.size) // _RECORD.size
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        self._mmap.close()
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError('journal index out of range')
+        return JournalRecord(self._mmap, _HEADER.size + index * _RECORD.size)
+
+    def __iter__(self):
+        for offset in range(_HEADER.size, _HEADER.size + self._length * _RECORD.size, _RECORD.size):
+            yield JournalRecord(self._mmap, offset)
+
+    def iter_tuples(self):
+        # raw (type_code, random_code, account_id, timestamp, amount_units) tuples, the fastest way through the file
+        with memoryview(self._mmap) as view:
+            yield from _RECORD.iter_unpack(view[_HEADER.size:_HEADER.size + self._length * _RECORD.size])
+
+    def iter_transactions(self):
+        # (transaction_code, amount_cents) pairs, in journal order
+        for record in self:
+            yield record.transaction_code, record.amount_cents
+
+    def replay(self):
+        # rebuild every account's balance in cents: account id (int) -> balance, summed in units and rounded once,
+        # exact for bank_ledger accounts; a BankAccount keeps every Decimal digit, its interest postings are
+        # recorded to a millionth of a cent
+        balances = {}
+        signs = _SIGNS
+        for type_code, _, account_id, _, amount_units in self.iter_tuples():
+            balances[account_id] = balances.get(account_id, 0) + signs[type_code] * amount_units
+        return {account_id: units_to_cents(units) for account_id, units in balances.items()}
@@ -0,0 +1,81 @@
+"""
+Mod benchmark: ns/op of every operator and in-place operator of mod.Mod,
+mod_v2.Mod and mod_v3.Mod, with int and Mod operands, for a small and a big
+modulus
+
+mod_v3.Mod is immutable, its in-place operators rebind the name to a new (or
+cached) instance; mod.Mod has no division
+"""
+
+from timeit import Timer
+import argparse
+import json
+import mod
+import mod_v2
+import mod_v3
+
+IMPLEMENTATIONS = {'mod': mod.Mod, 'mod_v2': mod_v2.Mod, 'mod_v3': mod_v3.Mod}
+MODULI = {'small': 97, 'big': 2 ** 127 - 1}
+
+# name -> statement, with a and b Mod instances and i an int
+OPERATIONS = {
+    'Mod(value, modulus)': 'Mod(i, m)',
+    'Mod(residue, modulus)': 'Mod(5, m)',
+    '-a': '-a',
+    'a + b': 'a + b',
+    'a + i': 'a + i',
+    'a - b': 'a - b',
+    'a * b': 'a * b',
+    'a * i': 'a * i',
+    'a / b': 'a / b',
+    'a ** b': 'a ** b',
+    'a ** e': 'a ** e',
+    'a == b': 'a == b',
+    'a < b': 'a < b',
+    'hash(a)': 'hash(a)',
+    'c += b': 'c += b',
+    'c -= i': 'c -= i',
+    'c *= b': 'c *= b',
+    'c /= b': 'c /= b',
+    'c **= e': 'c **= e',
+}
+
+def measure(Mod, modulus, statement, repeat=5):
+    # best of repeat runs, the setup is rerun before each so in-place operators always start from the same value
+    setup = 'a = Mod(12345, m); b = Mod(67890, m); c = Mod(13579, m); i = 24680; e = 65537'
+    timer = Timer(statement, setup, globals={'Mod': Mod, 'm': modulus})
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat, number)) / number * 1e9
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('-i', '--implementations',
+                        nargs='+', choices=list(IMPLEMENTATIONS), default=list(IMPLEMENTATIONS),
+                        help='Implementations to benchmark.')
+    parser.add_argument('-r', '--repeat',
+                        type=int, default=5,
+                        help='Timing runs per operation, the best one is reported.')
+    parser.add_argument('-o', '--output',
+                        help='Write the results (ns/op) to this JSON file.')
+    args = parser.parse_args()
+
+    results = {}
+    for modulus_name, modulus in MODULI.items():
+        print(f'\n{modulus_name} modulus ({modulus}), ns/op')
+        print(f'{"operation":<22}' + ''.join(f'{name:>12}' for name in args.implementations))
+        for operation, statement in OPERATIONS.items():
+            row = []
+            for name in args.implementations:
+                Mod = IMPLEMENTATIONS[name]
+                try:
+                    ns = measure(Mod, modulus, statement, args.repeat)
+                except TypeError: # operator not implemented by this version
+                    ns = None
+                results.setdefault(name, {}).setdefault(modulus_name, {})[operation] = ns
+                row.append(f'{ns:>12.0f}' if ns is not None else f'{"-":>12}')
+            print(f'{operation:<22}' + ''.join(row), flush=True)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
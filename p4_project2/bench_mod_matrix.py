@@ -0,0 +1,90 @@
+"""
+ModMatrix benchmark: matrix product, power and determinant against the same
+algorithms written with nested lists of mod_v2.Mod
+"""
+
+from time import perf_counter
+import argparse
+import random
+from mod_v2 import Mod
+from mod_matrix import ModMatrix
+
+def naive_product(a, b):
+    n, k, p = len(a), len(b), len(b[0])
+    result = []
+    for i in range(n):
+        row = []
+        for j in range(p):
+            total = Mod(0, a[0][0].modulus)
+            for x in range(k):
+                total += a[i][x] * b[x][j]
+            row.append(total)
+        result.append(row)
+    return result
+
+def naive_power(a, exponent):
+    n = len(a)
+    modulus = a[0][0].modulus
+    result = [[Mod(int(i == j), modulus) for j in range(n)] for i in range(n)]
+    while exponent:
+        if exponent & 1:
+            result = naive_product(result, a)
+        exponent >>= 1
+        if exponent:
+            a = naive_product(a, a)
+    return result
+
+def naive_det(a):
+    # Gaussian elimination with Mod objects, prime modulus
+    a = [row[:] for row in a]
+    n = len(a)
+    det = Mod(1, a[0][0].modulus)
+    for c in range(n):
+        pivot = next((i for i in range(c, n) if a[i][c] != 0), None)
+        if pivot is None:
+            return Mod(0, det.modulus)
+        if pivot != c:
+            a[c], a[pivot] = a[pivot], a[c]
+            det = -det
+        det = det * a[c][c]
+        inverse = a[c][c] ** -1
+        for i in range(c + 1, n):
+            factor = a[i][c] * inverse
+            a[i] = [x - factor * y for x, y in zip(a[i], a[c])]
+    return det
+
+def timed(function, *args):
+    start = perf_counter()
+    result = function(*args)
+    return perf_counter() - start, result
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('-n', '--sizes',
+                        type=int, nargs='+', default=[8, 32, 64],
+                        help='Matrix sizes (n x n).')
+    parser.add_argument('-e', '--exponent',
+                        type=int, default=10**9,
+                        help='Exponent of the matrix power.')
+    parser.add_argument('-m', '--modulus',
+                        type=int, default=10**9 + 7,
+                        help='Modulus, prime so that every benchmark applies.')
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    for n in args.sizes:
+        rows = [[rng.randrange(args.modulus) for _ in range(n)] for _ in range(n)]
+        matrix = ModMatrix(rows, args.modulus)
+        nested = [[Mod(value, args.modulus) for value in row] for row in rows]
+        for name, fast, naive in (('product', lambda: matrix @ matrix, lambda: naive_product(nested, nested)),
+                                  ('power', lambda: matrix ** args.exponent, lambda: naive_power(nested, args.exponent)),
+                                  ('det', matrix.det, lambda: naive_det(nested))):
+            fast_time, fast_result = timed(fast)
+            naive_time, naive_result = timed(naive)
+            if name == 'det':
+                assert fast_result == naive_result
+            else:
+                assert fast_result.tolist() == [[mod.value for mod in row] for row in naive_result]
+            print(f'n={n:<4} {name:<8} ModMatrix {fast_time * 1e3:>10.2f} ms   nested Mod lists {naive_time * 1e3:>10.2f} ms'
+                  f'   x{naive_time / fast_time:.1f}')
@@ -36,7 +36,7 @@ class Mod:
             if self._modulus == other._modulus:
                 return self._value < other._value
             else:
-                return ValueError('comparison unsupported between Mod instances with different moduli')
+                raise ValueError('comparison unsupported between Mod instances with different moduli')
         return NotImplemented
 
     def __eq__(self, other):
@@ -90,11 +90,13 @@ class Mod:
         raise TypeError(f'unsupported operand type(s) for +: \'Mod\' and {type(other).__name__!r}')
 
     def __pow__(self, other):
+        # three-argument pow reduces after every step instead of building value ** exponent,
+        # and a negative exponent raises the modular inverse (ValueError if there is none)
         if isinstance(other, int):
-            return Mod(self._value ** other, self._modulus)
+            return Mod(pow(self._value, other, self._modulus), self._modulus)
         if isinstance(other, Mod):
             if self._modulus == other._modulus:
-                return Mod(self._value ** other._value, self._modulus)
+                return Mod(pow(self._value, other._value, self._modulus), self._modulus)
             else:
                 raise ValueError('operands should have same modulus')
         raise TypeError(f'unsupported operand type(s) for +: \'Mod\' and {type(other).__name__!r}')
@@ -138,11 +140,11 @@ class Mod:
 
     def __ipow__(self, other):
         if isinstance(other, int):
-            self._set_value(self._value ** other)
+            self._set_value(pow(self._value, other, self._modulus))
             return self
         if isinstance(other, Mod):
             if self._modulus == other._modulus:
-                self._set_value(self._value ** other._value)
+                self._set_value(pow(self._value, other._value, self._modulus))
                 return self
             else:
                 raise ValueError('operands should have same modulus')
@@ -0,0 +1,279 @@
+from array import array
+from itertools import repeat
+import math
+import operator
+from mod_v2 import Mod, batch_inverse_values
+
+try:
+    import numpy as np
+except ImportError: # numpy is optional, the array('q') backend works everywhere
+    np = None
+
+# residues are stored as signed 64-bit integers, so the largest residue of a modulus of 2**63 still fits
+MAX_MODULUS = 2 ** 63
+# the numpy backend multiplies int64 residues directly, which is exact only while (modulus - 1) ** 2 fits in int64;
+# larger moduli use the array backend, whose products are Python ints and so never overflow
+NUMPY_MAX_MODULUS = math.isqrt(2 ** 63 - 1) + 1
+
+
+class BoolList(list):
+    # result of a comparison on the array backend: a list of bool that, like the numpy bool array of the numpy
+    # backend, has no truth value when it has more than one element, so `if a == b:` cannot silently test for emptiness
+    def __bool__(self):
+        if len(self) != 1:
+            raise ValueError('the truth value of a ModArray comparison is ambiguous, use all() or any()')
+        return self[0]
+
+    def all(self):
+        return all(self)
+
+    def any(self):
+        return any(self)
+
+
+class ModArray:
+    # sequence of residues sharing one modulus, with element-wise + - * / ** and comparisons against another
+    # ModArray of the same modulus and length, an int or a Mod
+    # backend: 'numpy' (int64 ndarray), 'array' (array('q')), or None to use numpy whenever it is installed and exact
+    __hash__ = None # mutable, and == is element-wise
+
+    def __init__(self, values, modulus, backend=None):
+        if not isinstance(modulus, int):
+            raise TypeError('modulus should be of int type')
+        if modulus <= 0:
+            raise ValueError('modulus should be positive')
+        if modulus > MAX_MODULUS:
+            raise ValueError('modulus should be at most 2**63')
+        self._modulus = modulus
+        self._numpy = self._use_numpy(modulus, backend)
+
+        if self._numpy and isinstance(values, np.ndarray) and values.dtype.kind == 'i':
+            self._values = values.astype(np.int64) % modulus
+            return
+        if isinstance(values, array) or (np is not None and isinstance(values, np.ndarray)):
+            values = values.tolist()
+        else:
+            values = list(values)
+        if not all(isinstance(value, int) for value in values):
+            raise TypeError('values should be of int type')
+        self._values = self._to_backend([value % modulus for value in values])
+
+    @staticmethod
+    def _use_numpy(modulus, backend):
+        if backend is None:
+            return np is not None and modulus <= NUMPY_MAX_MODULUS
+        if backend == 'array':
+            return False
+        if backend == 'numpy':
+            if np is None:
+                raise ValueError('the numpy backend requires numpy')
+            if modulus > NUMPY_MAX_MODULUS:
+                raise ValueError(f'the numpy backend supports moduli up to {NUMPY_MAX_MODULUS}')
+            return True
+        raise ValueError(f'unknown backend {backend!r}')
+
+    def _to_backend(self, values):
+        # list of residues (or the storage of the other backend) -> storage of this array's backend
+        if self._numpy:
+            return np.array(values, dtype=np.int64)
+        if isinstance(values, array):
+            return values
+        return array('q', values)
+
+    def _new(self, values):
+        # wrap already reduced residues in this array's backend format, no validation
+        result = ModArray.__new__(ModArray)
+        result._modulus = self._modulus
+        result._numpy = self._numpy
+        result._values = values
+        return result
+
+    @property
+    def modulus(self):
+        return self._modulus
+
+    @property
+    def backend(self):
+        return 'numpy' if self._numpy else 'array'
+
+    def tolist(self):
+        return self._values.tolist()
+
+    def __len__(self):
+        return len(self._values)
+
+    def __iter__(self):
+        return (Mod(value, self._modulus) for value in self._values.tolist())
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            values = self._values[index]
+            return self._new(values.copy() if self._numpy else values)
+        return Mod(int(self._values[index]), self._modulus)
+
+    def __setitem__(self, index, value):
+        self._values[index] = self._get_value(value)
+
+    def __repr__(self):
+        return f'ModArray(values={self.tolist()}, modulus={self._modulus})'
+
+    def _get_value(self, other):
+        # scalar operand -> residue
+        if isinstance(other, int):
+            return other % self._modulus
+        if isinstance(other, Mod):
+            if self._modulus == other.modulus:
+                return other.value
+            raise ValueError('operation unsupported between instances with different moduli')
+        raise TypeError(f'unsupported operand type(s) for ModArray: {type(other).__name__!r}')
+
+    def _get_values(self, other):
+        # element-wise operand -> residues in this array's backend format, or a single residue for scalars
+        if not isinstance(other, ModArray):
+            return self._get_value(other)
+        if self._modulus != other._modulus:
+            raise ValueError('operation unsupported between instances with different moduli')
+        if len(self) != len(other):
+            raise ValueError('operation unsupported between ModArray instances of different lengths')
+        if self._numpy == other._numpy:
+            return other._values
+        return self._to_backend(other._values.tolist())
+
+    def _pairs(self, operation, other_values):
+        if isinstance(other_values, int):
+            return map(operation, self._values, repeat(other_values))
+        return map(operation, self._values, other_values)
+
+    # arithmetic: the numpy backend works on whole arrays, the array backend on Python ints, both sides are residues
+    # in [0, modulus) so a sum or difference is reduced with a single compare instead of a division
+
+    def _add(self, other_values):
+        m = self._modulus
+        if self._numpy:
+            return (self._values + other_values) % m
+        return array('q', [s - m if s >= m else s for s in self._pairs(operator.add, other_values)])
+
+    def _sub(self, other_values):
+        m = self._modulus
+        if self._numpy:
+            return (self._values - other_values) % m
+        return array('q', [d + m if d < 0 else d for d in self._pairs(operator.sub, other_values)])
+
+    def _rsub(self, other_value):
+        m = self._modulus
+        if self._numpy:
+            return (other_value - self._values) % m
+        return array('q', [d + m if d < 0 else d for d in map(operator.sub, repeat(other_value), self._values)])
+
+    def _mul(self, other_values):
+        m = self._modulus
+        if self._numpy:
+            return (self._values * other_values) % m
+        return array('q', [p % m for p in self._pairs(operator.mul, other_values)])
+
+    def _div(self, other_values):
+        # one modular inversion for the whole divisor array (Montgomery's trick), ValueError if any has no inverse
+        if isinstance(other_values, int):
+            return self._mul(batch_inverse_values([other_values], self._modulus)[0])
+        return self._mul(self._to_backend(batch_inverse_values(other_values.tolist(), self._modulus)))
+
+    def _pow(self, other):
+        # int exponents are used as they are (not reduced modulo the modulus), negative ones need invertible residues;
+        # Mod and ModArray exponents use their residues, like Mod ** Mod
+        m = self._modulus
+        exponents = other if isinstance(other, int) else self._get_values(other)
+        if isinstance(exponents, int):
+            if not self._numpy or not 0 <= exponents < MAX_MODULUS:
+                return self._to_backend([pow(value, exponents, m) for value in self._values.tolist()])
+            return self._numpy_pow(exponents)
+        if self._numpy:
+            return self._numpy_pow(exponents)
+        return array('q', [pow(value, exponent, m) for value, exponent in zip(self._values, exponents)])
+
+    def _numpy_pow(self, exponents):
+        # square and multiply on whole arrays, exponents is a non-negative int or an int64 array of them
+        m = self._modulus
+        result = np.full(len(self._values), 1 % m, dtype=np.int64)
+        base = self._values.copy()
+        exponents = np.asarray(exponents, dtype=np.int64)
+        for bit in range(int(exponents.max(initial=0)).bit_length()):
+            mask = (exponents >> bit) & 1
+            result = np.where(mask == 1, result * base % m, result)
+            base = base * base % m
+        return result
+
+    def _in_place(self, values):
+        self._values = values
+        return self
+
+    def inverse(self):
+        return self._new(self._to_backend(batch_inverse_values(self._values.tolist(), self._modulus)))
+
+    def __neg__(self):
+        return self._new(self._rsub(0))
+
+    def __add__(self, other):
+        return self._new(self._add(self._get_values(other)))
+
+    def __radd__(self, other):
+        return self._new(self._add(self._get_value(other)))
+
+    def __sub__(self, other):
+        return self._new(self._sub(self._get_values(other)))
+
+    def __rsub__(self, other):
+        return self._new(self._rsub(self._get_value(other)))
+
+    def __mul__(self, other):
+        return self._new(self._mul(self._get_values(other)))
+
+    def __rmul__(self, other):
+        return self._new(self._mul(self._get_value(other)))
+
+    def __truediv__(self, other):
+        return self._new(self._div(self._get_values(other)))
+
+    def __pow__(self, other):
+        return self._new(self._pow(other))
+
+    def __iadd__(self, other):
+        return self._in_place(self._add(self._get_values(other)))
+
+    def __isub__(self, other):
+        return self._in_place(self._sub(self._get_values(other)))
+
+    def __imul__(self, other):
+        return self._in_place(self._mul(self._get_values(other)))
+
+    def __itruediv__(self, other):
+        return self._in_place(self._div(self._get_values(other)))
+
+    def __ipow__(self, other):
+        return self._in_place(self._pow(other))
+
+    # comparisons are element-wise on the residues: a numpy bool array on the numpy backend, a BoolList otherwise;
+    # both have all() and any() and raise ValueError when used as a single bool
+
+    def _compare(self, other, operation):
+        other_values = self._get_values(other)
+        if self._numpy:
+            return operation(self._values, other_values)
+        return BoolList(self._pairs(operation, other_values))
+
+    def __eq__(self, other):
+        return self._compare(other, operator.eq)
+
+    def __ne__(self, other):
+        return self._compare(other, operator.ne)
+
+    def __lt__(self, other):
+        return self._compare(other, operator.lt)
+
+    def __le__(self, other):
+        return self._compare(other, operator.le)
+
+    def __gt__(self, other):
+        return self._compare(other, operator.gt)
+
+    def __ge__(self, other):
+        return self._compare(other, operator.ge)
@@ -0,0 +1,243 @@
+from math import gcd
+from operator import mul
+from mod_v2 import Mod
+
+class ModMatrix:
+    # immutable matrix of residues modulo one shared modulus, stored row-major in one flat list of ints
+    # @ is the matrix product, * multiplies by a scalar (int or Mod), ** is the matrix power
+    # rank, solve and inverse eliminate with invertible pivots, which always exist for a prime modulus; for other
+    # moduli they raise ValueError when a column has non-zero entries but no invertible one, det works for any modulus
+    def __init__(self, rows, modulus):
+        if not isinstance(modulus, int):
+            raise TypeError('modulus should be of int type')
+        if modulus <= 0:
+            raise ValueError('modulus should be positive')
+        rows = [list(row) for row in rows]
+        if not rows or not rows[0] or any(len(row) != len(rows[0]) for row in rows):
+            raise ValueError('rows should be non-empty and of the same length')
+        values = []
+        for row in rows:
+            for value in row:
+                if isinstance(value, Mod):
+                    if value.modulus != modulus:
+                        raise ValueError('values should have the modulus of the matrix')
+                    values.append(value.value)
+                elif isinstance(value, int):
+                    values.append(value % modulus)
+                else:
+                    raise TypeError('values should be of int or Mod type')
+        self._modulus = modulus
+        self._shape = len(rows), len(rows[0])
+        self._values = values
+
+    @classmethod
+    def _make(cls, values, shape, modulus):
+        # values must already be reduced and row-major
+        matrix = cls.__new__(cls)
+        matrix._modulus = modulus
+        matrix._shape = shape
+        matrix._values = values
+        return matrix
+
+    @classmethod
+    def identity(cls, n, modulus):
+        values = [0] * (n * n)
+        values[::n + 1] = [1 % modulus] * n
+        return cls._make(values, (n, n), modulus)
+
+    @property
+    def modulus(self):
+        return self._modulus
+
+    @property
+    def shape(self):
+        return self._shape
+
+    def _rows(self):
+        n = self._shape[1]
+        return [self._values[i:i + n] for i in range(0, len(self._values), n)]
+
+    def tolist(self):
+        return self._rows()
+
+    def __getitem__(self, index):
+        i, j = index
+        rows, cols = self._shape
+        if not (0 <= i < rows and 0 <= j < cols):
+            raise IndexError('matrix index out of range')
+        return Mod(self._values[i * cols + j], self._modulus)
+
+    def __repr__(self):
+        return f'ModMatrix(rows={self._rows()}, modulus={self._modulus})'
+
+    def _get_value(self, other):
+        if isinstance(other, int):
+            return other % self._modulus
+        if isinstance(other, Mod):
+            if self._modulus != other.modulus:
+                raise ValueError('operation unsupported between instances with different moduli')
+            return other.value
+        raise TypeError(f'unsupported operand type(s) for ModMatrix: {type(other).__name__!r}')
+
+    def _get_matrix(self, other):
+        if not isinstance(other, ModMatrix):
+            raise TypeError(f'unsupported operand type(s) for ModMatrix: {type(other).__name__!r}')
+        if self._modulus != other._modulus:
+            raise ValueError('operation unsupported between ModMatrix instances with different moduli')
+        return other
+
+    def __eq__(self, other):
+        if not isinstance(other, ModMatrix):
+            return NotImplemented
+        return self._shape == other._shape and self._modulus == other._modulus and self._values == other._values
+
+    def __hash__(self):
+        return hash((self._shape, self._modulus, tuple(self._values)))
+
+    def _elementwise(self, other, sign):
+        other = self._get_matrix(other)
+        if self._shape != other._shape:
+            raise ValueError(f'shapes {self._shape} and {other._shape} do not match')
+        m = self._modulus
+        return self._make([(a + sign * b) % m for a, b in zip(self._values, other._values)], self._shape, m)
+
+    def __add__(self, other):
+        return self._elementwise(other, 1)
+
+    def __sub__(self, other):
+        return self._elementwise(other, -1)
+
+    def __neg__(self):
+        m = self._modulus
+        return self._make([-a % m for a in self._values], self._shape, m)
+
+    def __mul__(self, other):
+        m = self._modulus
+        scalar = self._get_value(other)
+        return self._make([a * scalar % m for a in self._values], self._shape, m)
+
+    __rmul__ = __mul__
+
+    @staticmethod
+    def _product(a_values, b_values, n, k, p, m):
+        # (n x k) @ (k x p), every entry is one sum(map(mul)) over a row and a column, reduced once
+        columns = [b_values[j::p] for j in range(p)]
+        result = []
+        for i in range(0, n * k, k):
+            row = a_values[i:i + k]
+            result.extend(sum(map(mul, row, column)) % m for column in columns)
+        return result
+
+    def __matmul__(self, other):
+        other = self._get_matrix(other)
+        (n, k), (k2, p) = self._shape, other._shape
+        if k != k2:
+            raise ValueError(f'shapes {self._shape} and {other._shape} do not align')
+        return self._make(self._product(self._values, other._values, n, k, p, self._modulus), (n, p), self._modulus)
+
+    def __pow__(self, exponent):
+        # square and multiply, negative exponents raise the inverse
+        if not isinstance(exponent, int):
+            raise TypeError('the exponent should be of int type')
+        n, cols = self._shape
+        if n != cols:
+            raise ValueError('only square matrices have powers')
+        base = self.inverse()._values if exponent < 0 else self._values
+        exponent = abs(exponent)
+        m = self._modulus
+        result = self.identity(n, m)._values
+        while exponent:
+            if exponent & 1:
+                result = self._product(result, base, n, n, n, m)
+            exponent >>= 1
+            if exponent:
+                base = self._product(base, base, n, n, n, m)
+        return self._make(result, self._shape, m)
+
+    def _reduce(self, rows, pivot_columns):
+        # Gauss-Jordan elimination in place to reduced row echelon form over the first pivot_columns columns,
+        # -> the list of pivot columns
+        m = self._modulus
+        pivots = []
+        r = 0
+        for c in range(pivot_columns):
+            if r == len(rows):
+                break
+            pivot = next((i for i in range(r, len(rows)) if rows[i][c] and gcd(rows[i][c], m) == 1), None)
+            if pivot is None:
+                if any(rows[i][c] for i in range(r, len(rows))):
+                    raise ValueError(f'column {c} has no invertible pivot modulo {m}')
+                continue
+            rows[r], rows[pivot] = rows[pivot], rows[r]
+            inverse = pow(rows[r][c], -1, m)
+            pivot_row = rows[r] = [v * inverse % m for v in rows[r]]
+            for i, row in enumerate(rows):
+                factor = row[c]
+                if i != r and factor:
+                    rows[i] = [(a - factor * b) % m for a, b in zip(row, pivot_row)]
+            pivots.append(c)
+            r += 1
+        return pivots
+
+    def rank(self):
+        return len(self._reduce(self._rows(), self._shape[1]))
+
+    def det(self):
+        # elimination below an invertible pivot when the column has one (always, for a prime modulus), Euclidean row
+        # reduction with integer quotients otherwise, so any modulus works
+        n, cols = self._shape
+        if n != cols:
+            raise ValueError('only square matrices have a determinant')
+        m = self._modulus
+        rows = self._rows()
+        det = 1
+        for c in range(n):
+            pivot = next((i for i in range(c, n) if rows[i][c] and gcd(rows[i][c], m) == 1), None)
+            if pivot is not None:
+                if pivot != c:
+                    rows[c], rows[pivot] = rows[pivot], rows[c]
+                    det = -det
+                pivot_row = rows[c]
+                inverse = pow(pivot_row[c], -1, m)
+                for i in range(c + 1, n):
+                    factor = rows[i][c] * inverse % m
+                    if factor:
+                        rows[i] = [(a - factor * b) % m for a, b in zip(rows[i], pivot_row)]
+            else:
+                for i in range(c + 1, n):
+                    while rows[i][c]:
+                        q = rows[c][c] // rows[i][c]
+                        rows[c] = [(a - q * b) % m for a, b in zip(rows[c], rows[i])]
+                        rows[c], rows[i] = rows[i], rows[c]
+                        det = -det
+                if not rows[c][c]:
+                    return Mod(0, m)
+            det = det * rows[c][c] % m
+        return Mod(det, m)
+
+    def inverse(self):
+        n, cols = self._shape
+        if n != cols:
+            raise ValueError('only square matrices have an inverse')
+        m = self._modulus
+        identity = self.identity(n, m)._rows()
+        rows = [row + identity_row for row, identity_row in zip(self._rows(), identity)]
+        if len(self._reduce(rows, n)) < n:
+            raise ValueError('the matrix is singular')
+        return self._make([v for row in rows for v in row[n:]], self._shape, m)
+
+    def solve(self, b):
+        # one solution x of self @ x == b (free variables set to 0), b is a sequence of ints or Mod instances,
+        # -> list of Mod, ValueError when there is no solution
+        n, cols = self._shape
+        b = [self._get_value(value) for value in b]
+        if len(b) != n:
+            raise ValueError(f'b should have {n} values')
+        rows = [row + [value] for row, value in zip(self._rows(), b)]
+        pivots = self._reduce(rows, cols)
+        if any(row[cols] for row in rows[len(pivots):]):
+            raise ValueError('the system has no solution')
+        x = [0] * cols
+        for row, c in zip(rows, pivots):
+            x[c] = row[cols]
+        return [Mod(value, self._modulus) for value in x]
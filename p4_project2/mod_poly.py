@@ -0,0 +1,324 @@
+from functools import lru_cache
+from mod_v2 import Mod
+from mod_array import ModArray
+
+# multiplication algorithms, picked by multiply() from the operand lengths:
+# - schoolbook while the shorter operand has at most SCHOOLBOOK_MAX_LENGTH coefficients
+# - Kronecker substitution otherwise: both polynomials are packed into one int each, with slots wide enough to hold
+#   any coefficient of the product, so a single int multiplication (Karatsuba/Toom-Cook, done in C) does the work
+# - number-theoretic transform for NTT-friendly primes (prime p with 2**k | p - 1) once the product has at least
+#   NTT_MIN_LENGTH coefficients: O(n log n) beats the big int multiplication only for very long polynomials,
+#   because the transform itself runs in Python
+SCHOOLBOOK_MAX_LENGTH = 16
+NTT_MIN_LENGTH = 1 << 17
+
+def _is_prime(n):
+    # Miller-Rabin with the first 12 prime bases: deterministic below 3.3e24, probabilistic above
+    if n < 2:
+        return False
+    bases = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37)
+    if n in bases:
+        return True
+    if any(n % p == 0 for p in bases):
+        return False
+    d, s = n - 1, 0
+    while d % 2 == 0:
+        d, s = d // 2, s + 1
+    for a in bases:
+        x = pow(a, d, n)
+        if x in (1, n - 1):
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+def _prime_factors(n):
+    factors = set()
+    p = 2
+    while p * p <= n:
+        while n % p == 0:
+            factors.add(p)
+            n //= p
+        p += 1
+    if n > 1:
+        factors.add(n)
+    return factors
+
+@lru_cache(maxsize=None)
+def ntt_root(modulus):
+    # (k, w) with w a primitive 2**k-th root of unity for an NTT-friendly prime modulus, None for other moduli
+    # the odd part of modulus - 1 is factored by trial division, so it has to be small (at most 2**32)
+    if modulus < 3 or not _is_prime(modulus):
+        return None
+    k = ((modulus - 1) & -(modulus - 1)).bit_length() - 1
+    odd = (modulus - 1) >> k
+    if k < 2 or odd > 1 << 32:
+        return None
+    factors = _prime_factors(odd) | {2}
+    generator = next(g for g in range(2, modulus)
+                     if all(pow(g, (modulus - 1) // q, modulus) != 1 for q in factors))
+    return k, pow(generator, odd, modulus)
+
+def _schoolbook(a, b, modulus):
+    product = [0] * (len(a) + len(b) - 1)
+    for i, x in enumerate(a):
+        if x:
+            for j, y in enumerate(b, i):
+                product[j] += x * y
+    return [c % modulus for c in product]
+
+def _kronecker(a, b, modulus):
+    # a slot holds a sum of min(len(a), len(b)) products of two residues without carrying into the next slot
+    width = (2 * (modulus - 1).bit_length() + min(len(a), len(b)).bit_length() + 7) // 8
+    def pack(coefficients):
+        return int.from_bytes(b''.join(c.to_bytes(width, 'little') for c in coefficients), 'little')
+    x = pack(a)
+    product = (x * x if a is b else x * pack(b)).to_bytes(width * (len(a) + len(b)), 'little')
+    return [int.from_bytes(product[i:i + width], 'little') % modulus
+            for i in range(0, width * (len(a) + len(b) - 1), width)]
+
+def _ntt(values, root, modulus):
+    # in-place iterative radix-2 transform, len(values) is a power of 2 and root a primitive len(values)-th root of unity
+    n = len(values)
+    j = 0
+    for i in range(1, n):
+        bit = n >> 1
+        while j & bit:
+            j ^= bit
+            bit >>= 1
+        j ^= bit
+        if i < j:
+            values[i], values[j] = values[j], values[i]
+    length = 2
+    while length <= n:
+        half = length // 2
+        w = pow(root, n // length, modulus)
+        twiddles = [1] * half
+        for k in range(1, half):
+            twiddles[k] = twiddles[k - 1] * w % modulus
+        for start in range(0, n, length):
+            for k in range(half):
+                u = values[start + k]
+                v = values[start + k + half] * twiddles[k] % modulus
+                values[start + k] = (u + v) % modulus
+                values[start + k + half] = (u - v) % modulus
+        length <<= 1
+
+def _ntt_multiply(a, b, modulus, k, root):
+    length = len(a) + len(b) - 1
+    n = 1 << (length - 1).bit_length()
+    root = pow(root, (1 << k) // n, modulus) # primitive n-th root of unity
+    fa = a + [0] * (n - len(a))
+    _ntt(fa, root, modulus)
+    if a is b:
+        fb = fa
+    else:
+        fb = b + [0] * (n - len(b))
+        _ntt(fb, root, modulus)
+    product = [x * y % modulus for x, y in zip(fa, fb)]
+    _ntt(product, pow(root, -1, modulus), modulus)
+    n_inverse = pow(n, -1, modulus)
+    return [c * n_inverse % modulus for c in product[:length]]
+
+def multiply(a, b, modulus, algorithm=None):
+    # product of two coefficient lists (residues, lowest degree first), algorithm: 'schoolbook', 'kronecker', 'ntt'
+    # or None to pick one from the lengths and the modulus
+    if not a or not b:
+        return []
+    length = len(a) + len(b) - 1
+    if algorithm is None:
+        if min(len(a), len(b)) <= SCHOOLBOOK_MAX_LENGTH:
+            algorithm = 'schoolbook'
+        elif length >= NTT_MIN_LENGTH and ntt_root(modulus) and length <= 1 << ntt_root(modulus)[0]:
+            algorithm = 'ntt'
+        else:
+            algorithm = 'kronecker'
+    if algorithm == 'schoolbook':
+        return _schoolbook(a, b, modulus)
+    if algorithm == 'kronecker':
+        return _kronecker(a, b, modulus)
+    if algorithm == 'ntt':
+        root = ntt_root(modulus)
+        if root is None or length > 1 << root[0]:
+            raise ValueError(f'modulus {modulus} does not support an NTT of length {length}')
+        return _ntt_multiply(a, b, modulus, *root)
+    raise ValueError(f'unknown multiplication algorithm {algorithm!r}')
+
+
+class ModPoly:
+    # immutable polynomial with coefficients modulo one modulus, coefficients are given lowest degree first
+    # operands of + - * divmod can be ModPoly instances with the same modulus, ints or Mod instances (constants)
+    def __init__(self, coefficients, modulus):
+        if not isinstance(modulus, int):
+            raise TypeError('modulus should be of int type')
+        if modulus <= 0:
+            raise ValueError('modulus should be positive')
+        values = []
+        for coefficient in coefficients:
+            if isinstance(coefficient, Mod):
+                if coefficient.modulus != modulus:
+                    raise ValueError('coefficients should have the modulus of the polynomial')
+                values.append(coefficient.value)
+            elif isinstance(coefficient, int):
+                values.append(coefficient % modulus)
+            else:
+                raise TypeError('coefficients should be of int or Mod type')
+        self._modulus = modulus
+        self._coefficients = self._strip(values)
+
+    @staticmethod
+    def _strip(values):
+        while values and not values[-1]:
+            values.pop()
+        return values
+
+    @classmethod
+    def _make(cls, values, modulus):
+        # values must already be reduced, trailing zeros are stripped here
+        poly = cls.__new__(cls)
+        poly._modulus = modulus
+        poly._coefficients = cls._strip(values)
+        return poly
+
+    @property
+    def modulus(self):
+        return self._modulus
+
+    @property
+    def coefficients(self):
+        return list(self._coefficients)
+
+    @property
+    def degree(self):
+        # -1 for the zero polynomial
+        return len(self._coefficients) - 1
+
+    def __getitem__(self, power):
+        # coefficient of x ** power
+        if power < 0:
+            raise IndexError('powers should be non-negative')
+        return Mod(self._coefficients[power] if power < len(self._coefficients) else 0, self._modulus)
+
+    def __repr__(self):
+        return f'ModPoly(coefficients={self._coefficients}, modulus={self._modulus})'
+
+    def _get_value(self, other):
+        # int or Mod -> residue
+        if isinstance(other, int):
+            return other % self._modulus
+        if isinstance(other, Mod):
+            if self._modulus != other.modulus:
+                raise ValueError('operation unsupported between instances with different moduli')
+            return other.value
+        raise TypeError(f'unsupported operand type(s) for ModPoly: {type(other).__name__!r}')
+
+    def _get_coefficients(self, other):
+        if isinstance(other, ModPoly):
+            if self._modulus != other._modulus:
+                raise ValueError('operation unsupported between ModPoly instances with different moduli')
+            return other._coefficients
+        return self._strip([self._get_value(other)])
+
+    def __eq__(self, other):
+        return self._coefficients == self._get_coefficients(other)
+
+    def __hash__(self):
+        return hash((tuple(self._coefficients), self._modulus))
+
+    def __neg__(self):
+        m = self._modulus
+        return self._make([-c % m for c in self._coefficients], m)
+
+    def _add(self, a, b, sign):
+        m = self._modulus
+        if len(a) < len(b):
+            a = a + [0] * (len(b) - len(a))
+        else:
+            b = b + [0] * (len(a) - len(b))
+        return self._make([(x + sign * y) % m for x, y in zip(a, b)], m)
+
+    def __add__(self, other):
+        return self._add(self._coefficients, self._get_coefficients(other), 1)
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        return self._add(self._coefficients, self._get_coefficients(other), -1)
+
+    def __rsub__(self, other):
+        return self._add(self._get_coefficients(other), self._coefficients, -1)
+
+    def __mul__(self, other):
+        return self._make(multiply(self._coefficients, self._get_coefficients(other), self._modulus), self._modulus)
+
+    __rmul__ = __mul__
+
+    def __pow__(self, exponent):
+        if not isinstance(exponent, int):
+            raise TypeError('the exponent should be of int type')
+        if exponent < 0:
+            raise ValueError('the exponent should be non-negative')
+        m = self._modulus
+        result, base = self._strip([1 % m]), self._coefficients
+        while exponent:
+            if exponent & 1:
+                result = multiply(result, base, m)
+            exponent >>= 1
+            if exponent:
+                base = multiply(base, base, m)
+        return self._make(result, m)
+
+    def __divmod__(self, other):
+        # long division, the leading coefficient of the divisor has to be invertible (ValueError otherwise)
+        m = self._modulus
+        divisor = self._get_coefficients(other)
+        if not divisor:
+            raise ZeroDivisionError('polynomial division by zero')
+        try:
+            lead_inverse = pow(divisor[-1], -1, m)
+        except ValueError:
+            raise ValueError(f'the leading coefficient {divisor[-1]} of the divisor has no inverse modulo {m}') from None
+        remainder = list(self._coefficients)
+        n = len(divisor)
+        quotient = [0] * max(len(remainder) - n + 1, 0)
+        for i in range(len(quotient) - 1, -1, -1):
+            c = remainder[i + n - 1] * lead_inverse % m
+            quotient[i] = c
+            if c:
+                for j, d in enumerate(divisor, i):
+                    remainder[j] = (remainder[j] - c * d) % m
+        return self._make(quotient, m), self._make(remainder[:n - 1], m)
+
+    def __floordiv__(self, other):
+        return divmod(self, other)[0]
+
+    def __mod__(self, other):
+        return divmod(self, other)[1]
+
+    def evaluate(self, x):
+        # Horner's rule, x is an int or a Mod
+        m = self._modulus
+        x = self._get_value(x)
+        result = 0
+        for c in reversed(self._coefficients):
+            result = (result * x + c) % m
+        return Mod(result, m)
+
+    __call__ = evaluate
+
+    def evaluate_many(self, points):
+        # values at many points at once: Horner's rule on a ModArray of the points, so every step is one element-wise
+        # operation over all the points (the modulus has to fit ModArray: at most 2**63)
+        if not isinstance(points, ModArray):
+            points = ModArray([self._get_value(point) for point in points], self._modulus)
+        if points.modulus != self._modulus:
+            raise ValueError('operation unsupported between instances with different moduli')
+        result = ModArray([0] * len(points), self._modulus, backend=points.backend)
+        for c in reversed(self._coefficients):
+            result *= points
+            result += c
+        return result
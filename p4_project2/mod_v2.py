@@ -1,6 +1,76 @@
 from functools import total_ordering
+import math
 import operator
 
+# inverses modulo small moduli are cached, one table per modulus, filled on first use
+_INVERSE_TABLE_MAX_MODULUS = 1 << 12
+_inverse_tables = {}
+
+def _inverse_value(value, modulus):
+    # inverse of a residue: pow(value, -1, modulus) runs the extended Euclidean algorithm in C
+    table = None
+    if modulus <= _INVERSE_TABLE_MAX_MODULUS:
+        table = _inverse_tables.get(modulus)
+        if table is None:
+            table = _inverse_tables[modulus] = [0] * modulus
+        if table[value]:
+            return table[value]
+    try:
+        inverse = pow(value, -1, modulus)
+    except ValueError:
+        raise ValueError(f'{value} has no inverse modulo {modulus}') from None
+    if table is not None:
+        table[value] = inverse
+    return inverse
+
+def batch_inverse_values(values, modulus):
+    # Montgomery's trick: the inverses of n residues for one modular inversion and 3(n - 1) multiplications
+    values = list(values)
+    prefix = []
+    product = 1
+    for value in values:
+        prefix.append(product)
+        product = product * value % modulus
+    try:
+        inverse = pow(product, -1, modulus)
+    except ValueError:
+        # report the first residue that has no inverse
+        index = next(i for i, value in enumerate(values) if math.gcd(value, modulus) != 1)
+        raise ValueError(f'{values[index]} (index {index}) has no inverse modulo {modulus}') from None
+    inverses = [0] * len(values)
+    for i in range(len(values) - 1, -1, -1):
+        inverses[i] = inverse * prefix[i] % modulus
+        inverse = inverse * values[i] % modulus
+    return inverses
+
+def batch_inverse(mods):
+    # inverses of Mod instances sharing one modulus
+    mods = list(mods)
+    if not mods:
+        return []
+    modulus = mods[0].modulus
+    if any(mod.modulus != modulus for mod in mods):
+        raise ValueError('operation unsupported between Mod instances with different moduli')
+    return [Mod(inverse, modulus) for inverse in batch_inverse_values((mod.value for mod in mods), modulus)]
+
+def crt(*mods):
+    # Chinese Remainder Theorem: the Mod modulo lcm of the moduli congruent to every given Mod,
+    # moduli need not be coprime, but then the residues must agree modulo their gcd
+    value, modulus = 0, 1
+    for mod in mods:
+        if not isinstance(mod, Mod):
+            raise TypeError(f'crt() arguments should be of Mod type, not {type(mod).__name__!r}')
+        gcd = math.gcd(modulus, mod.modulus)
+        difference = mod.value - value
+        if difference % gcd:
+            raise ValueError(f'no solution: {mod!r} contradicts the residue {value % gcd} modulo {gcd}')
+        # value + modulus * t satisfies both congruences for t = difference / gcd * (modulus / gcd)**-1 mod (mod.modulus / gcd)
+        step = mod.modulus // gcd
+        t = difference // gcd * _inverse_value(modulus // gcd % step, step) % step
+        value += modulus * t
+        modulus *= step
+    return Mod(value, modulus)
+
 @total_ordering
 class Mod:
     def __init__(self, value, modulus):
@@ -32,8 +102,26 @@ class Mod:
                 raise ValueError('operation unsupported between Mod instances with different moduli')
         raise TypeError(f'unsupported operand type(s) for +: \'Mod\' and {type(other).__name__!r}')
     
-    def _arithmetic_operation(self, other, operation, *, in_place=False):
-        other_value = self._get_value(other)
+    def _get_exponent(self, other):
+        # an int exponent is used as it is: a ** e and a ** (e % modulus) differ in general
+        if isinstance(other, int):
+            return other
+        return self._get_value(other)
+
+    def _power(self, value, exponent):
+        # three-argument pow reduces after every step instead of building value ** exponent,
+        # and a negative exponent raises the modular inverse (ValueError if there is none)
+        return pow(value, exponent, self._modulus)
+
+    def _divide(self, value, divisor):
+        return value * _inverse_value(divisor, self._modulus)
+
+    def _arithmetic_operation(self, other, operation, *, in_place=False, get_operand=None):
+        if not isinstance(other, (int, Mod)):
+            # lets Python try the reflected operation of the other operand (e.g. ModArray.__radd__),
+            # and raise the TypeError if there is none
+            return NotImplemented
+        other_value = (get_operand or self._get_value)(other)
         result = operation(self._value, other_value)
         if in_place:
             self._value = result % self._modulus
@@ -55,6 +143,10 @@ class Mod:
     def __int__(self):
         return self._value
     
+    def inverse(self):
+        # ValueError when the value and the modulus are not coprime
+        return Mod(_inverse_value(self._value, self._modulus), self._modulus)
+
     def __neg__(self):
         return Mod(-self._value, self._modulus)
     
@@ -68,7 +160,10 @@ class Mod:
         return self._arithmetic_operation(other, operator.mul)
 
     def __pow__(self, other):
-        return self._arithmetic_operation(other, operator.pow)
+        return self._arithmetic_operation(other, self._power, get_operand=self._get_exponent)
+
+    def __truediv__(self, other):
+        return self._arithmetic_operation(other, self._divide)
 
     def __iadd__(self, other):
         return self._arithmetic_operation(other, operator.add, in_place=True)
@@ -82,4 +177,7 @@ class Mod:
 
 
     def __ipow__(self, other):
-        return self._arithmetic_operation(other, operator.pow, in_place=True)
\ No newline at end of file
+        return self._arithmetic_operation(other, self._power, in_place=True, get_operand=self._get_exponent)
+
+    def __itruediv__(self, other):
+        return self._arithmetic_operation(other, self._divide, in_place=True)
\ No newline at end of file
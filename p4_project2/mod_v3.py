@@ -0,0 +1,129 @@
+from functools import total_ordering
+from mod_v2 import _inverse_value
+
+# every residue of a modulus up to SMALL_MODULUS is preallocated on first use and shared, like CPython's small ints
+SMALL_MODULUS = 256
+_cache = {} # modulus -> tuple of the Mod instances of all its residues
+
+@total_ordering
+class Mod:
+    # immutable variant of mod_v2.Mod: slotted, no in-place operators (a += b rebinds a to a new or cached instance),
+    # and results of operations skip the validation of __new__ through the unchecked Mod._make
+    __slots__ = '_value', '_modulus'
+
+    def __new__(cls, value, modulus):
+        if not isinstance(modulus, int):
+            raise TypeError('modulus should be of int type')
+        if modulus <= 0:
+            raise ValueError('modulus should be positive')
+        if not isinstance(value, int):
+            raise TypeError('value should be of int type')
+        # built inline rather than through _make, a call less on the most frequent path
+        value %= modulus
+        if modulus <= SMALL_MODULUS:
+            residues = _cache.get(modulus)
+            return residues[value] if residues is not None else _make(value, modulus)
+        mod = _new(cls)
+        _set_value(mod, value)
+        _set_modulus(mod, modulus)
+        return mod
+
+    @staticmethod
+    def _make(value, modulus):
+        # value must already be reduced: 0 <= value < modulus, and modulus a positive int
+        if modulus <= SMALL_MODULUS:
+            residues = _cache.get(modulus)
+            if residues is None:
+                residues = _cache[modulus] = tuple(_allocate(v, modulus) for v in range(modulus))
+            return residues[value]
+        mod = _new(Mod)
+        _set_value(mod, value)
+        _set_modulus(mod, modulus)
+        return mod
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f'{type(self).__name__!r} object is immutable')
+
+    def __delattr__(self, name):
+        raise AttributeError(f'{type(self).__name__!r} object is immutable')
+
+    def __reduce__(self):
+        return Mod, (self._value, self._modulus)
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    @property
+    def value(self):
+        return self._value
+
+    @property
+    def modulus(self):
+        return self._modulus
+
+    def _get_value(self, other):
+        if isinstance(other, int):
+            return other % self._modulus
+        if isinstance(other, Mod):
+            if self._modulus == other._modulus:
+                return other._value
+            raise ValueError('operation unsupported between Mod instances with different moduli')
+        raise TypeError(f'unsupported operand type(s) for Mod: {type(other).__name__!r}')
+
+    def __repr__(self):
+        return f'Mod(value={self._value}, modulus={self._modulus})'
+
+    def __lt__(self, other):
+        return self._value < self._get_value(other)
+
+    def __eq__(self, other):
+        return self._value == self._get_value(other)
+
+    def __hash__(self):
+        return hash((self._value, self._modulus))
+
+    def __int__(self):
+        return self._value
+
+    def inverse(self):
+        return _make(_inverse_value(self._value, self._modulus), self._modulus)
+
+    def __neg__(self):
+        return _make(-self._value % self._modulus, self._modulus)
+
+    def __add__(self, other):
+        modulus = self._modulus
+        return _make((self._value + self._get_value(other)) % modulus, modulus)
+
+    def __sub__(self, other):
+        modulus = self._modulus
+        return _make((self._value - self._get_value(other)) % modulus, modulus)
+
+    def __mul__(self, other):
+        modulus = self._modulus
+        return _make(self._value * self._get_value(other) % modulus, modulus)
+
+    def __truediv__(self, other):
+        modulus = self._modulus
+        return _make(self._value * _inverse_value(self._get_value(other), modulus) % modulus, modulus)
+
+    def __pow__(self, other):
+        # int exponents are not reduced modulo the modulus, negative ones use the inverse
+        exponent = other if isinstance(other, int) else self._get_value(other)
+        return _make(pow(self._value, exponent, self._modulus), self._modulus)
+
+
+# the slot setters bypass the immutable __setattr__, they are only used to fill a freshly allocated instance
+_set_value = Mod._value.__set__
+_set_modulus = Mod._modulus.__set__
+_new = object.__new__
+_make = Mod._make
+
+def _allocate(value, modulus):
+    mod = _new(Mod)
+    _set_value(mod, value)
+    _set_modulus(mod, modulus)
+    return mod
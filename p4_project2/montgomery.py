@@ -0,0 +1,68 @@
+class MontgomeryContext:
+    # arithmetic modulo one odd modulus n in Montgomery form: x is kept as x * R mod n with R = 2**k > n,
+    # so the product of two such values is reduced with masks and shifts (REDC) instead of a division by n
+    #
+    # in CPython, a single pow(a, e, n) or a * b % n is already done in C and beats REDC written in Python,
+    # the context pays off when the same base is raised to many exponents: precompute(base) stores the
+    # Montgomery form of base ** (d * 16**i) for every hex digit d and position i, after which pow(base, e)
+    # costs one multiplication per non-zero hex digit of e instead of a full square and multiply
+    _WINDOW = 4 # bits per table row, one hex digit of the exponent
+
+    def __init__(self, modulus):
+        if not isinstance(modulus, int):
+            raise TypeError('modulus should be of int type')
+        if modulus <= 1 or modulus % 2 == 0:
+            raise ValueError('modulus should be an odd integer greater than 1')
+        self._modulus = modulus
+        self._bits = modulus.bit_length()
+        self._mask = (1 << self._bits) - 1
+        self._n_prime = -pow(modulus, -1, 1 << self._bits) & self._mask # n * n_prime == -1 (mod R)
+        self._r2 = (1 << 2 * self._bits) % modulus # R**2 mod n, turns x into x * R with a single REDC
+        self._one = (1 << self._bits) % modulus # Montgomery form of 1
+        self._tables = {} # base -> table rows, see precompute
+
+    @property
+    def modulus(self):
+        return self._modulus
+
+    def reduce(self, t):
+        # REDC: t * R**-1 mod n for 0 <= t < n * R
+        u = (t + ((t & self._mask) * self._n_prime & self._mask) * self._modulus) >> self._bits
+        return u - self._modulus if u >= self._modulus else u
+
+    def to_montgomery(self, value):
+        return self.reduce(value % self._modulus * self._r2)
+
+    def from_montgomery(self, value):
+        return self.reduce(value)
+
+    def mul(self, a, b):
+        # product of two values in Montgomery form, in Montgomery form
+        return self.reduce(a * b)
+
+    def precompute(self, base, max_exponent_bits=None):
+        # table for repeated pow(base, e) with 0 <= e < 2**max_exponent_bits (default: the bit length of the modulus)
+        base %= self._modulus
+        rows = -(-(max_exponent_bits or self._bits) // self._WINDOW)
+        table = []
+        power = self.to_montgomery(base) # base ** (16 ** i)
+        for _ in range(rows):
+            row = [self._one, power]
+            for _ in range(2, 1 << self._WINDOW):
+                row.append(self.reduce(row[-1] * power))
+            table.append(row)
+            power = self.reduce(row[-1] * power)
+        self._tables[base] = table
+
+    def pow(self, base, exponent):
+        # base ** exponent mod n for plain (not Montgomery form) ints, negative exponents use the modular inverse
+        base %= self._modulus
+        table = self._tables.get(base)
+        if table is None or exponent < 0 or exponent.bit_length() > len(table) * self._WINDOW:
+            return pow(base, exponent, self._modulus)
+        result = self._one
+        reduce = self.reduce
+        for row, digit in zip(table, reversed(f'{exponent:x}')):
+            if digit != '0':
+                result = reduce(result * row[int(digit, 16)])
+        return reduce(result)
@@ -0,0 +1,149 @@
+from itertools import accumulate
+
+# two primes below 2**31, chosen so that 256 has the largest possible order modulo each, (p - 1) / 2 (about 2**30):
+# inputs that differ by moving bytes fewer positions than that cannot collide by construction. a base of small
+# order is a trap, 256 has order 31 modulo 2**31 - 1, so swapping two bytes 31 positions apart keeps that hash
+# the double hash is about 62 bits against accidental collisions; the base is public, so an adversary can still
+# construct collisions, use a random base against crafted inputs
+DEFAULT_MODULI = (2_147_483_579, 2_147_483_587)
+DEFAULT_BASE = 256
+
+class RollingHash:
+    # polynomial hash of byte strings: h(b_0 .. b_n-1) = sum(b_i * base ** (n - 1 - i)) mod m for every modulus m,
+    # combined into one int (h_1 * m_2 + h_2 for two moduli), inputs are bytes, bytearray or memoryview
+    # with the default base of 256 the hash of a whole input is int.from_bytes(data) % m, computed in C;
+    # a random base makes collisions hard to construct on purpose, at the cost of the fast path
+    def __init__(self, moduli=DEFAULT_MODULI, base=DEFAULT_BASE):
+        if isinstance(moduli, int):
+            moduli = (moduli,)
+        moduli = tuple(moduli)
+        if not moduli:
+            raise ValueError('at least one modulus is required')
+        for modulus in moduli:
+            if not isinstance(modulus, int):
+                raise TypeError('modulus should be of int type')
+            if modulus <= 0:
+                raise ValueError('modulus should be positive')
+        if not isinstance(base, int):
+            raise TypeError('base should be of int type')
+        if not all(2 <= base < modulus for modulus in moduli):
+            raise ValueError('base should be at least 2 and smaller than every modulus')
+        self._moduli = moduli
+        self._base = base
+        self._powers = [[1] for _ in moduli] # base ** i mod m, grown on demand
+
+    @property
+    def moduli(self):
+        return self._moduli
+
+    @property
+    def base(self):
+        return self._base
+
+    def power(self, n):
+        # base ** n for every modulus, from the power tables
+        tables = self._grow_powers(n)
+        return tuple(table[n] for table in tables)
+
+    def _grow_powers(self, n):
+        # extend the power tables to at least n + 1 entries, doubling so repeated calls stay amortized O(1)
+        tables = self._powers
+        if len(tables[0]) <= n:
+            size = max(n + 1, 2 * len(tables[0]))
+            for table, modulus in zip(tables, self._moduli):
+                power = table[-1]
+                for _ in range(size - len(table)):
+                    power = power * self._base % modulus
+                    table.append(power)
+        return tables
+
+    def _combine(self, hashes):
+        combined = 0
+        for h, modulus in zip(hashes, self._moduli):
+            combined = combined * modulus + h
+        return combined
+
+    @staticmethod
+    def _as_bytes(data):
+        if isinstance(data, str):
+            raise TypeError('data should be bytes-like, encode str first')
+        data = memoryview(data)
+        return data if data.format == 'B' and data.ndim == 1 else data.cast('B')
+
+    def _hashes(self, data):
+        if self._base == 256:
+            number = int.from_bytes(data, 'big')
+            return [number % modulus for modulus in self._moduli]
+        hashes = []
+        base = self._base
+        for modulus in self._moduli:
+            h = 0
+            for byte in data:
+                h = (h * base + byte) % modulus
+            hashes.append(h)
+        return hashes
+
+    def fingerprint(self, data):
+        return self._combine(self._hashes(self._as_bytes(data)))
+
+    def prefix_hashes(self, data):
+        # per modulus, the hashes of data[:i] for i = 0 .. len(data)
+        data = self._as_bytes(data)
+        base = self._base
+        return [list(accumulate(data, lambda h, byte: (h * base + byte) % modulus, initial=0))
+                for modulus in self._moduli]
+
+    def substring_hash(self, prefixes, start, end):
+        # hash of data[start:end] from the prefix_hashes of data, O(1)
+        powers = self._grow_powers(end - start)
+        return self._combine((prefix[end] - prefix[start] * table[end - start]) % modulus
+                             for prefix, table, modulus in zip(prefixes, powers, self._moduli))
+
+    def window_hashes(self, data, window):
+        # hashes of every window data[i:i + window], i = 0 .. len(data) - window
+        if window <= 0:
+            raise ValueError('window should be positive')
+        prefixes = self.prefix_hashes(data)
+        count = len(prefixes[0]) - window
+        if count <= 0:
+            return []
+        per_modulus = []
+        for prefix, modulus, shift in zip(prefixes, self._moduli, self.power(window)):
+            per_modulus.append([(high - low * shift) % modulus for low, high in zip(prefix[:count], prefix[window:])])
+        if len(per_modulus) == 1:
+            return per_modulus[0]
+        return [self._combine(hashes) for hashes in zip(*per_modulus)]
+
+    def find(self, pattern, text):
+        # Rabin-Karp: offsets of every occurrence of pattern in text, hash matches are checked byte by byte
+        pattern, text = self._as_bytes(pattern), self._as_bytes(text)
+        n = len(pattern)
+        if n == 0:
+            return list(range(len(text) + 1))
+        target = self.fingerprint(pattern)
+        return [i for i, h in enumerate(self.window_hashes(text, n)) if h == target and text[i:i + n] == pattern]
+
+    def fingerprint_file(self, file, window):
+        # (offset, fingerprint) of every consecutive window-sized block of a binary file (path or open file), the last
+        # block can be shorter; blocks are read into one reused buffer and hashed through a memoryview, no copies
+        if window <= 0:
+            raise ValueError('window should be positive')
+        if isinstance(file, (str, bytes)) or hasattr(file, '__fspath__'):
+            with open(file, 'rb') as f:
+                yield from self.fingerprint_file(f, window)
+            return
+        buffer = memoryview(bytearray(window))
+        offset = 0
+        while True:
+            size = 0
+            while size < window:
+                read = file.readinto(buffer[size:])
+                if not read:
+                    break
+                size += read
+            if not size:
+                return
+            yield offset, self.fingerprint(buffer[:size])
+            offset += size
+            if size < window:
+                return
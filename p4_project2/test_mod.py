@@ -1,6 +1,7 @@
 import unittest
+import operator
 # from mod import Mod
-from mod_v2 import Mod
+from mod_v2 import Mod, batch_inverse, crt
 
 def run_tests(test_case_class):
     suite = unittest.TestLoader().loadTestsFromTestCase(test_case_class)
@@ -61,8 +62,8 @@ class ModTestCase(unittest.TestCase):
         mod1 += mod2
         self.assertEqual(mod1, Mod(2, 12))
         self.assertRaises(ValueError, lambda: Mod(10, 12).__iadd__(Mod(10, 2)))
-        self.assertRaises(TypeError, lambda: Mod(10, 12).__iadd__(3.1))
-        self.assertRaises(TypeError, lambda: Mod(10, 12).__iadd__('a'))
+        self.assertRaises(TypeError, operator.iadd, Mod(10, 12), 3.1)
+        self.assertRaises(TypeError, operator.iadd, Mod(10, 12), 'a')
 
     def test_sub(self):
         self.assertEqual(Mod(10, 12) - 2, Mod(8, 12))
@@ -81,8 +82,8 @@ class ModTestCase(unittest.TestCase):
         mod1 -= mod2
         self.assertEqual(mod1, Mod(6, 12))
         self.assertRaises(ValueError, lambda: Mod(10, 12).__isub__(Mod(10, 2)))
-        self.assertRaises(TypeError, lambda: Mod(10, 12).__isub__(3.1))
-        self.assertRaises(TypeError, lambda: Mod(10, 12).__isub__('a'))
+        self.assertRaises(TypeError, operator.isub, Mod(10, 12), 3.1)
+        self.assertRaises(TypeError, operator.isub, Mod(10, 12), 'a')
 
     def test_mul(self):
         self.assertEqual(Mod(10, 12) * 2, Mod(20, 12))
@@ -101,8 +102,8 @@ class ModTestCase(unittest.TestCase):
         mod1 *= mod2
         self.assertEqual(mod1, Mod(4, 12))
         self.assertRaises(ValueError, lambda: Mod(10, 12).__imul__(Mod(10, 2)))
-        self.assertRaises(TypeError, lambda: Mod(10, 12).__imul__(3.1))
-        self.assertRaises(TypeError, lambda: Mod(10, 12).__imul__('a'))
+        self.assertRaises(TypeError, operator.imul, Mod(10, 12), 3.1)
+        self.assertRaises(TypeError, operator.imul, Mod(10, 12), 'a')
 
     def test_pow(self):
         self.assertEqual(Mod(10, 12) ** 2, Mod(100, 12))
@@ -111,6 +112,14 @@ class ModTestCase(unittest.TestCase):
         self.assertRaises(TypeError, lambda: Mod(10, 12) ** 3.1)
         self.assertRaises(TypeError, lambda: Mod(10, 12) ** 'a')
 
+        # int exponents are not reduced modulo the modulus, and huge ones never build value ** exponent
+        self.assertEqual(Mod(2, 5) ** 5, Mod(2, 5))
+        self.assertEqual(Mod(3, 10**9 + 7) ** (10**100), Mod(pow(3, 10**100, 10**9 + 7), 10**9 + 7))
+        # negative exponents use the modular inverse
+        self.assertEqual(Mod(5, 12) ** -1, Mod(5, 12))
+        self.assertEqual(Mod(3, 7) ** -2, Mod(4, 7))
+        self.assertRaises(ValueError, lambda: Mod(10, 12) ** -1)
+
     def test_ipow(self):
         mod1 = Mod(10, 12)
         mod2 = Mod(2, 12)
@@ -121,8 +130,57 @@ class ModTestCase(unittest.TestCase):
         mod1 **= mod2
         self.assertEqual(mod1, Mod(4, 12))
         self.assertRaises(ValueError, lambda: Mod(10, 12).__ipow__(Mod(10, 2)))
-        self.assertRaises(TypeError, lambda: Mod(10, 12).__ipow__(3.1))
-        self.assertRaises(TypeError, lambda: Mod(10, 12).__ipow__('a'))
+        self.assertRaises(TypeError, operator.ipow, Mod(10, 12), 3.1)
+        self.assertRaises(TypeError, operator.ipow, Mod(10, 12), 'a')
+        mod3 = Mod(3, 7)
+        mod3 **= -1
+        self.assertEqual(mod3, Mod(5, 7))
+        mod3 **= 7
+        self.assertEqual(mod3, Mod(5, 7))
+
+    def test_inverse(self):
+        self.assertEqual(Mod(3, 7).inverse(), Mod(5, 7))
+        self.assertEqual(Mod(10**18 + 1, 10**9 + 7).inverse() * (10**18 + 1), Mod(1, 10**9 + 7))
+        self.assertEqual(Mod(5, 1).inverse(), Mod(0, 1))
+        self.assertRaises(ValueError, Mod(4, 12).inverse)
+        self.assertRaises(ValueError, Mod(0, 7).inverse)
+
+    def test_truediv(self):
+        self.assertEqual(Mod(3, 7) / 2, Mod(5, 7))
+        self.assertEqual(Mod(3, 7) / Mod(3, 7), Mod(1, 7))
+        self.assertEqual(Mod(3, 10**9 + 7) / 2 * 2, Mod(3, 10**9 + 7))
+        self.assertRaises(ValueError, lambda: Mod(3, 7) / Mod(2, 5))
+        self.assertRaises(ValueError, lambda: Mod(3, 12) / 4)
+        self.assertRaises(ValueError, lambda: Mod(3, 7) / 0)
+        self.assertRaises(TypeError, lambda: Mod(3, 7) / 1.5)
+
+    def test_itruediv(self):
+        mod1 = Mod(3, 7)
+        id_mod = id(mod1)
+        mod1 /= 2
+        self.assertEqual(mod1, Mod(5, 7))
+        self.assertEqual(id_mod, id(mod1))
+        mod1 /= Mod(5, 7)
+        self.assertEqual(mod1, Mod(1, 7))
+        self.assertRaises(ValueError, lambda: Mod(3, 12).__itruediv__(6))
+
+    def test_crt(self):
+        self.assertEqual(crt(Mod(2, 3), Mod(3, 5), Mod(2, 7)), Mod(23, 105))
+        self.assertEqual(crt(Mod(2, 3), Mod(3, 5), Mod(2, 7)).modulus, 105)
+        # moduli that are not coprime combine into their lcm
+        self.assertEqual(crt(Mod(1, 4), Mod(3, 6)).modulus, 12)
+        self.assertEqual(crt(Mod(1, 4), Mod(3, 6)), 9)
+        self.assertEqual(crt(Mod(4, 9)), Mod(4, 9))
+        self.assertEqual(crt(), Mod(0, 1))
+        self.assertRaises(ValueError, crt, Mod(1, 4), Mod(2, 6))
+        self.assertRaises(TypeError, crt, Mod(1, 4), 3)
+
+    def test_batch_inverse(self):
+        mods = [Mod(value, 101) for value in range(1, 101)]
+        self.assertEqual(batch_inverse(mods), [mod.inverse() for mod in mods])
+        self.assertEqual(batch_inverse([]), [])
+        self.assertRaises(ValueError, batch_inverse, [Mod(1, 12), Mod(6, 12)])
+        self.assertRaises(ValueError, batch_inverse, [Mod(1, 12), Mod(5, 7)])
 
     def test_ordering(self):
         mod1 = Mod(3, 12)
@@ -0,0 +1,152 @@
+import unittest
+import random
+from mod_v2 import Mod
+from mod_array import ModArray, np
+
+def run_tests(test_case_class):
+    suite = unittest.TestLoader().loadTestsFromTestCase(test_case_class)
+    runner = unittest.TextTestRunner(verbosity=2)
+    runner.run(suite)
+
+class ModArrayTestCase(unittest.TestCase):
+    backend = 'array'
+
+    def mod_array(self, values, modulus):
+        return ModArray(values, modulus, backend=self.backend)
+
+    def test_create_mod_array_instance(self):
+        # exception cases
+        self.assertRaises(TypeError, ModArray, [1.1], 10)
+        self.assertRaises(TypeError, ModArray, [2], 1.1)
+        self.assertRaises(ValueError, ModArray, [2], 0)
+        self.assertRaises(ValueError, ModArray, [2], 2 ** 63 + 1)
+        self.assertRaises(ValueError, ModArray, [2], 10, backend='list')
+
+        # success cases
+        mods = self.mod_array([15, -1, 3], 12)
+        self.assertEqual(mods.tolist(), [3, 11, 3])
+        self.assertEqual(mods.modulus, 12)
+        self.assertEqual(len(mods), 3)
+        self.assertEqual(mods[1], Mod(11, 12))
+        self.assertEqual(list(mods), [Mod(3, 12), Mod(11, 12), Mod(3, 12)])
+        self.assertEqual(mods[1:].tolist(), [11, 3])
+        mods[0] = Mod(5, 12)
+        mods[1] = 25
+        self.assertEqual(mods.tolist(), [5, 1, 3])
+        self.assertEqual(repr(mods), 'ModArray(values=[5, 1, 3], modulus=12)')
+
+    def test_arithmetic(self):
+        a = self.mod_array([10, 5, 0], 12)
+        b = self.mod_array([2, 9, 11], 12)
+        self.assertEqual((a + b).tolist(), [0, 2, 11])
+        self.assertEqual((a + 2).tolist(), [0, 7, 2])
+        self.assertEqual((2 + a).tolist(), [0, 7, 2])
+        self.assertEqual((a + Mod(14, 12)).tolist(), [0, 7, 2])
+        self.assertEqual((a - b).tolist(), [8, 8, 1])
+        self.assertEqual((1 - a).tolist(), [3, 8, 1])
+        self.assertEqual((-a).tolist(), [2, 7, 0])
+        self.assertEqual((a * b).tolist(), [8, 9, 0])
+        self.assertEqual((a * -1).tolist(), [2, 7, 0])
+        self.assertEqual((3 * a).tolist(), [6, 3, 0])
+        self.assertEqual(a.tolist(), [10, 5, 0])
+
+        # exception cases
+        self.assertRaises(ValueError, lambda: a + self.mod_array([1, 2, 3], 11))
+        self.assertRaises(ValueError, lambda: a + self.mod_array([1, 2], 12))
+        self.assertRaises(ValueError, lambda: a * Mod(1, 11))
+        self.assertRaises(TypeError, lambda: a + 3.1)
+        self.assertRaises(TypeError, lambda: a - 'a')
+
+    def test_pow(self):
+        a = self.mod_array([10, 5, 0, 7], 12)
+        self.assertEqual((a ** 2).tolist(), [4, 1, 0, 1])
+        self.assertEqual((a ** 0).tolist(), [1, 1, 1, 1])
+        self.assertEqual((a ** Mod(2, 12)).tolist(), [4, 1, 0, 1])
+        self.assertEqual((a ** self.mod_array([1, 2, 3, 0], 12)).tolist(), [10, 1, 0, 1])
+        # int exponents are not reduced modulo the modulus
+        self.assertEqual((a ** 13).tolist(), [pow(v, 13, 12) for v in [10, 5, 0, 7]])
+        self.assertEqual((self.mod_array([5, 7], 12) ** -1).tolist(), [5, 7])
+        self.assertEqual((self.mod_array([3], 1) ** 0).tolist(), [0])
+
+        # exception cases
+        self.assertRaises(ValueError, lambda: a ** -1)
+        self.assertRaises(TypeError, lambda: a ** 3.1)
+
+    def test_division(self):
+        a = self.mod_array([1, 2, 3, 4], 7)
+        self.assertEqual(a.inverse().tolist(), [1, 4, 5, 2])
+        self.assertEqual((a / 3).tolist(), [5, 3, 1, 6])
+        self.assertEqual((a / self.mod_array([1, 2, 3, 4], 7)).tolist(), [1, 1, 1, 1])
+        a /= Mod(2, 7)
+        self.assertEqual(a.tolist(), [4, 1, 5, 2])
+
+        # exception cases
+        self.assertRaises(ValueError, lambda: a / 0)
+        self.assertRaises(ValueError, self.mod_array([1, 2, 3, 4], 12).inverse)
+
+    def test_in_place(self):
+        a = self.mod_array([10, 5], 12)
+        id_a = id(a)
+        a += 2
+        a *= self.mod_array([2, 3], 12)
+        a -= Mod(1, 12)
+        a **= 2
+        self.assertEqual(a.tolist(), [1, 4])
+        self.assertEqual(id(a), id_a)
+
+    def test_comparisons(self):
+        a = self.mod_array([3, 5, 30], 12)
+        b = self.mod_array([5, 5, 5], 12)
+        self.assertEqual(list(a == b), [False, True, False])
+        self.assertEqual(list(a != b), [True, False, True])
+        self.assertEqual(list(a < b), [True, False, False])
+        self.assertEqual(list(a <= 5), [True, True, False])
+        self.assertEqual(list(a > Mod(4, 12)), [False, True, True])
+        self.assertEqual(list(a >= 17), [False, True, True])
+        self.assertRaises(TypeError, lambda: a == 1.1)
+        self.assertRaises(ValueError, lambda: a == Mod(3, 11))
+        self.assertRaises(TypeError, hash, a)
+        # like a numpy bool array, the result has no single truth value, whatever the backend
+        self.assertRaises(ValueError, bool, a == b)
+        self.assertRaises(ValueError, bool, self.mod_array([1, 2, 3], 7) == self.mod_array([0, 0, 0], 7))
+        self.assertTrue((a == a).all())
+        self.assertFalse((a == b).all())
+        self.assertTrue((a == b).any())
+        self.assertTrue(bool(a[:1] == 3))
+
+    def test_mod_operand_first(self):
+        # Mod returns NotImplemented for a ModArray operand, so the reflected ModArray operation runs
+        a = self.mod_array([1, 2, 3], 7)
+        self.assertEqual((Mod(1, 7) + a).tolist(), [2, 3, 4])
+        self.assertEqual((Mod(1, 7) - a).tolist(), [0, 6, 5])
+        self.assertEqual((Mod(3, 7) * a).tolist(), [3, 6, 2])
+        self.assertRaises(ValueError, lambda: Mod(1, 5) + a)
+        self.assertRaises(TypeError, lambda: Mod(1, 7) / a)
+
+    def test_large_modulus(self):
+        # products of residues close to 2**63 must not overflow
+        rng = random.Random(0)
+        for modulus in (2 ** 63, 2 ** 61 - 1, 3_037_000_501, 2 ** 31 - 1):
+            x = [rng.randrange(modulus) for _ in range(50)]
+            y = [rng.randrange(modulus) for _ in range(50)]
+            a, b = ModArray(x, modulus), ModArray(y, modulus)
+            self.assertEqual((a * b).tolist(), [i * j % modulus for i, j in zip(x, y)])
+            self.assertEqual((a + b).tolist(), [(i + j) % modulus for i, j in zip(x, y)])
+            self.assertEqual((a - b).tolist(), [(i - j) % modulus for i, j in zip(x, y)])
+            self.assertEqual((a ** 65537).tolist(), [pow(i, 65537, modulus) for i in x])
+
+
+@unittest.skipIf(np is None, 'numpy is not installed')
+class NumpyModArrayTestCase(ModArrayTestCase):
+    backend = 'numpy'
+
+    def test_mixed_backends(self):
+        a = ModArray([1, 2, 3], 7, backend='numpy')
+        b = ModArray([6, 6, 6], 7, backend='array')
+        self.assertEqual((a + b).tolist(), [0, 1, 2])
+        self.assertEqual((b + a).tolist(), [0, 1, 2])
+        self.assertEqual(ModArray(np.array([-1, 8]), 7).tolist(), [6, 1])
+
+
+run_tests(ModArrayTestCase)
+run_tests(NumpyModArrayTestCase)
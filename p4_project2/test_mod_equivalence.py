@@ -0,0 +1,122 @@
+import unittest
+import operator
+import random
+import mod
+import mod_v2
+import mod_v3
+from mod_array import ModArray, MAX_MODULUS
+
+def run_tests(test_case_class):
+    suite = unittest.TestLoader().loadTestsFromTestCase(test_case_class)
+    runner = unittest.TextTestRunner(verbosity=2)
+    runner.run(suite)
+
+# differential test: the same randomly generated operations run on every implementation must give the same
+# result or raise the same exception type; mod_v2 is the reference
+IMPLEMENTATIONS = [mod.Mod, mod_v2.Mod, mod_v3.Mod]
+CASES = 3000
+
+def random_modulus(rng):
+    return rng.choice([1, 2, rng.randint(3, 50), 97, 2 ** 31 - 1, 2 ** 61 - 1, 2 ** 63, 2 ** 127 - 1,
+                       rng.getrandbits(100) + 1])
+
+def random_value(rng, modulus):
+    return rng.choice([0, 1, -1, modulus - 1, modulus, -modulus, rng.randrange(modulus),
+                       rng.randint(-10 ** 6, 10 ** 6), rng.getrandbits(200) * rng.choice([1, -1])])
+
+def outcome(function, *args):
+    # ('ok', value, modulus) for a Mod, ('ok', result) for anything else, ('error', exception type) if it raised
+    try:
+        result = function(*args)
+    except Exception as e:
+        return 'error', type(e)
+    if hasattr(result, 'modulus'):
+        return 'ok', result.value, result.modulus
+    return 'ok', result
+
+BINARY_OPERATIONS = {
+    '+': operator.add, '-': operator.sub, '*': operator.mul, '**': operator.pow,
+    '==': operator.eq, '!=': operator.ne, '<': operator.lt, '<=': operator.le, '>': operator.gt, '>=': operator.ge,
+    '+=': operator.iadd, '-=': operator.isub, '*=': operator.imul, '**=': operator.ipow,
+}
+
+class ModEquivalenceTestCase(unittest.TestCase):
+    def check(self, description, outcomes):
+        reference = outcomes[1]
+        for Mod, result in zip(IMPLEMENTATIONS, outcomes):
+            self.assertEqual(result, reference, f'{Mod.__module__}: {description}')
+
+    def test_construction_and_unary(self):
+        rng = random.Random(1)
+        for _ in range(CASES):
+            modulus = random_modulus(rng)
+            value = random_value(rng, modulus)
+            mods = [Mod(value, modulus) for Mod in IMPLEMENTATIONS]
+            for name, function in (('value', lambda a: a.value), ('modulus', lambda a: a.modulus), ('int', int),
+                                   ('hash', hash), ('neg', operator.neg), ('repr', repr)):
+                self.check(f'{name} of Mod({value}, {modulus})', [outcome(function, a) for a in mods])
+        for value, modulus in ((1.5, 7), (1, 7.5), (1, 0), (1, -3), ('1', 7)):
+            self.check(f'Mod({value!r}, {modulus!r})', [outcome(Mod, value, modulus) for Mod in IMPLEMENTATIONS])
+
+    def test_binary_operations(self):
+        rng = random.Random(2)
+        for _ in range(CASES):
+            modulus = random_modulus(rng)
+            value = random_value(rng, modulus)
+            other = random_value(rng, modulus)
+            other_modulus = rng.choice([modulus, modulus, modulus, random_modulus(rng)])
+            for name, function in BINARY_OPERATIONS.items():
+                # int operand, then Mod operand (possibly with another modulus); int exponents are kept small so
+                # that 0 and negative exponents (the inverse) come up often
+                int_operand = rng.randint(-5, 200) if name.startswith('**') else other
+                self.check(f'Mod({value}, {modulus}) {name} {int_operand}',
+                           [outcome(function, Mod(value, modulus), int_operand) for Mod in IMPLEMENTATIONS])
+                self.check(f'Mod({value}, {modulus}) {name} Mod({other}, {other_modulus})',
+                           [outcome(function, Mod(value, modulus), Mod(other, other_modulus)) for Mod in IMPLEMENTATIONS])
+
+    def test_division(self):
+        # mod.Mod has no division, mod_v2 and mod_v3 must agree, and a / b * b == a when b is invertible
+        rng = random.Random(3)
+        for _ in range(CASES):
+            modulus = random_modulus(rng)
+            value, other = random_value(rng, modulus), random_value(rng, modulus)
+            outcomes = [outcome(operator.truediv, Mod(value, modulus), Mod(other, modulus))
+                        for Mod in (mod_v2.Mod, mod_v3.Mod)]
+            self.assertEqual(outcomes[0], outcomes[1])
+            self.assertEqual(outcomes[0], outcome(operator.truediv, mod_v2.Mod(value, modulus), other))
+            if outcomes[0][0] == 'ok':
+                self.assertEqual(mod_v2.Mod(outcomes[0][1], modulus) * other, value)
+
+    def test_unsupported_operands(self):
+        for Mod in IMPLEMENTATIONS:
+            for function in (operator.add, operator.sub, operator.mul, operator.pow, operator.lt):
+                self.assertRaises(TypeError, function, Mod(3, 7), 1.5)
+                self.assertRaises(TypeError, function, Mod(3, 7), 'a')
+
+    def test_in_place_identity(self):
+        # mod.Mod and mod_v2.Mod update in place, mod_v3.Mod is immutable and rebinds
+        for Mod in IMPLEMENTATIONS:
+            a = b = Mod(3, 1000)
+            a += 1
+            self.assertEqual(a, 4)
+            if Mod is mod_v3.Mod:
+                self.assertIsNot(a, b)
+                self.assertEqual(b, 3)
+            else:
+                self.assertIs(a, b)
+
+    def test_mod_array(self):
+        # element-wise ModArray operations agree with mod_v2.Mod on every element
+        rng = random.Random(4)
+        for _ in range(200):
+            modulus = rng.choice([1, 2, 97, 2 ** 31 - 1, 2 ** 61 - 1, MAX_MODULUS])
+            x = [random_value(rng, modulus) for _ in range(20)]
+            y = [random_value(rng, modulus) for _ in range(20)]
+            a, b = ModArray(x, modulus), ModArray(y, modulus)
+            for function in (operator.add, operator.sub, operator.mul, operator.lt, operator.eq):
+                expected = [function(mod_v2.Mod(i, modulus), mod_v2.Mod(j, modulus)) for i, j in zip(x, y)]
+                self.assertEqual(list(function(a, b)), expected)
+            exponent = rng.randint(0, 10 ** 6)
+            self.assertEqual(list(a ** exponent), [mod_v2.Mod(i, modulus) ** exponent for i in x])
+
+run_tests(ModEquivalenceTestCase)
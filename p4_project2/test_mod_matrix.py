@@ -0,0 +1,99 @@
+import unittest
+import random
+from mod_v2 import Mod
+from mod_matrix import ModMatrix
+
+def run_tests(test_case_class):
+    suite = unittest.TestLoader().loadTestsFromTestCase(test_case_class)
+    runner = unittest.TextTestRunner(verbosity=2)
+    runner.run(suite)
+
+class ModMatrixTestCase(unittest.TestCase):
+    def test_create_mod_matrix_instance(self):
+        # exception cases
+        self.assertRaises(TypeError, ModMatrix, [[1.5]], 7)
+        self.assertRaises(TypeError, ModMatrix, [[1]], 7.0)
+        self.assertRaises(ValueError, ModMatrix, [[1]], 0)
+        self.assertRaises(ValueError, ModMatrix, [[1, 2], [3]], 7)
+        self.assertRaises(ValueError, ModMatrix, [], 7)
+        self.assertRaises(ValueError, ModMatrix, [[Mod(1, 5)]], 7)
+
+        # success cases
+        matrix = ModMatrix([[8, Mod(3, 7)], [-1, 0], [2, 9]], 7)
+        self.assertEqual(matrix.shape, (3, 2))
+        self.assertEqual(matrix.modulus, 7)
+        self.assertEqual(matrix.tolist(), [[1, 3], [6, 0], [2, 2]])
+        self.assertEqual(matrix[2, 1], Mod(2, 7))
+        self.assertRaises(IndexError, lambda: matrix[3, 0])
+        self.assertEqual(repr(ModMatrix([[1]], 7)), 'ModMatrix(rows=[[1]], modulus=7)')
+        self.assertEqual(ModMatrix.identity(2, 5).tolist(), [[1, 0], [0, 1]])
+
+    def test_arithmetic(self):
+        a = ModMatrix([[1, 2], [3, 4]], 7)
+        b = ModMatrix([[5, 6], [0, 1]], 7)
+        self.assertEqual((a + b).tolist(), [[6, 1], [3, 5]])
+        self.assertEqual((a - b).tolist(), [[3, 3], [3, 3]])
+        self.assertEqual((-a).tolist(), [[6, 5], [4, 3]])
+        self.assertEqual((a * 2).tolist(), [[2, 4], [6, 1]])
+        self.assertEqual((a * Mod(2, 7)).tolist(), [[2, 4], [6, 1]])
+        self.assertEqual((2 * a).tolist(), [[2, 4], [6, 1]])
+        self.assertEqual((a @ b).tolist(), [[5, 8 % 7], [15 % 7, 22 % 7]])
+        self.assertEqual((ModMatrix([[1, 2, 3]], 7) @ ModMatrix([[1], [1], [1]], 7)).tolist(), [[6]])
+        self.assertEqual(a, ModMatrix([[8, 9], [10, 11]], 7))
+        self.assertNotEqual(a, b)
+        self.assertEqual(hash(a), hash(ModMatrix([[8, 9], [10, 11]], 7)))
+
+        # exception cases
+        self.assertRaises(ValueError, lambda: a + ModMatrix([[1, 2]], 7))
+        self.assertRaises(ValueError, lambda: a @ ModMatrix([[1, 2]], 7))
+        self.assertRaises(ValueError, lambda: a @ ModMatrix([[1, 2], [3, 4]], 5))
+        self.assertRaises(TypeError, lambda: a * 1.5)
+        self.assertRaises(TypeError, lambda: a @ 2)
+
+    def test_pow(self):
+        # Fibonacci numbers from the power of [[1, 1], [1, 0]]
+        modulus = 10**9 + 7
+        fibonacci = ModMatrix([[1, 1], [1, 0]], modulus)
+        a, b = 0, 1
+        for _ in range(100):
+            a, b = b, (a + b) % modulus
+        self.assertEqual(fibonacci ** 100, ModMatrix([[b, a], [a, (b - a) % modulus]], modulus))
+        self.assertEqual(fibonacci ** 0, ModMatrix.identity(2, modulus))
+        self.assertEqual(fibonacci ** -3 @ fibonacci ** 3, ModMatrix.identity(2, modulus))
+        self.assertRaises(ValueError, lambda: ModMatrix([[1, 2]], 7) ** 2)
+        self.assertRaises(TypeError, lambda: fibonacci ** 1.5)
+
+    def test_elimination(self):
+        a = ModMatrix([[2, 1, 1], [1, 3, 2], [1, 0, 0]], 11)
+        self.assertEqual(a.det(), Mod(-1, 11))
+        self.assertEqual(a.rank(), 3)
+        self.assertEqual(a @ a.inverse(), ModMatrix.identity(3, 11))
+        x = a.solve([4, 5, Mod(6, 11)])
+        self.assertEqual((a @ ModMatrix([[value] for value in x], 11)).tolist(), [[4], [5], [6]])
+
+        singular = ModMatrix([[1, 2, 3], [2, 4, 6], [1, 1, 1]], 11)
+        self.assertEqual(singular.det(), 0)
+        self.assertEqual(singular.rank(), 2)
+        self.assertRaises(ValueError, singular.inverse)
+        self.assertRaises(ValueError, singular.solve, [1, 1, 1])
+        x = singular.solve([1, 2, 0])
+        self.assertEqual((singular @ ModMatrix([[value] for value in x], 11)).tolist(), [[1], [2], [0]])
+        self.assertEqual(ModMatrix([[1, 2, 3], [4, 5, 6]], 11).rank(), 2)
+
+        # det works for composite moduli, elimination needs invertible pivots there
+        rng = random.Random(0)
+        values = [[rng.randrange(100) for _ in range(4)] for _ in range(4)]
+        self.assertEqual(ModMatrix(values, 12).det(), Mod(self.exact_det(values), 12))
+        self.assertEqual(ModMatrix(values, 10**9 + 7).det(), Mod(self.exact_det(values), 10**9 + 7))
+        self.assertRaises(ValueError, ModMatrix([[2, 4], [6, 3]], 12).rank)
+        self.assertRaises(ValueError, singular.solve, [1, 2])
+        self.assertRaises(ValueError, ModMatrix([[1, 2]], 7).det)
+
+    @classmethod
+    def exact_det(cls, rows):
+        if len(rows) == 1:
+            return rows[0][0]
+        return sum((-1) ** j * rows[0][j] * cls.exact_det([row[:j] + row[j + 1:] for row in rows[1:]])
+                   for j in range(len(rows)))
+
+run_tests(ModMatrixTestCase)
@@ -0,0 +1,104 @@
+import unittest
+import random
+from mod_v2 import Mod
+from mod_array import ModArray
+import mod_poly
+from mod_poly import ModPoly, multiply, ntt_root
+
+def run_tests(test_case_class):
+    suite = unittest.TestLoader().loadTestsFromTestCase(test_case_class)
+    runner = unittest.TextTestRunner(verbosity=2)
+    runner.run(suite)
+
+class ModPolyTestCase(unittest.TestCase):
+    def test_create_mod_poly_instance(self):
+        # exception cases
+        self.assertRaises(TypeError, ModPoly, [1.5], 7)
+        self.assertRaises(TypeError, ModPoly, [1], 7.0)
+        self.assertRaises(ValueError, ModPoly, [1], 0)
+        self.assertRaises(ValueError, ModPoly, [Mod(1, 5)], 7)
+
+        # success cases
+        poly = ModPoly([8, Mod(3, 7), 0, 14], 7)
+        self.assertEqual(poly.coefficients, [1, 3])
+        self.assertEqual(poly.degree, 1)
+        self.assertEqual(poly.modulus, 7)
+        self.assertEqual(poly[1], Mod(3, 7))
+        self.assertEqual(poly[5], Mod(0, 7))
+        self.assertEqual(ModPoly([7], 7).degree, -1)
+        self.assertEqual(repr(poly), 'ModPoly(coefficients=[1, 3], modulus=7)')
+
+    def test_arithmetic(self):
+        p = ModPoly([1, 2, 3], 7)
+        q = ModPoly([6, 5], 7)
+        self.assertEqual(p + q, ModPoly([0, 0, 3], 7))
+        self.assertEqual(p - p, 0)
+        self.assertEqual(1 - p, ModPoly([0, -2, -3], 7))
+        self.assertEqual(p + Mod(6, 7), ModPoly([0, 2, 3], 7))
+        self.assertEqual(-q, ModPoly([1, 2], 7))
+        self.assertEqual(p * q, ModPoly([6, 17, 28, 15], 7))
+        self.assertEqual(2 * p, ModPoly([2, 4, 6], 7))
+        self.assertEqual(q ** 3, q * q * q)
+        self.assertEqual(q ** 0, 1)
+        self.assertEqual(hash(p), hash(ModPoly([8, 9, 10], 7)))
+
+        # exception cases
+        self.assertRaises(ValueError, lambda: p + ModPoly([1], 5))
+        self.assertRaises(TypeError, lambda: p * 1.5)
+        self.assertRaises(ValueError, lambda: q ** -1)
+
+    def test_divmod(self):
+        p = ModPoly([1, 2, 3, 4, 5], 7)
+        q = ModPoly([3, 0, 2], 7)
+        quotient, remainder = divmod(p, q)
+        self.assertEqual(quotient * q + remainder, p)
+        self.assertTrue(remainder.degree < q.degree)
+        self.assertEqual(p // q, quotient)
+        self.assertEqual(p % q, remainder)
+        self.assertEqual(divmod(q, p), (0, q))
+        self.assertEqual(p // 3, p * Mod(3, 7).inverse())
+
+        # exception cases
+        self.assertRaises(ZeroDivisionError, divmod, p, 0)
+        self.assertRaises(ValueError, divmod, ModPoly([1, 2, 3], 12), ModPoly([1, 2], 12))
+
+    def test_multiplication_algorithms(self):
+        rng = random.Random(0)
+        for modulus in (998244353, 2 ** 61 - 1, 12):
+            for size in (1, 17, 100):
+                a = [rng.randrange(modulus) for _ in range(size)]
+                b = [rng.randrange(modulus) for _ in range(size + 3)]
+                expected = multiply(a, b, modulus, 'schoolbook')
+                self.assertEqual(multiply(a, b, modulus, 'kronecker'), expected)
+                self.assertEqual(multiply(a, a, modulus, 'kronecker'), multiply(a, a, modulus, 'schoolbook'))
+                if ntt_root(modulus):
+                    self.assertEqual(multiply(a, b, modulus, 'ntt'), expected)
+                    self.assertEqual(multiply(a, a, modulus, 'ntt'), multiply(a, a, modulus, 'schoolbook'))
+
+        # automatic choice of the NTT above the threshold
+        threshold = mod_poly.NTT_MIN_LENGTH
+        mod_poly.NTT_MIN_LENGTH = 64
+        try:
+            p = ModPoly([rng.randrange(998244353) for _ in range(40)], 998244353)
+            self.assertEqual((p * p).coefficients, multiply(p.coefficients, p.coefficients, 998244353, 'schoolbook'))
+        finally:
+            mod_poly.NTT_MIN_LENGTH = threshold
+
+        self.assertEqual(ntt_root(998244353)[0], 23)
+        self.assertIsNone(ntt_root(2 ** 61 - 1))
+        self.assertIsNone(ntt_root(12))
+        self.assertRaises(ValueError, multiply, [1], [1], 12, 'ntt')
+        self.assertRaises(ValueError, multiply, [1], [1], 12, 'fft')
+
+    def test_evaluate(self):
+        p = ModPoly([1, 2, 3], 101)
+        self.assertEqual(p(2), Mod(17, 101))
+        self.assertEqual(p.evaluate(Mod(10, 101)), Mod(321, 101))
+        self.assertEqual(ModPoly([], 101)(5), Mod(0, 101))
+        values = p.evaluate_many(range(200))
+        self.assertEqual(values.tolist(), [(1 + 2 * x + 3 * x * x) % 101 for x in range(200)])
+        self.assertEqual(p.evaluate_many(ModArray([2, 10], 101)).tolist(), [17, 321 % 101])
+        self.assertRaises(ValueError, p.evaluate_many, [Mod(1, 5)])
+        self.assertRaises(ValueError, p.evaluate_many, ModArray([1], 5))
+
+run_tests(ModPolyTestCase)
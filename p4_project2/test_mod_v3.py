@@ -0,0 +1,81 @@
+import unittest
+import copy
+import pickle
+from mod_v3 import Mod, SMALL_MODULUS
+
+def run_tests(test_case_class):
+    suite = unittest.TestLoader().loadTestsFromTestCase(test_case_class)
+    runner = unittest.TextTestRunner(verbosity=2)
+    runner.run(suite)
+
+class ModV3TestCase(unittest.TestCase):
+    def test_create_mod_instance(self):
+        # exception cases
+        self.assertRaises(TypeError, Mod, 1.1, 10)
+        self.assertRaises(TypeError, Mod, 2, 'a')
+        self.assertRaises(ValueError, Mod, 2, 0)
+        self.assertRaises(ValueError, Mod, 2, -2)
+
+        # success cases
+        self.assertEqual(Mod(15, 12).value, 3)
+        self.assertEqual(Mod(15, 12).modulus, 12)
+        self.assertEqual(Mod(-1, 10**9).value, 10**9 - 1)
+
+    def test_immutable(self):
+        mod = Mod(1, 1000)
+        self.assertRaises(AttributeError, setattr, mod, 'value', 2)
+        self.assertRaises(AttributeError, setattr, mod, '_value', 2)
+        self.assertRaises(AttributeError, setattr, mod, 'other', 2)
+        self.assertRaises(AttributeError, delattr, mod, '_modulus')
+        self.assertFalse(hasattr(mod, '__dict__'))
+
+        mod1 = mod
+        mod1 += 1
+        self.assertEqual(mod, Mod(1, 1000))
+        self.assertEqual(mod1, Mod(2, 1000))
+
+        self.assertIs(copy.copy(mod), mod)
+        self.assertIs(copy.deepcopy(mod), mod)
+        self.assertEqual(pickle.loads(pickle.dumps(mod)), mod)
+        self.assertIs(pickle.loads(pickle.dumps(Mod(3, 12))), Mod(3, 12))
+
+    def test_small_modulus_cache(self):
+        self.assertIs(Mod(3, 12), Mod(15, 12))
+        self.assertIs(Mod(10, 12) + 5, Mod(3, 12))
+        self.assertIs(Mod(0, SMALL_MODULUS), Mod(SMALL_MODULUS, SMALL_MODULUS))
+        self.assertIsNot(Mod(0, SMALL_MODULUS + 1), Mod(SMALL_MODULUS + 1, SMALL_MODULUS + 1))
+        self.assertEqual(Mod(0, SMALL_MODULUS + 1), Mod(SMALL_MODULUS + 1, SMALL_MODULUS + 1))
+
+    def test_arithmetic(self):
+        for modulus in (12, 10**9 + 7):
+            a = Mod(10, modulus)
+            self.assertEqual(a + 2, Mod(12, modulus))
+            self.assertEqual(a + Mod(2, modulus), Mod(12, modulus))
+            self.assertEqual(a - 12, Mod(-2, modulus))
+            self.assertEqual(a * a, Mod(100, modulus))
+            self.assertEqual(-a, Mod(-10, modulus))
+            self.assertEqual(a ** 2, Mod(100, modulus))
+            self.assertEqual(a ** Mod(2, modulus), Mod(100, modulus))
+        self.assertEqual(Mod(2, 5) ** 5, Mod(2, 5))
+        self.assertEqual(Mod(3, 7) ** -1, Mod(5, 7))
+        self.assertEqual(Mod(3, 7) / 2, Mod(5, 7))
+        self.assertEqual(Mod(3, 7).inverse(), Mod(5, 7))
+
+        # exception cases
+        self.assertRaises(ValueError, lambda: Mod(10, 12) + Mod(10, 2))
+        self.assertRaises(ValueError, lambda: Mod(10, 12) / 4)
+        self.assertRaises(ValueError, lambda: Mod(10, 12) ** -1)
+        self.assertRaises(TypeError, lambda: Mod(10, 12) * 3.1)
+        self.assertRaises(TypeError, lambda: Mod(10, 12) - 'a')
+
+    def test_comparisons_and_hash(self):
+        self.assertEqual(Mod(10, 12), 22)
+        self.assertNotEqual(Mod(10, 12), Mod(9, 12))
+        self.assertTrue(Mod(3, 12) < Mod(5, 12))
+        self.assertTrue(Mod(30, 12) >= 5)
+        self.assertRaises(TypeError, lambda: Mod(10, 12) == 'a')
+        self.assertRaises(ValueError, lambda: Mod(3, 12) >= Mod(3, 11))
+        self.assertEqual(hash(Mod(1, 2)), hash(Mod(3, 2)))
+        self.assertEqual(int(Mod(13, 12)), 1)
+
+run_tests(ModV3TestCase)
@@ -0,0 +1,48 @@
+import unittest
+import random
+from montgomery import MontgomeryContext
+
+def run_tests(test_case_class):
+    suite = unittest.TestLoader().loadTestsFromTestCase(test_case_class)
+    runner = unittest.TextTestRunner(verbosity=2)
+    runner.run(suite)
+
+class MontgomeryContextTestCase(unittest.TestCase):
+    def test_create_context(self):
+        # exception cases
+        self.assertRaises(TypeError, MontgomeryContext, 11.0)
+        self.assertRaises(ValueError, MontgomeryContext, 12)
+        self.assertRaises(ValueError, MontgomeryContext, 1)
+        self.assertRaises(ValueError, MontgomeryContext, -11)
+
+        # success cases
+        self.assertEqual(MontgomeryContext(11).modulus, 11)
+
+    def test_montgomery_form(self):
+        rng = random.Random(0)
+        for modulus in (3, 97, 2 ** 61 - 1, 2 ** 255 - 19):
+            context = MontgomeryContext(modulus)
+            for _ in range(20):
+                a, b = rng.randrange(-modulus, 2 * modulus), rng.randrange(modulus)
+                a_m, b_m = context.to_montgomery(a), context.to_montgomery(b)
+                self.assertEqual(context.from_montgomery(a_m), a % modulus)
+                self.assertEqual(context.from_montgomery(context.mul(a_m, b_m)), a * b % modulus)
+
+    def test_pow(self):
+        rng = random.Random(1)
+        modulus = 2 ** 127 - 1
+        context = MontgomeryContext(modulus)
+        self.assertEqual(context.pow(3, 10), 3 ** 10)
+        context.precompute(3)
+        exponents = [0, 1, 15, 16, 2 ** 127 - 2] + [rng.getrandbits(127) for _ in range(50)]
+        for exponent in exponents:
+            self.assertEqual(context.pow(3, exponent), pow(3, exponent, modulus))
+        # outside the table: negative or too many bits
+        self.assertEqual(context.pow(3, -5), pow(3, -5, modulus))
+        self.assertEqual(context.pow(3, 2 ** 200 + 1), pow(3, 2 ** 200 + 1, modulus))
+        self.assertEqual(context.pow(modulus + 3, 7), pow(3, 7, modulus))
+
+        context = MontgomeryContext(9)
+        self.assertRaises(ValueError, context.pow, 3, -1)
+
+run_tests(MontgomeryContextTestCase)
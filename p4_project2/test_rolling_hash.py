@@ -0,0 +1,111 @@
+import unittest
+import io
+import os
+import random
+import tempfile
+from rolling_hash import RollingHash
+
+def run_tests(test_case_class):
+    suite = unittest.TestLoader().loadTestsFromTestCase(test_case_class)
+    runner = unittest.TextTestRunner(verbosity=2)
+    runner.run(suite)
+
+def naive_hash(data, base, modulus):
+    h = 0
+    for byte in data:
+        h = (h * base + byte) % modulus
+    return h
+
+class RollingHashTestCase(unittest.TestCase):
+    def test_create_rolling_hash_instance(self):
+        # exception cases
+        self.assertRaises(TypeError, RollingHash, 1.5)
+        self.assertRaises(ValueError, RollingHash, ())
+        self.assertRaises(ValueError, RollingHash, -7)
+        self.assertRaises(TypeError, RollingHash, 1009, 2.0)
+        self.assertRaises(ValueError, RollingHash, 1009, 1009)
+        self.assertRaises(ValueError, RollingHash, 1009, 1)
+
+        # success cases
+        self.assertEqual(RollingHash(1009, 31).moduli, (1009,))
+        self.assertEqual(RollingHash().base, 256)
+        self.assertEqual(RollingHash(1009, 31).power(3), (31 ** 3 % 1009,))
+        self.assertEqual(RollingHash((1009, 1013), 31).power(100), (pow(31, 100, 1009), pow(31, 100, 1013)))
+
+    def test_fingerprint(self):
+        data = bytes(random.Random(0).randrange(256) for _ in range(1000))
+        for moduli, base in (((1_000_000_007,), 256), ((1_000_000_007,), 131), ((2 ** 61 - 1, 1_000_000_009), 911382323)):
+            hasher = RollingHash(moduli, base)
+            expected = 0
+            for modulus in moduli:
+                expected = expected * modulus + naive_hash(data, base, modulus)
+            self.assertEqual(hasher.fingerprint(data), expected)
+            self.assertEqual(hasher.fingerprint(bytearray(data)), expected)
+            self.assertEqual(hasher.fingerprint(memoryview(data)), expected)
+        self.assertEqual(RollingHash().fingerprint(b''), 0)
+        self.assertNotEqual(RollingHash().fingerprint(b'abc'), RollingHash().fingerprint(b'abd'))
+        self.assertRaises(TypeError, RollingHash().fingerprint, 'abc')
+
+    def test_default_base_order(self):
+        # swapping two bytes k positions apart changes the hash modulo each default modulus: 256 ** k != 1 for every
+        # modulus, unlike with 2**31 - 1 where 256 has order 31
+        data = bytes(range(200)) # distinct bytes, so every swap changes the input
+        for modulus in RollingHash().moduli:
+            hasher = RollingHash(modulus)
+            for k in range(1, 129):
+                swapped = bytearray(data)
+                swapped[10], swapped[10 + k] = swapped[10 + k], swapped[10]
+                self.assertNotEqual(hasher.fingerprint(swapped), hasher.fingerprint(data))
+            # the order of 256 is exactly (modulus - 1) / 2
+            order = (modulus - 1) // 2
+            self.assertEqual(pow(256, order, modulus), 1)
+            self.assertTrue(all(pow(256, order // q, modulus) != 1 for q in self.prime_factors(order)))
+
+    @staticmethod
+    def prime_factors(n):
+        factors, d = set(), 2
+        while d * d <= n:
+            while n % d == 0:
+                factors.add(d)
+                n //= d
+            d += 1
+        if n > 1:
+            factors.add(n)
+        return factors
+
+    def test_window_and_substring_hashes(self):
+        data = b'abracadabra' * 20
+        for hasher in (RollingHash(), RollingHash(1_000_000_007, 257)):
+            self.assertEqual(hasher.window_hashes(data, 7),
+                             [hasher.fingerprint(data[i:i + 7]) for i in range(len(data) - 6)])
+            self.assertEqual(hasher.window_hashes(data, len(data)), [hasher.fingerprint(data)])
+            self.assertEqual(hasher.window_hashes(b'abc', 4), [])
+            prefixes = hasher.prefix_hashes(data)
+            self.assertEqual(hasher.substring_hash(prefixes, 3, 50), hasher.fingerprint(data[3:50]))
+            self.assertEqual(hasher.substring_hash(prefixes, 5, 5), 0)
+        self.assertRaises(ValueError, RollingHash().window_hashes, data, 0)
+
+    def test_find(self):
+        hasher = RollingHash()
+        text = b'abracadabra abracadabra'
+        self.assertEqual(hasher.find(b'abra', text), [0, 7, 12, 19])
+        self.assertEqual(hasher.find(b'cad', memoryview(text)), [4, 16])
+        self.assertEqual(hasher.find(b'xyz', text), [])
+        self.assertEqual(hasher.find(b'', b'ab'), [0, 1, 2])
+        # a tiny modulus collides all the time, the byte check keeps the results exact
+        self.assertEqual(RollingHash(257, 2).find(b'abra', text), [0, 7, 12, 19])
+
+    def test_fingerprint_file(self):
+        hasher = RollingHash()
+        data = bytes(random.Random(1).randrange(256) for _ in range(10_000))
+        expected = [(offset, hasher.fingerprint(data[offset:offset + 4096])) for offset in range(0, len(data), 4096)]
+        self.assertEqual(list(hasher.fingerprint_file(io.BytesIO(data), 4096)), expected)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'data.bin')
+            with open(path, 'wb') as f:
+                f.write(data)
+            self.assertEqual(list(hasher.fingerprint_file(path, 4096)), expected)
+        self.assertEqual(list(hasher.fingerprint_file(io.BytesIO(b''), 16)), [])
+        self.assertRaises(ValueError, list, hasher.fingerprint_file(io.BytesIO(data), 0))
+
+run_tests(RollingHashTestCase)
@@ -0,0 +1,118 @@
+"""multi-resource allocation"""
+import asyncio
+from collections.abc import Iterable, Mapping
+from contextlib import ExitStack
+
+from app.models.inventory import Resource, LOCKS, lock_stripe
+from app.utils.validators import validate_integer_arg
+
+Claims = Mapping[Resource, int] | Iterable[tuple[Resource, int]]
+
+def _merge_claims(claims: Claims) -> dict[Resource, int]:
+    """
+    Validates claims and merges the quantities of a resource listed more than once.
+
+    Args:
+        claims (Claims): Resource -> quantity, as a mapping or as (resource, quantity) pairs.
+
+    Raises:
+        TypeError: If a key is not a Resource or a quantity is not an int.
+        ValueError: If a quantity is less than 1.
+    """
+    if isinstance(claims, Mapping):
+        claims = claims.items()
+    merged = {}
+    for resource, n in claims:
+        if not isinstance(resource, Resource):
+            raise TypeError('resource must be a Resource')
+        validate_integer_arg('n', n, 1)
+        merged[resource] = merged.get(resource, 0) + n
+    return merged
+
+def _stripes(resources: Iterable[Resource]) -> list[int]:
+    # every transaction takes its locks in increasing stripe order, so two transactions cannot deadlock
+    return sorted({lock_stripe(resource) for resource in resources})
+
+def _check_claims(claims: dict[Resource, int]) -> None:
+    for resource, n in claims.items():
+        available = resource.total - resource.allocated
+        if not available:
+            raise RuntimeError(f'0 available for {resource.name}, nothing to claim')
+        validate_integer_arg('n', n, 1, available)
+
+def _check_frees(frees: dict[Resource, int]) -> None:
+    for resource, n in frees.items():
+        if resource.allocated == 0:
+            raise RuntimeError(f'0 allocated for {resource.name}, nothing to free')
+        validate_integer_arg('n', n, 1, resource.allocated)
+
+def _apply(claims: dict[Resource, int], check, operation: str) -> None:
+    # called with every lock held: nothing can change between the check and the updates, and once the check passed
+    # no update can fail, so the transaction is all-or-nothing
+    check(claims)
+    for resource, n in claims.items():
+        getattr(resource, operation)(n)
+
+def _transaction(claims: Claims, check, operation: str) -> None:
+    claims = _merge_claims(claims)
+    with ExitStack() as stack:
+        for stripe in _stripes(claims):
+            stack.enter_context(LOCKS[stripe])
+        _apply(claims, check, operation)
+
+def claim_all(claims: Claims) -> None:
+    """
+    Claims quantities of several resources atomically: either every claim succeeds or none is made.
+
+    Args:
+        claims (Claims): Resource -> quantity, as a mapping or as (resource, quantity) pairs.
+
+    Raises:
+        TypeError: If a key is not a Resource or a quantity is not an int.
+        ValueError: If a quantity is less than 1 or greater than what is available.
+        RuntimeError: If a resource has 0 available.
+
+    Example:
+        claim_all({cpu: 2, ssd: 4})
+        # Claims 2 CPUs and 4 SSDs, or raises and claims nothing.
+    """
+    _transaction(claims, _check_claims, 'claim')
+
+def free_all(claims: Claims) -> None:
+    """
+    Frees up quantities of several resources atomically, typically the claims of a claim_all.
+
+    Raises:
+        TypeError: If a key is not a Resource or a quantity is not an int.
+        ValueError: If a quantity is less than 1 or greater than what is allocated.
+        RuntimeError: If a resource has 0 allocated.
+    """
+    _transaction(claims, _check_frees, 'free_up')
+
+async def claim_all_async(claims: Claims, retry_delay: float=0.001) -> None:
+    """
+    Asyncio variant of claim_all that never blocks the event loop.
+
+    The locks are tried without blocking; when one is held (by another thread), the ones already taken are released
+    and the coroutine sleeps retry_delay seconds before trying again. The locks are the ones of claim_all and of
+    the Resource methods, so threads and coroutines can allocate the same resources.
+
+    Args:
+        claims (Claims): Resource -> quantity, as a mapping or as (resource, quantity) pairs.
+        retry_delay (float, optional): Seconds to wait between attempts. Defaults to 0.001.
+
+    Raises:
+        Same as claim_all.
+    """
+    claims = _merge_claims(claims)
+    stripes = _stripes(claims)
+    while True:
+        with ExitStack() as stack:
+            for stripe in stripes:
+                if not LOCKS[stripe].acquire(blocking=False):
+                    break
+                stack.callback(LOCKS[stripe].release)
+            else:
+                _apply(claims, _check_claims, 'claim')
+                return
+        await asyncio.sleep(retry_delay)
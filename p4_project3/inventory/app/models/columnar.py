@@ -0,0 +1,317 @@
+"""columnar resource store"""
+from array import array
+import sys
+from typing import Iterator, NamedTuple
+
+from app.models.inventory import CPU, HDD, SSD, Resource, Storage, get_lock
+from app.utils.validators import validate_integer_arg
+
+class Field(NamedTuple):
+    """Constructor argument of a resource class and the rule its value must follow."""
+    name: str
+    type: type
+    min: int = None
+    max: int = None
+    allowed: tuple = None
+
+
+# int columns are array('q'): an int field accepts what its setter accepts, within the range of a signed 64-bit int
+INT64_MIN = -2 ** 63
+INT64_MAX = 2 ** 63 - 1
+
+# the constructor arguments of every resource class in order, with the rules of its setters
+_RESOURCE_FIELDS = (Field('name', str), Field('manufacturer', str), Field('total', int, 0), Field('allocated', int, 0))
+_STORAGE_FIELDS = _RESOURCE_FIELDS + (Field('capacity_GB', int, 1),)
+FIELDS = {
+    Resource: _RESOURCE_FIELDS,
+    CPU: _RESOURCE_FIELDS + (Field('cores', int, 1), Field('socket', str), Field('power_watts', int, 1)),
+    Storage: _STORAGE_FIELDS,
+    HDD: _STORAGE_FIELDS + (Field('size', str, allowed=('2.5"', '3.5"')), Field('rpm', int, 1000, 50000)),
+    SSD: _STORAGE_FIELDS + (Field('interface', str),),
+}
+
+def int_range(field: Field) -> tuple[int, int]:
+    """Returns the (min, max) values of an int field, the rule of its setter bounded to a signed 64-bit int."""
+    return (INT64_MIN if field.min is None else field.min), (INT64_MAX if field.max is None else field.max)
+
+def validate_field(field: Field, value) -> None:
+    """
+    Validates a value against the rule of a field, with the errors of the resource setters.
+
+    Raises:
+        TypeError: If the value is not of the field type.
+        ValueError: If the value is out of range (see int_range) or not allowed.
+    """
+    if field.type is int:
+        validate_integer_arg(field.name, value, *int_range(field))
+    elif not isinstance(value, str):
+        raise TypeError(f'{field.name} must be a str')
+    elif field.allowed is not None and value not in field.allowed:
+        raise ValueError(f'{field.name} must be one of {field.allowed}')
+
+
+class StringTable:
+    """
+    Represents a table of interned strings: every distinct string is stored once and referred to by its index.
+
+    Methods:
+        intern(value: str) -> int:
+            Returns the index of value, adding it to the table if it is new.
+    """
+
+    __slots__ = '_strings', '_indexes'
+
+    def __init__(self) -> None:
+        self._strings = []
+        self._indexes = {}
+
+    def __len__(self) -> int:
+        return len(self._strings)
+
+    def __getitem__(self, index: int) -> str:
+        return self._strings[index]
+
+    def intern(self, value: str) -> int:
+        index = self._indexes.get(value)
+        if index is None:
+            index = self._indexes[value] = len(self._strings)
+            self._strings.append(value)
+        return index
+
+
+class ColumnStore:
+    """
+    Represents a struct-of-arrays store of resources of one class: one column per constructor argument instead of
+    one object per resource.
+
+    Attributes:
+        INTERNED (tuple): The str fields stored as indexes into a StringTable, the values that repeat.
+        _resource_class (type): The class of the stored resources.
+        _fields (tuple): The fields of the class, see FIELDS.
+        _columns (dict): field name -> array('q') for int fields, array('I') of StringTable indexes for interned
+            str fields, list for the other str fields (the names, which rarely repeat).
+        _tables (dict): field name -> StringTable, for interned fields.
+
+    Methods:
+        append(*args, **kwargs) -> ResourceRow:
+            Validates and appends a resource, with the arguments of the resource class.
+        from_resources(resources: Iterable) -> ColumnStore:
+            Returns a store with the values of resource objects.
+        to_resource(index: int) -> Resource:
+            Returns a resource object with the values of a row.
+        column(name: str) -> list:
+            Returns the values of a column.
+        nbytes() -> int:
+            Returns the memory used by the columns and string tables (sys.getsizeof of their objects).
+
+    Note:
+        - Rows are returned as ResourceRow views, created on demand, with the properties, the setters and the claim,
+          free_up, remove_died and add_purchased methods of the resource class.
+        - Int values must fit in a signed 64-bit int, larger ones are rejected with a ValueError.
+        - A row is validated as a whole before any column is written, so the columns stay aligned.
+    """
+
+    INTERNED = ('manufacturer', 'socket', 'interface', 'size')
+
+    def __init__(self, resource_class: type=Resource) -> None:
+        if resource_class not in FIELDS:
+            raise ValueError(f'resource_class must be one of {tuple(cls.__name__ for cls in FIELDS)}')
+        self._resource_class = resource_class
+        self._fields = FIELDS[resource_class]
+        self._columns = {}
+        self._tables = {}
+        for field in self._fields:
+            if field.type is int:
+                self._columns[field.name] = array('q')
+            elif field.name in self.INTERNED:
+                self._columns[field.name] = array('I')
+                self._tables[field.name] = StringTable()
+            else:
+                self._columns[field.name] = []
+        self._row_class = ROW_CLASSES[resource_class]
+
+    @classmethod
+    def from_resources(cls, resources, resource_class: type=None) -> 'ColumnStore':
+        resources = list(resources)
+        if resource_class is None:
+            resource_class = type(resources[0]) if resources else Resource
+        store = cls(resource_class)
+        int_fields = [field for field in store._fields if field.type is int]
+        for resource in resources:
+            if type(resource) is not resource_class:
+                raise TypeError(f'resources must be of {resource_class.__name__} type')
+            # the values of a resource object are valid, only the int64 range of the columns remains to check
+            for field in int_fields:
+                validate_field(field, getattr(resource, field.name))
+            store._append([getattr(resource, field.name) for field in store._fields])
+        return store
+
+    @property
+    def resource_class(self) -> type:
+        return self._resource_class
+
+    def __len__(self) -> int:
+        return len(self._columns['total'])
+
+    def __getitem__(self, index: int) -> 'ResourceRow':
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('row index out of range')
+        return self._row_class(self, index)
+
+    def __iter__(self) -> Iterator['ResourceRow']:
+        return (self._row_class(self, index) for index in range(len(self)))
+
+    def append(self, *args, **kwargs) -> 'ResourceRow':
+        names = [field.name for field in self._fields]
+        if len(args) > len(names):
+            raise TypeError(f'at most {len(names)} values expected')
+        values = dict(zip(names, args))
+        for name, value in kwargs.items():
+            if name not in names:
+                raise TypeError(f'unexpected field {name!r}')
+            if name in values:
+                raise TypeError(f'multiple values for field {name!r}')
+            values[name] = value
+        missing = [name for name in names if name not in values]
+        if missing:
+            raise TypeError(f'missing fields: {", ".join(missing)}')
+        for field in self._fields:
+            validate_field(field, values[field.name])
+        validate_integer_arg('allocated', values['allocated'], 0, values['total'])
+        self._append([values[name] for name in names])
+        return self._row_class(self, len(self) - 1)
+
+    def _convert(self, name: str, value):
+        # value as stored in the column of name
+        table = self._tables.get(name)
+        return value if table is None else table.intern(value)
+
+    def _append(self, values: list) -> None:
+        # values must be valid and in field order; the whole row is converted before any column is written
+        cells = [self._convert(field.name, value) for field, value in zip(self._fields, values)]
+        for field, cell in zip(self._fields, cells):
+            self._columns[field.name].append(cell)
+
+    def _extend(self, columns: list[list]) -> None:
+        # columns of valid values in field order, appended a whole column at a time; every column is converted
+        # (to an array for the array columns) before any is extended
+        converted = []
+        for field, values in zip(self._fields, columns):
+            column = self._columns[field.name]
+            table = self._tables.get(field.name)
+            if table is not None:
+                values = map(table.intern, values)
+            converted.append(array(column.typecode, values) if isinstance(column, array) else values)
+        for field, values in zip(self._fields, converted):
+            self._columns[field.name].extend(values)
+
+    def _get(self, name: str, index: int):
+        value = self._columns[name][index]
+        table = self._tables.get(name)
+        return value if table is None else table[value]
+
+    def _set(self, field: Field, index: int, value) -> None:
+        validate_field(field, value)
+        with get_lock(self):
+            self._columns[field.name][index] = self._convert(field.name, value)
+
+    def column(self, name: str) -> list:
+        column = self._columns[name]
+        table = self._tables.get(name)
+        return list(column) if table is None else [table[value] for value in column]
+
+    def to_resource(self, index: int) -> Resource:
+        return self._resource_class(*(self._get(field.name, index) for field in self._fields))
+
+    def nbytes(self) -> int:
+        total = 0
+        for column in self._columns.values():
+            total += sys.getsizeof(column)
+            if isinstance(column, list):
+                total += sum(sys.getsizeof(value) for value in column)
+        for table in self._tables.values():
+            total += sys.getsizeof(table._strings) + sys.getsizeof(table._indexes)
+            total += sum(sys.getsizeof(value) for value in table._strings)
+        return total
+
+
+class ResourceRow:
+    """
+    Represents a view of one row of a ColumnStore, read and updated in the store columns.
+
+    Note:
+        - name, manufacturer, total and allocated are read-only, like in the resource classes; the fields of the
+          subclasses (cores, socket, capacity_GB...) have setters, with the rules and errors of the class setters.
+
+    Methods:
+        claim(n: int) -> None, free_up(n: int) -> None, remove_died(n: int) -> None, add_purchased(n: int) -> None:
+            Same as the Resource methods, under the lock of the store.
+        category() -> str:
+            Returns the category of the resource class.
+    """
+
+    __slots__ = '_store', '_index'
+
+    def __init__(self, store: ColumnStore, index: int) -> None:
+        self._store = store
+        self._index = index
+
+    def __str__(self) -> str:
+        return self.name
+
+    def __repr__(self) -> str:
+        values = ', '.join(f'{field.name}={self._store._get(field.name, self._index)}' for field in self._store._fields)
+        return f'{self.__class__.__name__}({values})'
+
+    def category(self) -> str:
+        return self._store.resource_class.__name__.lower()
+
+    def claim(self, n: int) -> None:
+        allocated = self._store._columns['allocated']
+        with get_lock(self._store):
+            available = self._store._columns['total'][self._index] - allocated[self._index]
+            if not available:
+                raise RuntimeError('0 available, nothing to claim')
+            validate_integer_arg('n', n, 1, available)
+            allocated[self._index] += n
+
+    def free_up(self, n: int) -> None:
+        allocated = self._store._columns['allocated']
+        with get_lock(self._store):
+            if allocated[self._index] == 0:
+                raise RuntimeError('0 allocated, nothing to free')
+            validate_integer_arg('n', n, 1, allocated[self._index])
+            allocated[self._index] -= n
+
+    def remove_died(self, n: int) -> None:
+        allocated = self._store._columns['allocated']
+        with get_lock(self._store):
+            if allocated[self._index] == 0:
+                raise RuntimeError('0 allocated, nothing to remove')
+            validate_integer_arg('n', n, 1, allocated[self._index])
+            allocated[self._index] -= n
+            self._store._columns['total'][self._index] -= n
+
+    def add_purchased(self, n: int) -> None:
+        total = self._store._columns['total']
+        with get_lock(self._store):
+            validate_integer_arg('n', n, 1, INT64_MAX - total[self._index])
+            total[self._index] += n
+
+
+def _row_property(field: Field) -> property:
+    name = field.name
+    getter = lambda row: row._store._get(name, row._index)
+    if field in _RESOURCE_FIELDS: # no setter in Resource either
+        return property(getter)
+    return property(getter, lambda row, value: row._store._set(field, row._index, value))
+
+def _row_class(resource_class: type) -> type:
+    # ResourceRow subclass with one property per field of the resource class, read-only for the Resource fields
+    namespace = {field.name: _row_property(field) for field in FIELDS[resource_class]}
+    namespace['__slots__'] = ()
+    return type(f'{resource_class.__name__}Row', (ResourceRow,), namespace)
+
+ROW_CLASSES = {resource_class: _row_class(resource_class) for resource_class in FIELDS}
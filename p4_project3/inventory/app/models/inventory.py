@@ -1,6 +1,23 @@
 """total models"""
+from collections import deque
+from collections.abc import Callable
+from itertools import repeat
+from threading import RLock
+
 from app.utils.validators import validate_integer_arg
 
+# the quantities of a resource are guarded by one of LOCK_STRIPES shared reentrant locks, chosen from its id, so
+# resources carry no lock of their own; multi-resource transactions take the stripes in index order (see allocation)
+LOCK_STRIPES = 64
+LOCKS = tuple(RLock() for _ in range(LOCK_STRIPES))
+
+def lock_stripe(resource: object) -> int:
+    # ids are aligned to 16 bytes, drop the low bits that never vary
+    return (id(resource) >> 4) % LOCK_STRIPES
+
+def get_lock(resource: object) -> RLock:
+    return LOCKS[lock_stripe(resource)]
+
 class Resource:
     """
     Represents a base class for resources with attributes such as name, manufacturer, total quantity, and allocated quantity.
@@ -23,6 +40,10 @@ class Resource:
             Adds 'n' units to the total quantity of the resource.
         category() -> str:
             Returns the lowercase class name (category) of the resource.
+        add_observer(observer: Callable) -> None:
+            Registers 'observer(resource, attribute_name, old_value, new_value)', called after every attribute change.
+        remove_observer(observer: Callable) -> None:
+            Unregisters an observer added with add_observer.
 
     Properties:
         name (str): The name of the resource.
@@ -38,29 +59,66 @@ class Resource:
 
     Note:
         - The '_set_str_attribute' and '_set_int_attribute' methods are used internally for attribute validation.
+        - '_from_validated' builds resources from already validated values without the setters (see loader).
         - 'validate_integer_arg' is a util function for integer validation.
+        - Every attribute change goes through '_set_attribute', which notifies the observers.
+        - 'claim', 'free_up', 'remove_died' and 'add_purchased' hold the lock of the resource ('get_lock'), so the
+          check and the update cannot interleave with another thread.
     """
 
-    __slots__ = '_name', '_manufacturer', '_total', '_allocated', '_variables'
+    __slots__ = '_name', '_manufacturer', '_total', '_allocated', '_variables', '_observers'
 
     def __init__(self, name: str, manufacturer: str, total: int, allocated: int) -> None:
+        self._observers = ()
         self._set_str_attribute('_name', name)
         self._set_str_attribute('_manufacturer', manufacturer)
         self._set_int_attribute('_total', total, 0)
         self._set_int_attribute('_allocated', allocated, 0, self._total)
         self._variables = list(locals())[1:]
 
+    @classmethod
+    def _from_validated(cls, argument_names: list[str], columns: list[list]) -> list['Resource']:
+        # fast path for bulk loads: builds one resource per row of the columns of constructor arguments (in
+        # argument_names order) by writing the slots directly, a whole column at a time; the values must already
+        # satisfy the rules of the setters; the _variables list is shared, __repr__ only reads it
+        count = len(columns[0]) if columns else 0
+        resources = list(map(cls.__new__, repeat(cls, count)))
+        for name, column in zip(argument_names, columns):
+            deque(map(getattr(cls, f'_{name}').__set__, resources, column), 0)
+        variables = ['name', 'manufacturer', 'total', 'allocated']
+        for name, value in (('_observers', ()), ('_variables', variables)):
+            deque(map(getattr(cls, name).__set__, resources, repeat(value)), 0)
+        return resources
+
     def _set_str_attribute(self, attribute_name: str, value: str, allowed: list | tuple=None) -> None:
         if isinstance(value, str):
             if allowed is not None and value not in allowed:
                 raise ValueError(f'{attribute_name.removeprefix('_')} must be one of {allowed}')
-            setattr(self, attribute_name, value)
+            self._set_attribute(attribute_name, value)
         else:
             raise TypeError(f'{attribute_name.removeprefix('_')} must be a str')
 
     def _set_int_attribute(self, attribute_name: str, value: int, min: int=None, max: int=None) -> None:
         validate_integer_arg(attribute_name.removeprefix('_'), value, min, max)
+        self._set_attribute(attribute_name, value)
+
+    def _set_attribute(self, attribute_name: str, value) -> None:
+        observers = self._observers
+        if not observers:
+            setattr(self, attribute_name, value)
+            return
+        old_value = getattr(self, attribute_name, None)
         setattr(self, attribute_name, value)
+        for observer in observers:
+            observer(self, attribute_name, old_value, value)
+
+    def add_observer(self, observer: Callable) -> None:
+        self._observers += (observer,)
+
+    def remove_observer(self, observer: Callable) -> None:
+        observers = list(self._observers)
+        observers.remove(observer)
+        self._observers = tuple(observers)
         
     @property
     def name(self) -> str:
@@ -86,28 +144,32 @@ class Resource:
         return f'{self.__class__.__name__}({', '.join(attributes)})'
     
     def claim(self, n: int) -> None:
-        available = self._total - self._allocated
-        if not available:
-            raise RuntimeError('0 available, nothing to claim')
-        validate_integer_arg('n', n, 1, available)
-        self._allocated += n
+        with get_lock(self):
+            available = self._total - self._allocated
+            if not available:
+                raise RuntimeError('0 available, nothing to claim')
+            validate_integer_arg('n', n, 1, available)
+            self._set_attribute('_allocated', self._allocated + n)
     
     def free_up(self, n: int) -> None:
-        if self._allocated == 0:
-            raise RuntimeError('0 allocated, nothing to free')
-        validate_integer_arg('n', n, 1, self._allocated)
-        self._allocated -= n
+        with get_lock(self):
+            if self._allocated == 0:
+                raise RuntimeError('0 allocated, nothing to free')
+            validate_integer_arg('n', n, 1, self._allocated)
+            self._set_attribute('_allocated', self._allocated - n)
         
     def remove_died(self, n: int) -> None:
-        if self._allocated == 0:
-            raise RuntimeError('0 allocated, nothing to remove')
-        validate_integer_arg('n', n, 1, self._allocated)
-        self._allocated -= n
-        self._total -= n
+        with get_lock(self):
+            if self._allocated == 0:
+                raise RuntimeError('0 allocated, nothing to remove')
+            validate_integer_arg('n', n, 1, self._allocated)
+            self._set_attribute('_allocated', self._allocated - n)
+            self._set_attribute('_total', self._total - n)
 
     def add_purchased(self, n: int) -> None:
         validate_integer_arg('n', n, 1)
-        self._total += n
+        with get_lock(self):
+            self._set_attribute('_total', self._total + n)
         
     def category(self) -> str:
         return self.__class__.__name__.lower()
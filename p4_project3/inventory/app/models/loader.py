@@ -0,0 +1,197 @@
+"""bulk inventory loader"""
+import csv
+import json
+import re
+from collections.abc import Iterator
+from itertools import count, islice
+from operator import itemgetter
+from typing import NamedTuple, TextIO
+
+from app.models.columnar import FIELDS, ColumnStore, Field, int_range, validate_field
+from app.models.inventory import Resource
+from app.utils.validators import validate_integer_arg
+
+BATCH_SIZE = 10_000
+FORMATS = ('csv', 'jsonl')
+_INT_PATTERN = re.compile(r'[+-]?[0-9]+')
+
+class RowError(NamedTuple):
+    """An invalid value of a loaded row, line is the line number in the source."""
+    line: int
+    field: str | None
+    message: str
+
+
+class LoadResult(NamedTuple):
+    """The resources built from the valid rows, and the errors of the invalid ones."""
+    resources: list[Resource] | ColumnStore
+    errors: list[RowError]
+
+
+def load_resources(source: str | TextIO, resource_class: type, format: str=None,
+                   batch_size: int=BATCH_SIZE) -> LoadResult:
+    """
+    Loads resources of one class from a CSV file (with a header row) or a JSON lines file, in a single streaming pass.
+
+    Rows are read batch_size at a time and every column of a batch is validated at once against the rules of the
+    resource class setters, with ints bounded to the 64-bit range of a ColumnStore (see columnar.int_range). Every
+    invalid row is reported, with all its errors; valid rows are built without going through the setters again.
+
+    Args:
+        source (str | TextIO): A path, or an open text file.
+        resource_class (type): Resource, CPU, Storage, HDD or SSD.
+        format (str, optional): 'csv' or 'jsonl', from the path suffix if None. Defaults to None.
+        batch_size (int, optional): Rows validated together. Defaults to BATCH_SIZE.
+
+    Returns:
+        LoadResult: The resources of the valid rows, in source order, and the row errors.
+
+    Raises:
+        ValueError: If the format is unknown or the CSV header lacks, adds or repeats columns.
+
+    Example:
+        resources, errors = load_resources('hdds.csv', HDD)
+    """
+    resources = []
+    errors = []
+    names = [field.name for field in FIELDS[resource_class]]
+    for columns in _valid_batches(source, resource_class, format, batch_size, errors):
+        resources.extend(resource_class._from_validated(names, columns))
+    errors.sort(key=lambda error: error.line)
+    return LoadResult(resources, errors)
+
+
+def load_store(source: str | TextIO, resource_class: type, format: str=None,
+               batch_size: int=BATCH_SIZE) -> LoadResult:
+    """
+    Same as load_resources, into a ColumnStore instead of resource objects.
+    """
+    store = ColumnStore(resource_class)
+    errors = []
+    for columns in _valid_batches(source, resource_class, format, batch_size, errors):
+        store._extend(columns)
+    errors.sort(key=lambda error: error.line)
+    return LoadResult(store, errors)
+
+
+def _valid_batches(source: str | TextIO, resource_class: type, format: str, batch_size: int,
+                   errors: list[RowError]) -> Iterator[list[list]]:
+    # batches of the valid rows as columns (in field order), the errors of the invalid rows are appended to errors
+    if resource_class not in FIELDS:
+        raise ValueError(f'resource_class must be one of {tuple(cls.__name__ for cls in FIELDS)}')
+    validate_integer_arg('batch_size', batch_size, 1)
+    if format is None:
+        format = str(source).rsplit('.', 1)[-1].lower() if isinstance(source, str) else None
+    if format not in FORMATS:
+        raise ValueError(f'format must be one of {FORMATS}')
+    fields = FIELDS[resource_class]
+    if isinstance(source, str):
+        with open(source, newline='', encoding='utf-8') as f:
+            yield from _valid_batches(f, resource_class, format, batch_size, errors)
+        return
+    read = _read_csv if format == 'csv' else _read_jsonl
+    records = read(source, fields, errors)
+    while batch := list(islice(records, batch_size)):
+        yield _validate_batch(batch, fields, format == 'csv', errors)
+
+
+def _read_csv(file: TextIO, fields: tuple[Field, ...], errors: list[RowError]) -> Iterator[tuple[int, tuple]]:
+    # (line, values in field order), the values are the strings of the file
+    reader = csv.reader(file)
+    header = next(reader, None)
+    if header is None:
+        return
+    names = [field.name for field in fields]
+    missing = [name for name in names if name not in header]
+    unexpected = [name for name in header if name not in names]
+    repeated = sorted({name for name in header if header.count(name) > 1})
+    if missing or unexpected or repeated:
+        raise ValueError(f'the CSV header should have the columns {names}, '
+                         f'missing: {missing}, unexpected: {unexpected}, repeated: {repeated}')
+    select = itemgetter(*(header.index(name) for name in names))
+    size = len(header)
+    for row in reader:
+        if len(row) == size:
+            yield reader.line_num, select(row)
+        elif row:
+            errors.append(RowError(reader.line_num, None, f'expected {size} columns, found {len(row)}'))
+
+
+def _read_jsonl(file: TextIO, fields: tuple[Field, ...], errors: list[RowError]) -> Iterator[tuple[int, list]]:
+    # (line, values in field order), lines that are not an object with exactly the fields are reported here
+    names = [field.name for field in fields]
+    for line, text in enumerate(file, 1):
+        if not text.strip():
+            continue
+        try:
+            record = json.loads(text)
+        except json.JSONDecodeError as e:
+            errors.append(RowError(line, None, f'invalid JSON: {e}'))
+            continue
+        if not isinstance(record, dict):
+            errors.append(RowError(line, None, 'a line must be a JSON object'))
+            continue
+        missing = [name for name in names if name not in record]
+        unexpected = [name for name in record if name not in names]
+        if missing or unexpected:
+            for name in missing:
+                errors.append(RowError(line, name, f'{name} is missing'))
+            for name in unexpected:
+                errors.append(RowError(line, name, f'unexpected field {name}'))
+            continue
+        yield line, [record[name] for name in names]
+
+
+def _validate_batch(batch: list[tuple[int, list]], fields: tuple[Field, ...], from_text: bool,
+                    errors: list[RowError]) -> list[list]:
+    # validates the batch column by column, -> the columns of the valid rows; a cheap test flags the suspicious
+    # values of a whole column, only those go through validate_field, for the exact error of the setters
+    invalid = {}
+    lines, rows = zip(*batch)
+    columns = [list(column) for column in zip(*rows)]
+    for field, column in zip(fields, columns):
+        if field.type is int and from_text:
+            _parse_int_column(column)
+        for index in _flag_column(field, column):
+            try:
+                validate_field(field, column[index])
+            except (TypeError, ValueError) as e:
+                invalid.setdefault(lines[index], []).append(RowError(lines[index], field.name, str(e)))
+    # the one rule across columns, checked where both values are valid ints; total and allocated are the third and
+    # fourth fields of every resource class
+    totals, allocations = columns[2], columns[3]
+    try:
+        over = [index for index, total, allocated in zip(count(), totals, allocations) if allocated > total]
+    except TypeError: # a total or allocated that is not an int, already reported
+        over = [index for index, total, allocated in zip(count(), totals, allocations)
+                if isinstance(total, int) and isinstance(allocated, int) and allocated > total]
+    for index in over:
+        line_errors = invalid.get(lines[index], ())
+        if not any(error.field in ('total', 'allocated') for error in line_errors):
+            invalid.setdefault(lines[index], []).append(
+                RowError(lines[index], 'allocated', f'allocated cannot be greater than {totals[index]}'))
+    for line_errors in invalid.values():
+        errors.extend(line_errors)
+    if not invalid:
+        return columns
+    valid = [index for index, line in enumerate(lines) if line not in invalid]
+    return [[column[index] for index in valid] for column in columns]
+
+
+def _parse_int_column(column: list) -> None:
+    # CSV values are strings, converted in place; only an optional sign and ASCII digits make an int (int() alone
+    # also takes surrounding spaces, underscores and non-ASCII digits), the rest are left as strings, validate_field
+    # reports them
+    match = _INT_PATTERN.fullmatch
+    column[:] = [int(value) if match(value) else value for value in column]
+
+
+def _flag_column(field: Field, column: list) -> list[int]:
+    # indexes of the values that may break the rule of field, a superset of the invalid ones
+    if field.type is int:
+        low, high = int_range(field)
+        return [index for index, value in enumerate(column) if type(value) is not int or not low <= value <= high]
+    if field.allowed is not None:
+        allowed = set(field.allowed)
+        return [index for index, value in enumerate(column) if type(value) is not str or value not in allowed]
+    return [index for index, value in enumerate(column) if type(value) is not str]
@@ -0,0 +1,211 @@
+"""inventory registry"""
+from bisect import bisect_left, insort
+from heapq import merge
+from itertools import islice
+from threading import Lock
+from typing import Iterator, NamedTuple
+
+from app.models.inventory import Resource, Storage, get_lock
+
+class Totals(NamedTuple):
+    """Aggregate quantities of a group of resources."""
+    total: int
+    allocated: int
+
+    @property
+    def available(self) -> int:
+        return self.total - self.allocated
+
+
+class InventoryRegistry:
+    """
+    Represents a container of resources, indexed for O(1) lookups and kept up to date as the resources change.
+
+    Attributes:
+        INDEXED_ATTRIBUTES (tuple): The attributes with a value -> resources index. Resources without the
+            attribute (e.g. 'socket' for an SSD) are not in its index.
+        _resources (dict): The resources by name, names are unique.
+        _indexes (dict): attribute -> value -> {name: resource}, 'category' included.
+        _totals (dict): category -> [total, allocated], updated incrementally.
+        _capacities (dict): category -> sorted list of (capacity_GB, name), for Storage resources.
+
+    Methods:
+        add(resource: Resource) -> None:
+            Adds a resource. Raises an error if the name is already registered.
+        remove(name: str) -> Resource:
+            Removes and returns the resource with this name. Raises KeyError if there is none.
+        get(name: str) -> Resource:
+            Returns the resource with this name. Raises KeyError if there is none.
+        find(**attributes) -> list[Resource]:
+            Returns the resources matching every given indexed attribute value.
+        totals(category: str=None) -> Totals:
+            Returns the total and allocated quantities of a category, or of every resource.
+        with_capacity(min_capacity_GB: int, max_capacity_GB: int=None, category: str=None,
+                      min_available: int=1) -> list[Resource]:
+            Returns storage resources within a capacity range, by increasing capacity.
+
+    Note:
+        - The registry observes its resources (Resource.add_observer), so 'claim', 'free_up', 'remove_died',
+          'add_purchased' and the attribute setters keep the indexes and totals current without scanning.
+        - Resource names cannot change, so they are used as keys.
+        - Updates hold the registry lock, taken after the lock of the resource, so resources of one category can
+          change from several threads; find, totals and with_capacity read the indexes under the registry lock.
+    """
+
+    INDEXED_ATTRIBUTES = ('category', 'manufacturer', 'socket', 'interface', 'size')
+
+    def __init__(self, resources: list[Resource]=()) -> None:
+        self._resources = {}
+        self._indexes = {attribute: {} for attribute in self.INDEXED_ATTRIBUTES}
+        self._totals = {}
+        self._capacities = {}
+        self._lock = Lock()
+        for resource in resources:
+            self.add(resource)
+
+    def __len__(self) -> int:
+        return len(self._resources)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._resources
+
+    def __iter__(self) -> Iterator[Resource]:
+        return iter(self._resources.values())
+
+    def get(self, name: str) -> Resource:
+        return self._resources[name]
+
+    def add(self, resource: Resource) -> None:
+        if not isinstance(resource, Resource):
+            raise TypeError('resource must be a Resource')
+        with get_lock(resource), self._lock:
+            if resource.name in self._resources:
+                raise ValueError(f'a resource named {resource.name!r} is already registered')
+            self._add(resource)
+
+    def _add(self, resource: Resource) -> None:
+        self._resources[resource.name] = resource
+        for attribute in self.INDEXED_ATTRIBUTES:
+            value = self._get_indexed_value(resource, attribute)
+            if value is not None:
+                self._indexes[attribute].setdefault(value, {})[resource.name] = resource
+        totals = self._totals.setdefault(resource.category(), [0, 0])
+        totals[0] += resource.total
+        totals[1] += resource.allocated
+        if isinstance(resource, Storage):
+            insort(self._capacities.setdefault(resource.category(), []), (resource.capacity_GB, resource.name))
+        resource.add_observer(self._resource_changed)
+
+    def remove(self, name: str) -> Resource:
+        while True:
+            # the lock of the resource comes first, so the resource is looked up before locking and looked up again
+            # after: another thread may have removed it, or replaced it by a resource of the same name, meanwhile
+            resource = self._resources[name]
+            with get_lock(resource), self._lock:
+                if self._resources.get(name) is resource:
+                    self._remove(resource)
+                    return resource
+
+    def _remove(self, resource: Resource) -> None:
+        name = resource.name
+        del self._resources[name]
+        resource.remove_observer(self._resource_changed)
+        for attribute in self.INDEXED_ATTRIBUTES:
+            value = self._get_indexed_value(resource, attribute)
+            if value is not None:
+                self._unindex(attribute, value, name)
+        totals = self._totals[resource.category()]
+        totals[0] -= resource.total
+        totals[1] -= resource.allocated
+        if isinstance(resource, Storage):
+            self._remove_capacity(resource.category(), resource.capacity_GB, name)
+
+    @staticmethod
+    def _get_indexed_value(resource: Resource, attribute: str) -> str | None:
+        if attribute == 'category':
+            return resource.category()
+        return getattr(resource, attribute, None)
+
+    def _unindex(self, attribute: str, value: str, name: str) -> None:
+        index = self._indexes[attribute]
+        del index[value][name]
+        if not index[value]:
+            del index[value]
+
+    def _remove_capacity(self, category: str, capacity_GB: int, name: str) -> None:
+        capacities = self._capacities[category]
+        del capacities[bisect_left(capacities, (capacity_GB, name))]
+
+    def _resource_changed(self, resource: Resource, attribute_name: str, old_value, new_value) -> None:
+        with self._lock:
+            self._update(resource, attribute_name.removeprefix('_'), old_value, new_value)
+
+    def _update(self, resource: Resource, attribute: str, old_value, new_value) -> None:
+        if attribute == 'total':
+            self._totals[resource.category()][0] += new_value - old_value
+        elif attribute == 'allocated':
+            self._totals[resource.category()][1] += new_value - old_value
+        elif attribute == 'capacity_GB':
+            self._remove_capacity(resource.category(), old_value, resource.name)
+            insort(self._capacities[resource.category()], (new_value, resource.name))
+        elif attribute in self._indexes:
+            self._unindex(attribute, old_value, resource.name)
+            self._indexes[attribute].setdefault(new_value, {})[resource.name] = resource
+
+    def find(self, **attributes) -> list[Resource]:
+        """
+        Returns the resources matching every given attribute value.
+
+        Args:
+            **attributes: Indexed attribute values, e.g. find(category='cpu', socket='AM4').
+
+        Raises:
+            ValueError: If an attribute is not indexed.
+
+        Example:
+            registry.find(category='ssd', manufacturer='Samsung')
+        """
+        for attribute in attributes:
+            if attribute not in self._indexes:
+                raise ValueError(f'{attribute} must be one of {self.INDEXED_ATTRIBUTES}')
+        with self._lock:
+            matches = [self._indexes[attribute].get(value, {}) for attribute, value in attributes.items()]
+            if not matches:
+                return list(self._resources.values())
+            matches.sort(key=len)
+            smallest, others = matches[0], matches[1:]
+            return [resource for name, resource in smallest.items() if all(name in other for other in others)]
+
+    def totals(self, category: str=None) -> Totals:
+        with self._lock:
+            if category is None:
+                return Totals(sum(t[0] for t in self._totals.values()), sum(t[1] for t in self._totals.values()))
+            return Totals(*self._totals.get(category, (0, 0)))
+
+    def with_capacity(self, min_capacity_GB: int, max_capacity_GB: int=None, category: str=None,
+                      min_available: int=1) -> list[Resource]:
+        """
+        Returns storage resources with min_capacity_GB <= capacity_GB <= max_capacity_GB and at least min_available
+        units available, by increasing capacity.
+
+        Args:
+            min_capacity_GB (int): Minimum capacity (inclusive).
+            max_capacity_GB (int, optional): Maximum capacity (inclusive). Defaults to None.
+            category (str, optional): 'storage', 'hdd' or 'ssd', every storage category if None. Defaults to None.
+            min_available (int, optional): Minimum number of available units, 0 to include everything. Defaults to 1.
+
+        Example:
+            registry.with_capacity(1_000, category='ssd')
+            # Available SSDs with at least 1 TB, the smallest first.
+        """
+        start = (min_capacity_GB,)
+        resources = []
+        with self._lock:
+            lists = self._capacities.values() if category is None else [self._capacities.get(category, [])]
+            for capacity_GB, name in merge(*(islice(c, bisect_left(c, start), None) for c in lists)):
+                if max_capacity_GB is not None and capacity_GB > max_capacity_GB:
+                    break
+                resource = self._resources[name]
+                if resource.total - resource.allocated >= min_available:
+                    resources.append(resource)
+        return resources
@@ -0,0 +1,67 @@
+"""
+Memory benchmark: bytes per item of CPU, HDD and SSD objects against a
+ColumnStore of the same resources, measured with tracemalloc
+
+Names are unique per item, manufacturers, sockets and interfaces repeat, as in
+a real inventory
+Command line: python -m benchmarks.bench_memory
+"""
+
+import argparse
+import random
+import tracemalloc
+
+from app.models.columnar import ColumnStore
+from app.models.inventory import CPU, HDD, SSD
+
+def cpu_values(rng: random.Random, i: int) -> tuple:
+    manufacturer, socket = rng.choice([('AMD', 'AM4'), ('AMD', 'AM5'), ('Intel', 'LGA1700'), ('Intel', 'LGA1200')])
+    total = rng.randint(1, 100)
+    return f'cpu {i}', manufacturer, total, rng.randint(0, total), rng.choice([4, 6, 8, 16]), socket, rng.randint(35, 250)
+
+def hdd_values(rng: random.Random, i: int) -> tuple:
+    total = rng.randint(1, 100)
+    return (f'hdd {i}', rng.choice(['Seagate', 'Western Digital', 'Toshiba']), total, rng.randint(0, total),
+            rng.choice([1_000, 2_000, 4_000, 8_000]), rng.choice(['2.5"', '3.5"']), rng.choice([5400, 7200, 10000]))
+
+def ssd_values(rng: random.Random, i: int) -> tuple:
+    total = rng.randint(1, 100)
+    return (f'ssd {i}', rng.choice(['Samsung', 'Crucial', 'Kingston']), total, rng.randint(0, total),
+            rng.choice([250, 500, 1_000, 2_000]), rng.choice(['SATA III', 'NVMe']))
+
+CLASSES = {CPU: cpu_values, HDD: hdd_values, SSD: ssd_values}
+
+def measure(build) -> tuple[int, object]:
+    # bytes still allocated by build() when it returns, the result is kept alive until then
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return after - before, result
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('-n', '--items',
+                        type=int, default=100_000,
+                        help='Items per resource class.')
+    args = parser.parse_args()
+
+    print(f'{"class":<6}{"objects B/item":>16}{"ColumnStore B/item":>20}{"ratio":>8}')
+    for resource_class, values in CLASSES.items():
+        rng = random.Random(0)
+        rows = [values(rng, i) for i in range(args.items)]
+        # the argument tuples are built beforehand, only the resources themselves are measured
+        objects_bytes, objects = measure(lambda: [resource_class(*row) for row in rows])
+
+        def build_store():
+            store = ColumnStore(resource_class)
+            for row in rows:
+                store.append(*row)
+            return store
+
+        store_bytes, store = measure(build_store)
+        assert len(store) == len(objects) and store.to_resource(0).name == objects[0].name
+        print(f'{resource_class.__name__:<6}{objects_bytes / args.items:>16.1f}{store_bytes / args.items:>20.1f}'
+              f'{objects_bytes / store_bytes:>8.1f}')
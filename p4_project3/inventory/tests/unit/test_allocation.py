@@ -0,0 +1,132 @@
+"""
+Tests the multi-resource allocation functions
+Command line: python -m pytest tests/unit/test_allocation.py
+"""
+
+import asyncio
+import sys
+import threading
+
+import pytest
+
+from app.models.allocation import claim_all, claim_all_async, free_all
+from app.models.inventory import CPU, SSD, Resource, get_lock
+from app.models.registry import InventoryRegistry, Totals
+
+@pytest.fixture
+def cpu():
+    return CPU('Ryzen 5 5600X', 'AMD', 10, 2, 6, 'AM4', 65)
+
+@pytest.fixture
+def ssd():
+    return SSD('Samsung 860 EVO', 'Samsung', 10, 3, 1_000, 'SATA III')
+
+@pytest.fixture
+def fast_switching():
+    # switch threads as often as possible to provoke races
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+def test_claim_all(cpu, ssd):
+    claim_all({cpu: 2, ssd: 4})
+    assert (cpu.allocated, ssd.allocated) == (4, 7)
+    # pairs, with the same resource listed twice
+    claim_all([(cpu, 1), (cpu, 2)])
+    assert cpu.allocated == 7
+
+def test_claim_all_is_all_or_nothing(cpu, ssd):
+    with pytest.raises(ValueError, match='cannot be greater than'):
+        claim_all({cpu: 2, ssd: 8})
+    assert (cpu.allocated, ssd.allocated) == (2, 3)
+    with pytest.raises(ValueError, match='cannot be greater than'):
+        claim_all([(cpu, 5), (cpu, 4)])
+    assert cpu.allocated == 2
+    ssd.claim(7)
+    with pytest.raises(RuntimeError, match='nothing to claim'):
+        claim_all({cpu: 1, ssd: 1})
+    assert cpu.allocated == 2
+
+@pytest.mark.parametrize('claims, exception', (({'cpu': 1}, TypeError), ([(1, 1)], TypeError),
+                                               ([(Resource('r', 'm', 1, 0), 0)], ValueError),
+                                               ([(Resource('r', 'm', 1, 0), '1')], TypeError)))
+def test_claim_all_invalid(claims, exception):
+    with pytest.raises(exception):
+        claim_all(claims)
+
+def test_free_all(cpu, ssd):
+    free_all({cpu: 2, ssd: 1})
+    assert (cpu.allocated, ssd.allocated) == (0, 2)
+    with pytest.raises(RuntimeError, match='nothing to free'):
+        free_all({ssd: 1, cpu: 1})
+    assert ssd.allocated == 2
+
+def test_claim_all_async(cpu, ssd):
+    asyncio.run(claim_all_async({cpu: 2, ssd: 4}))
+    assert (cpu.allocated, ssd.allocated) == (4, 7)
+    with pytest.raises(ValueError):
+        asyncio.run(claim_all_async({cpu: 1, ssd: 4}))
+    assert (cpu.allocated, ssd.allocated) == (4, 7)
+
+def test_claim_all_async_waits_for_threads(cpu):
+    # a lock held by another thread makes the coroutine retry instead of blocking the event loop
+    lock, held, release = get_lock(cpu), threading.Event(), threading.Event()
+
+    def hold():
+        with lock:
+            held.set()
+            release.wait()
+
+    async def main():
+        task = asyncio.create_task(claim_all_async({cpu: 1}))
+        await asyncio.sleep(0.01)
+        assert not task.done()
+        release.set()
+        await task
+
+    thread = threading.Thread(target=hold)
+    thread.start()
+    held.wait()
+    asyncio.run(main())
+    thread.join()
+    assert cpu.allocated == 3
+
+def test_concurrent_claims_never_double_book(fast_switching):
+    resources = [Resource(f'r{i}', 'm', 50, 0) for i in range(4)]
+    registry = InventoryRegistry(resources)
+    granted = []
+
+    def requester(k):
+        for i in range(20):
+            claims = {resources[(k + i) % 4]: 1, resources[(k + i + 1) % 4]: 2}
+            try:
+                claim_all(claims)
+            except (ValueError, RuntimeError):
+                continue
+            granted.append(claims)
+
+    threads = [threading.Thread(target=requester, args=(k,)) for k in range(40)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    for resource in resources:
+        assert resource.allocated == sum(claims.get(resource, 0) for claims in granted)
+        assert resource.allocated <= resource.total
+    assert registry.totals() == Totals(200, sum(r.allocated for r in resources))
+
+def test_concurrent_claim_and_free_up(fast_switching):
+    resource = Resource('r', 'm', 1_000, 0)
+
+    def requester():
+        for _ in range(200):
+            resource.claim(1)
+            resource.free_up(1)
+
+    threads = [threading.Thread(target=requester) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert resource.allocated == 0
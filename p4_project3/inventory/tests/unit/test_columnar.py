@@ -0,0 +1,151 @@
+"""
+Tests the ColumnStore class
+Command line: python -m pytest tests/unit/test_columnar.py
+"""
+
+import pytest
+
+from app.models.columnar import INT64_MAX, ColumnStore, StringTable
+from app.models.inventory import CPU, HDD, SSD, Resource
+
+@pytest.fixture
+def hdd_values():
+    return {'name': 'WD Red Plus', 'manufacturer': 'Western Digital', 'total': 6, 'allocated': 1,
+            'capacity_GB': 4_000, 'size': '3.5"', 'rpm': 5400}
+
+@pytest.fixture
+def cpus():
+    return [CPU('Ryzen 5 5600X', 'AMD', 10, 2, 6, 'AM4', 65),
+            CPU('Ryzen 9 5950X', 'AMD', 5, 5, 16, 'AM4', 105),
+            CPU('Core i9-13900K', 'Intel', 8, 0, 24, 'LGA1700', 125)]
+
+def test_string_table():
+    table = StringTable()
+    assert [table.intern(value) for value in ('AMD', 'Intel', 'AMD')] == [0, 1, 0]
+    assert len(table) == 2
+    assert table[1] == 'Intel'
+
+def test_append(hdd_values):
+    store = ColumnStore(HDD)
+    row = store.append(**hdd_values)
+    assert len(store) == 1
+    for attr in hdd_values:
+        assert getattr(row, attr) == hdd_values[attr]
+    assert row.category() == 'hdd'
+    assert str(row) == 'WD Red Plus'
+    assert store.append(*hdd_values.values()).rpm == 5400
+
+@pytest.mark.parametrize('field, value', (('rpm', 500), ('rpm', 60_000), ('size', '5.25"'), ('total', -1),
+                                          ('allocated', 7), ('capacity_GB', 0), ('name', 1), ('rpm', '5400')))
+def test_append_invalid(hdd_values, field, value):
+    # the store rejects what the class rejects, with the same error
+    hdd_values[field] = value
+    with pytest.raises((ValueError, TypeError)) as store_error:
+        ColumnStore(HDD).append(**hdd_values)
+    with pytest.raises((ValueError, TypeError)) as class_error:
+        HDD(**hdd_values)
+    assert store_error.type is class_error.type
+    assert str(store_error.value) == str(class_error.value)
+    assert str(class_error.value)
+
+@pytest.mark.parametrize('field, value', (('total', INT64_MAX + 1), ('allocated', 2 ** 64), ('capacity_GB', 2 ** 100)))
+def test_append_out_of_int64(hdd_values, field, value):
+    # the int columns are 64-bit, a larger value is rejected before any column is written
+    store = ColumnStore(HDD)
+    store.append(**hdd_values)
+    hdd_values[field] = value
+    with pytest.raises(ValueError, match=f'{field} cannot be greater than {INT64_MAX}'):
+        store.append(**hdd_values)
+    assert {len(column) for column in store._columns.values()} == {1}
+
+def test_from_resources_out_of_int64():
+    with pytest.raises(ValueError, match='total cannot be greater than'):
+        ColumnStore.from_resources([Resource('Cable', 'Generic', 2 ** 63, 0)])
+
+def test_add_purchased_out_of_int64(hdd_values):
+    # a purchase that would take the total out of 64 bits is a ValueError, the total is unchanged
+    row = ColumnStore(HDD).append(**dict(hdd_values, total=INT64_MAX - 5))
+    with pytest.raises(ValueError, match='n cannot be greater than 5'):
+        row.add_purchased(6)
+    assert row.total == INT64_MAX - 5
+    row.add_purchased(5)
+    assert row.total == INT64_MAX
+
+def test_append_invalid_arguments(hdd_values):
+    store = ColumnStore(HDD)
+    with pytest.raises(TypeError, match='missing fields: rpm'):
+        store.append(*list(hdd_values.values())[:-1])
+    with pytest.raises(TypeError, match='unexpected field'):
+        store.append(**hdd_values, interface='SATA')
+    with pytest.raises(TypeError, match='multiple values'):
+        store.append('WD Red Plus', **hdd_values)
+    with pytest.raises(ValueError, match='resource_class must be one of'):
+        ColumnStore(int)
+
+def test_from_resources(cpus):
+    store = ColumnStore.from_resources(cpus)
+    assert store.resource_class is CPU
+    assert [row.name for row in store] == [cpu.name for cpu in cpus]
+    assert store.column('socket') == ['AM4', 'AM4', 'LGA1700']
+    assert store.column('cores') == [6, 16, 24]
+    assert store[-1].power_watts == 125
+    assert repr(store.to_resource(0)) == repr(cpus[0])
+    assert store.to_resource(1).cores == 16
+    with pytest.raises(IndexError):
+        store[3]
+    with pytest.raises(TypeError, match='must be of CPU type'):
+        ColumnStore.from_resources([cpus[0], SSD('Crucial P3', 'Crucial', 20, 0, 500, 'NVMe')])
+
+def test_row_methods():
+    store = ColumnStore(SSD)
+    row = store.append('Crucial P3', 'Crucial', 20, 0, 500, 'NVMe')
+    resource = Resource('Crucial P3', 'Crucial', 20, 0)
+    # the row behaves as the resource, errors included
+    for method, n in (('claim', 5), ('free_up', 2), ('remove_died', 1), ('add_purchased', 4), ('claim', 100),
+                      ('free_up', 0), ('claim', 21)):
+        outcomes = []
+        for target in (row, resource):
+            try:
+                getattr(target, method)(n)
+                outcomes.append((target.total, target.allocated))
+            except (ValueError, RuntimeError) as e:
+                outcomes.append((type(e), str(e)))
+        assert outcomes[0] == outcomes[1]
+    with pytest.raises(RuntimeError, match='nothing to claim'):
+        row.claim(1)
+    assert store[0].allocated == 23
+
+def test_row_setters(cpus):
+    store = ColumnStore.from_resources(cpus)
+    row = store[0]
+    row.socket = 'AM5'
+    row.cores = 8
+    assert (row.socket, row.cores) == ('AM5', 8)
+    assert store.column('socket') == ['AM5', 'AM4', 'LGA1700']
+    # the setters reject what the class setters reject, with the same error
+    for attr, value in (('cores', 0), ('power_watts', '65'), ('socket', 5)):
+        with pytest.raises((ValueError, TypeError)) as row_error:
+            setattr(row, attr, value)
+        with pytest.raises(type(row_error.value), match=str(row_error.value)):
+            setattr(cpus[0], attr, value)
+    with pytest.raises(ValueError, match='cores cannot be greater than'):
+        row.cores = INT64_MAX + 1
+    assert row.cores == 8
+    for attr in ('name', 'manufacturer', 'total', 'allocated'):
+        with pytest.raises(AttributeError):
+            setattr(row, attr, getattr(row, attr))
+
+def test_hdd_row_setters(hdd_values):
+    row = ColumnStore(HDD).append(**hdd_values)
+    row.size, row.rpm, row.capacity_GB = '2.5"', 7200, 2_000
+    assert (row.size, row.rpm, row.capacity_GB) == ('2.5"', 7200, 2_000)
+    with pytest.raises(ValueError, match='size must be one of'):
+        row.size = '5.25"'
+    ssd_row = ColumnStore(SSD).append('Crucial P3', 'Crucial', 20, 0, 500, 'NVMe')
+    ssd_row.interface = 'SATA'
+    assert ssd_row.interface == 'SATA'
+
+def test_nbytes(cpus):
+    store = ColumnStore.from_resources(cpus * 100)
+    # the interned socket and manufacturer columns cost 4 bytes per row
+    assert store.nbytes() < 300 * 200
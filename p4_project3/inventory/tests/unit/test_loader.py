@@ -0,0 +1,128 @@
+"""
+Tests the bulk loader functions
+Command line: python -m pytest tests/unit/test_loader.py
+"""
+
+import io
+import json
+
+import pytest
+
+from app.models.columnar import ColumnStore
+from app.models.inventory import CPU, HDD, SSD
+from app.models.loader import RowError, load_resources, load_store
+
+HDD_CSV = '''name,manufacturer,total,allocated,capacity_GB,size,rpm
+WD Red Plus,Western Digital,6,1,4000,"3.5""",5400
+Barracuda,Seagate,10,0,2000,"2.5""",500
+IronWolf,Seagate,x,0,8000,"5.25""",7200
+Blue,Western Digital,3,4,1000,"3.5""",7200
+MQ04,Toshiba,5
+'''
+
+@pytest.fixture
+def ssd_records():
+    return [{'name': f'SSD {i}', 'manufacturer': 'Samsung', 'total': 10, 'allocated': i,
+             'capacity_GB': 500 * (i + 1), 'interface': 'NVMe'} for i in range(5)]
+
+def test_load_csv_reports_all_errors():
+    resources, errors = load_resources(io.StringIO(HDD_CSV), HDD, 'csv')
+    assert [hdd.name for hdd in resources] == ['WD Red Plus']
+    assert errors == [
+        RowError(3, 'rpm', 'rpm cannot be less than 1000'),
+        RowError(4, 'total', 'total must be an int'),
+        RowError(4, 'size', 'size must be one of (\'2.5"\', \'3.5"\')'),
+        RowError(5, 'allocated', 'allocated cannot be greater than 3'),
+        RowError(6, None, 'expected 7 columns, found 3'),
+    ]
+
+def test_loaded_resources_match_constructed(ssd_records):
+    source = io.StringIO(''.join(json.dumps(record) + '\n' for record in ssd_records))
+    resources, errors = load_resources(source, SSD, 'jsonl', batch_size=2)
+    assert errors == []
+    for resource, record in zip(resources, ssd_records):
+        expected = SSD(**record)
+        assert type(resource) is SSD
+        assert repr(resource) == repr(expected)
+        for attr in record:
+            assert getattr(resource, attr) == getattr(expected, attr)
+    # the loaded resources behave as constructed ones
+    resources[0].claim(3)
+    resources[0].interface = 'SATA III'
+    assert (resources[0].allocated, resources[0].interface) == (3, 'SATA III')
+
+def test_load_jsonl_errors(ssd_records):
+    ssd_records[1]['capacity_GB'] = '500'
+    ssd_records[2]['interface'] = None
+    del ssd_records[3]['total']
+    ssd_records[4]['rpm'] = 7200
+    lines = [json.dumps(record) for record in ssd_records] + ['{not json', '[1, 2]', '']
+    resources, errors = load_resources(io.StringIO('\n'.join(lines)), SSD, 'jsonl', batch_size=3)
+    assert [ssd.name for ssd in resources] == ['SSD 0']
+    assert [(error.line, error.field) for error in errors] == [(2, 'capacity_GB'), (3, 'interface'), (4, 'total'),
+                                                               (5, 'rpm'), (6, None), (7, None)]
+    assert errors[0].message == 'capacity_GB must be an int'
+    assert errors[2].message == 'total is missing'
+
+def test_error_messages_match_constructor(ssd_records):
+    # the loader reports the error the constructor would raise
+    for field, value in (('total', -1), ('allocated', 11), ('capacity_GB', 0), ('manufacturer', 5), ('total', 1.5)):
+        record = dict(ssd_records[0], **{field: value})
+        with pytest.raises((TypeError, ValueError)) as constructor_error:
+            SSD(**record)
+        _, errors = load_resources(io.StringIO(json.dumps(record)), SSD, 'jsonl')
+        assert [error.message for error in errors] == [str(constructor_error.value)]
+
+def test_load_files(tmp_path, ssd_records):
+    path = tmp_path / 'ssds.jsonl'
+    path.write_text(''.join(json.dumps(record) + '\n' for record in ssd_records))
+    resources, errors = load_resources(str(path), SSD)
+    assert len(resources) == 5 and errors == []
+    path = tmp_path / 'hdds.csv'
+    path.write_text(HDD_CSV)
+    assert len(load_resources(str(path), HDD).errors) == 5
+
+def test_load_store():
+    store, errors = load_store(io.StringIO(HDD_CSV), HDD, 'csv', batch_size=2)
+    assert isinstance(store, ColumnStore)
+    assert len(store) == 1 and len(errors) == 5
+    assert store[0].rpm == 5400
+    assert store[0].size == '3.5"'
+
+def test_load_out_of_int64():
+    # the int columns of a store are 64-bit, larger values are row errors in both loaders
+    source = HDD_CSV.replace('Western Digital,6,1,', 'Western Digital,100000000000000000000,1,')
+    for load in (load_resources, load_store):
+        resources, errors = load(io.StringIO(source), HDD, 'csv')
+        assert len(resources) == 0
+        assert errors[0] == RowError(2, 'total', 'total cannot be greater than 9223372036854775807')
+        assert len(errors) == 6
+    store, errors = load_store(io.StringIO(source + 'Red Pro,Western Digital,1,0,4000,"3.5""",7200\n'), HDD, 'csv')
+    assert store.column('name') == ['Red Pro']
+    assert {len(column) for column in store._columns.values()} == {1}
+
+def test_load_csv_strict_ints():
+    # int() would take these, a CSV int cell is only an optional sign and ASCII digits
+    for cell in ('" 1_0 "', '1_0', '" 10"', '\uff11\uff10', '\u0661\u0660'):
+        source = HDD_CSV.replace('Western Digital,6,1,', f'Western Digital,{cell},1,')
+        resources, errors = load_resources(io.StringIO(source), HDD, 'csv')
+        assert resources == []
+        assert errors[0] == RowError(2, 'total', 'total must be an int')
+    source = HDD_CSV.replace('Western Digital,6,1,', 'Western Digital,+6,1,')
+    assert load_resources(io.StringIO(source), HDD, 'csv').resources[0].total == 6
+
+def test_load_csv_repeated_column():
+    header = 'name,manufacturer,total,allocated,total,capacity_GB,size,rpm\n'
+    with pytest.raises(ValueError, match=r"repeated: \['total'\]"):
+        load_resources(io.StringIO(header + 'Blue,WD,3,0,4,1000,"3.5""",7200\n'), HDD, 'csv')
+
+def test_load_invalid_arguments():
+    with pytest.raises(ValueError, match='format must be one of'):
+        load_resources(io.StringIO(''), CPU)
+    with pytest.raises(ValueError, match='format must be one of'):
+        load_resources('cpus.xml', CPU)
+    with pytest.raises(ValueError, match='missing'):
+        load_resources(io.StringIO('name,manufacturer,total,allocated\n'), CPU, 'csv')
+    with pytest.raises(ValueError, match='cannot be less than 1'):
+        load_resources(io.StringIO(''), CPU, 'csv', batch_size=0)
+    assert load_resources(io.StringIO(''), CPU, 'csv') == ([], [])
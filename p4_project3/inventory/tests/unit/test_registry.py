@@ -0,0 +1,178 @@
+"""
+Tests the InventoryRegistry class
+Command line: python -m pytest tests/unit/test_registry.py
+"""
+
+import threading
+import time
+
+import pytest
+
+from app.models.inventory import CPU, HDD, SSD, Resource, get_lock
+from app.models.registry import InventoryRegistry, Totals
+
+@pytest.fixture
+def resources():
+    return [
+        CPU('Ryzen 5 5600X', 'AMD', 10, 2, 6, 'AM4', 65),
+        CPU('Ryzen 9 5950X', 'AMD', 5, 5, 16, 'AM4', 105),
+        CPU('Core i9-13900K', 'Intel', 8, 0, 24, 'LGA1700', 125),
+        SSD('Samsung 860 EVO', 'Samsung', 10, 3, 1_000, 'SATA III'),
+        SSD('Samsung 990 PRO', 'Samsung', 4, 4, 2_000, 'NVMe'),
+        SSD('Crucial P3', 'Crucial', 20, 0, 500, 'NVMe'),
+        HDD('WD Red Plus', 'Western Digital', 6, 1, 4_000, '3.5"', 5400),
+    ]
+
+@pytest.fixture
+def registry(resources):
+    return InventoryRegistry(resources)
+
+def test_lookup(registry, resources):
+    assert len(registry) == len(resources)
+    assert 'Crucial P3' in registry
+    assert registry.get('Crucial P3') is resources[5]
+    assert list(registry) == resources
+    with pytest.raises(KeyError):
+        registry.get('missing')
+
+def test_add_invalid(registry, resources):
+    with pytest.raises(ValueError, match='already registered'):
+        registry.add(SSD('Crucial P3', 'Crucial', 1, 0, 500, 'NVMe'))
+    with pytest.raises(TypeError, match='must be a Resource'):
+        registry.add('Crucial P3')
+
+def test_find(registry, resources):
+    assert registry.find(category='cpu', manufacturer='AMD') == resources[:2]
+    assert registry.find(socket='LGA1700') == [resources[2]]
+    assert registry.find(category='ssd', interface='NVMe') == resources[4:6]
+    assert registry.find(size='3.5"') == [resources[6]]
+    assert registry.find(manufacturer='Seagate') == []
+    assert registry.find() == resources
+    with pytest.raises(ValueError, match='must be one of'):
+        registry.find(cores=6)
+
+def test_totals(registry):
+    assert registry.totals('cpu') == Totals(23, 7)
+    assert registry.totals('cpu').available == 16
+    assert registry.totals('ssd') == Totals(34, 7)
+    assert registry.totals() == Totals(63, 15)
+    assert registry.totals('resource') == Totals(0, 0)
+
+def test_totals_follow_resource_changes(registry, resources):
+    cpu = resources[0]
+    cpu.claim(3)
+    assert registry.totals('cpu') == Totals(23, 10)
+    cpu.free_up(1)
+    assert registry.totals('cpu') == Totals(23, 9)
+    cpu.remove_died(2)
+    assert registry.totals('cpu') == Totals(21, 7)
+    cpu.add_purchased(4)
+    assert registry.totals('cpu') == Totals(25, 7)
+    # totals always match a full scan
+    for category in ('cpu', 'ssd', 'hdd'):
+        group = [r for r in resources if r.category() == category]
+        assert registry.totals(category) == Totals(sum(r.total for r in group), sum(r.allocated for r in group))
+
+def test_indexes_follow_attribute_changes(registry, resources):
+    cpu = resources[0]
+    cpu.socket = 'AM5'
+    assert registry.find(socket='AM4') == [resources[1]]
+    assert registry.find(socket='AM5') == [cpu]
+    ssd = resources[5]
+    ssd.capacity_GB = 4_000
+    assert registry.with_capacity(3_000, category='ssd') == [ssd]
+
+def test_remove(registry, resources):
+    ssd = registry.remove('Samsung 860 EVO')
+    assert ssd is resources[3]
+    assert 'Samsung 860 EVO' not in registry
+    assert registry.find(interface='SATA III') == []
+    assert registry.totals('ssd') == Totals(24, 4)
+    assert registry.with_capacity(0, category='ssd', min_available=0) == [resources[5], resources[4]]
+    # a removed resource is no longer observed
+    ssd.claim(1)
+    assert registry.totals('ssd') == Totals(24, 4)
+
+def test_concurrent_remove(registry, resources):
+    # every thread looks the resource up, one removes it, the others get a KeyError
+    removed, missing = [], []
+    start = threading.Barrier(8)
+
+    def remover():
+        start.wait()
+        try:
+            removed.append(registry.remove('Crucial P3'))
+        except KeyError:
+            missing.append(True)
+
+    threads = [threading.Thread(target=remover) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert removed == [resources[5]] and len(missing) == 7
+    assert registry.totals('ssd') == Totals(14, 7)
+    with pytest.raises(KeyError):
+        registry.remove('Crucial P3')
+
+def test_remove_replaced_resource(registry, resources):
+    # a remover that looked up a resource replaced meanwhile by one of the same name removes the new one, cleanly
+    old = resources[5]
+    new = SSD('Crucial P3', 'Crucial', 3, 1, 1_000, 'PCIe 4.0')
+    removed = []
+    with get_lock(old):
+        thread = threading.Thread(target=lambda: removed.append(registry.remove('Crucial P3')))
+        thread.start()
+        time.sleep(0.05) # the thread has looked old up and waits for its lock
+        registry.remove('Crucial P3')
+        registry.add(new)
+    thread.join()
+    assert removed == [new]
+    assert 'Crucial P3' not in registry
+    assert registry.find(interface='NVMe') == [resources[4]]
+    assert registry.totals('ssd') == Totals(14, 7)
+
+def test_concurrent_reads(registry, resources):
+    # totals and with_capacity read consistent values while other threads claim and free
+    ssd = resources[5]
+    stop = threading.Event()
+
+    def churn():
+        while not stop.is_set():
+            ssd.claim(5)
+            ssd.free_up(5)
+
+    thread = threading.Thread(target=churn)
+    thread.start()
+    try:
+        for _ in range(2_000):
+            assert registry.totals('ssd').allocated in (7, 12)
+            assert resources[5] in registry.with_capacity(0, category='ssd', min_available=15)
+    finally:
+        stop.set()
+        thread.join()
+    assert registry.totals('ssd') == Totals(34, 7)
+
+def test_with_capacity(registry, resources):
+    # the 990 PRO is fully allocated
+    assert registry.with_capacity(1_000, category='ssd') == [resources[3]]
+    assert registry.with_capacity(1_000, category='ssd', min_available=0) == [resources[3], resources[4]]
+    assert registry.with_capacity(500, 1_000, category='ssd') == [resources[5], resources[3]]
+    assert registry.with_capacity(1_000) == [resources[3], resources[6]]
+    assert registry.with_capacity(1_000, category='ssd', min_available=7) == [resources[3]]
+    assert registry.with_capacity(1_000, category='ssd', min_available=8) == []
+    assert registry.with_capacity(10_000) == []
+    resources[3].claim(7)
+    assert registry.with_capacity(1_000, category='ssd') == []
+
+def test_observer():
+    changes = []
+    observer = lambda *change: changes.append(change)
+    resource = Resource('name', 'manufacturer', 10, 0)
+    resource.add_observer(observer)
+    resource.claim(2)
+    resource.add_purchased(5)
+    assert changes == [(resource, '_allocated', 0, 2), (resource, '_total', 10, 15)]
+    resource.remove_observer(observer)
+    resource.claim(1)
+    assert len(changes) == 2